@@ -3,8 +3,9 @@ from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 
 from .config import Config
+from .database import MEMORY_REPLICA, RoutingSession, create_schema, init_database
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def create_app():
@@ -14,26 +15,131 @@ def create_app():
     # Configure CORS using environment variable
     CORS(app, origins=[app.config["FRONTEND_URL"]], supports_credentials=True)
 
-    db.init_app(app)
+    init_database(app, db)
+
+    # Registered first so a profile spans every other request hook
+    if app.config["PROFILING_ENABLED"]:
+        from .profiling import init_profiling
+
+        init_profiling(app)
+
+    if app.config["METRICS_ENABLED"]:
+        from .metrics import init_metrics
+
+        init_metrics(app)
 
     with app.app_context():
-        from .routes import congress, members, representatives, senators
+        from .routes import (
+            committees,
+            congress,
+            legislators,
+            members,
+            representatives,
+            senators,
+            stream,
+            terms,
+        )
 
         app.register_blueprint(senators.bp)
         app.register_blueprint(representatives.bp)
         app.register_blueprint(members.bp)
         app.register_blueprint(congress.bp)
+        app.register_blueprint(legislators.bp)
+        app.register_blueprint(committees.bp)
+        app.register_blueprint(stream.bp)
+        app.register_blueprint(terms.bp)
+
+        from external_api.fallback import reset_staleness, staleness
+        from external_api.services import get_upstream_status
+        from external_api.telemetry import reset_upstream_time, upstream_time
+
+        @app.before_request
+        def reset_upstream_staleness():
+            reset_staleness()
+            reset_upstream_time()
+
+        # Flag responses built from last-known-good upstream data
+        @app.after_request
+        def mark_stale_responses(response):
+            age = staleness()
+            if age is not None:
+                response.headers["Warning"] = '110 - "Response is Stale"'
+                response.headers["X-Upstream-Stale-Age"] = str(int(age))
+            return response
+
+        # Report time spent waiting on Congress.gov (visible in browser devtools)
+        @app.after_request
+        def add_upstream_timing(response):
+            seconds, calls = upstream_time()
+            if calls:
+                response.headers["Server-Timing"] = (
+                    f'upstream;dur={seconds * 1000:.1f};desc="{calls} calls"'
+                )
+            return response
 
         # Health check endpoint for EB
         @app.route("/health")
         def health_check():
             return {"status": "healthy"}, 200
 
+        # Congress.gov circuit breaker state for this worker
+        @app.route("/health/upstream")
+        def upstream_health():
+            return get_upstream_status(), 200
+
+        # Lease and schedule of every background job
+        @app.route("/health/scheduler")
+        def scheduler_health():
+            from .scheduler import SCHEDULER
+
+            scheduler = app.extensions.get(SCHEDULER)
+            if scheduler is None:
+                return {"enabled": False, "jobs": []}, 200
+            return {"enabled": True, "jobs": scheduler.status()}, 200
+
+        # This worker's member, bill-action and profile cache hit ratios and
+        # evictions
+        @app.route("/health/cache")
+        def cache_health():
+            from .profiles import PROFILE_STORE
+            from .upstream_cache import UPSTREAM_CACHE
+
+            stats = app.extensions[UPSTREAM_CACHE].stats()
+            return stats | app.extensions[PROFILE_STORE].stats(), 200
+
         # Root endpoint for ELB health checks
         @app.route("/")
         def root():
             return {"status": "ok", "message": "Civiliscope Backend API"}, 200
 
-        db.create_all()
+        create_schema(db)
+
+        # Load the in-memory replica and roster now rather than on the first request
+        replica = app.extensions.get(MEMORY_REPLICA)
+        if replica is not None:
+            replica.refresh()
+        from .roster import ROSTER_STORE, init_roster
+
+        init_roster(app)
+        app.extensions[ROSTER_STORE].get()
+
+        from .events import init_events
+
+        init_events(app)
+
+        from .upstream_cache import init_upstream_cache
+
+        init_upstream_cache(app)
+
+        from .profiles import init_profiles
+
+        init_profiles(app)
+
+        if app.config["SCHEDULER_ENABLED"]:
+            from data_ingestion.scheduler import jobs
+
+            from .scheduler import init_scheduler
+
+            init_scheduler(app, jobs(app.config))
 
     return app
@@ -0,0 +1,161 @@
+"""
+Roster change feed
+
+Ingest snapshots both roster tables before it rewrites them and records the
+field-level difference as roster_changes rows tagged with the dataset version
+it publishes. Clients poll /api/legislators/changes?since=<version> and apply
+only what changed instead of downloading the full rosters again. History
+older than CHANGES_RETENTION_VERSIONS versions is compacted away; clients
+that fall further behind are told to resync.
+"""
+
+import json
+import logging
+
+import sqlalchemy as sa
+from flask import current_app
+
+from .models import DatasetVersion, Representative, RosterChange, Senator
+from .roster import RepresentativeRecord, SenatorRecord
+
+logger = logging.getLogger(__name__)
+
+CHAMBERS = {
+    "senators": (Senator, SenatorRecord),
+    "representatives": (Representative, RepresentativeRecord),
+}
+
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+
+
+class HistoryCompacted(Exception):
+    """Changes since the requested version are no longer kept."""
+
+    def __init__(self, since: int, compacted_through: int):
+        super().__init__(
+            f"Changes up to version {compacted_through} were compacted; "
+            f"cannot serve changes since {since}"
+        )
+        self.compacted_through = compacted_through
+
+
+def roster_snapshot(session) -> dict[tuple[str, str], dict]:
+    """
+    Every legislator as the detail route renders it.
+
+    Args:
+        session: Session to read through (sees its own unflushed writes).
+
+    Returns:
+        {(chamber, bioguide_id): fields} with JSON-native field values.
+    """
+    snapshot = {}
+    for chamber, (model, record_class) in CHAMBERS.items():
+        for row in session.execute(sa.select(model.__table__)).mappings():
+            detail = record_class(row).detail()
+            # Round-trip through the app's encoder so dates match the API
+            snapshot[chamber, row["bioguide_id"]] = json.loads(
+                current_app.json.dumps(detail)
+            )
+    return snapshot
+
+
+def diff_snapshots(before: dict, after: dict) -> list[dict]:
+    """
+    Field-level difference between two roster snapshots.
+
+    Inserts carry every field, updates only the fields that changed (with
+    their new values) and deletes none.
+    """
+    changes = []
+    for key in sorted(before.keys() | after.keys()):
+        chamber, bioguide_id = key
+        old, new = before.get(key), after.get(key)
+        if old is None:
+            op, fields = INSERT, new
+        elif new is None:
+            op, fields = DELETE, None
+        else:
+            fields = {k: v for k, v in new.items() if old.get(k) != v}
+            if not fields:
+                continue
+            op = UPDATE
+        changes.append(
+            {"chamber": chamber, "bioguide_id": bioguide_id, "op": op, "fields": fields}
+        )
+    return changes
+
+
+def record_changes(session, version: int, before: dict, retention: int) -> int:
+    """
+    Record what changed since `before` under `version`, then compact history.
+    Call after publish_dataset() and before committing.
+
+    Args:
+        session: Session holding the ingest's writes.
+        version: Dataset version being published.
+        before: roster_snapshot() taken before the ingest wrote anything.
+        retention: Number of most recent versions whose changes are kept.
+
+    Returns:
+        Number of change rows recorded.
+    """
+    changes = diff_snapshots(before, roster_snapshot(session))
+    if changes:
+        session.execute(
+            sa.insert(RosterChange.__table__),
+            [change | {"version": version} for change in changes],
+        )
+
+    cutoff = version - retention
+    if cutoff > 0:
+        session.execute(
+            sa.delete(RosterChange.__table__).where(
+                RosterChange.__table__.c.version <= cutoff
+            )
+        )
+        table = DatasetVersion.__table__
+        session.execute(
+            table.update()
+            .where(table.c.id == 1, table.c.compacted_through < cutoff)
+            .values(compacted_through=cutoff)
+        )
+
+    logger.info(f"Recorded {len(changes)} roster changes for version {version}")
+    return len(changes)
+
+
+def changes_since(session, since: int) -> dict:
+    """
+    Changes published after version `since`, oldest first.
+
+    A poll that is already current costs a primary key lookup; otherwise the
+    rows come from an index range scan on version.
+
+    Raises:
+        HistoryCompacted: If changes after `since` were compacted away.
+    """
+    table = DatasetVersion.__table__
+    row = session.execute(
+        sa.select(table.c.version, table.c.compacted_through).where(table.c.id == 1)
+    ).first()
+    version, compacted_through = row if row is not None else (0, 0)
+
+    if since >= version:
+        return {"version": version, "changes": []}
+    if since < compacted_through:
+        raise HistoryCompacted(since, compacted_through)
+
+    changes = RosterChange.__table__
+    rows = session.execute(
+        sa.select(
+            changes.c.version,
+            changes.c.chamber,
+            changes.c.bioguide_id,
+            changes.c.op,
+            changes.c.fields,
+        )
+        .where(changes.c.version > since)
+        .order_by(changes.c.version, changes.c.id)
+    ).mappings()
+    return {"version": version, "changes": [dict(r) for r in rows]}
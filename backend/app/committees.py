@@ -0,0 +1,114 @@
+"""
+Committee queries
+
+Ingest loads committees, subcommittees and their members into committees and
+committee_memberships (see data_ingestion/parse_member_data.py). Memberships
+are indexed in both directions (see the model): committee -> members by the
+table's own primary key order, and legislator -> committees, with rank and
+title, by a covering index. Each function here is one query on one of them.
+"""
+
+import sqlalchemy as sa
+
+from .models import Committee, CommitteeMembership
+
+committees = Committee.__table__
+memberships = CommitteeMembership.__table__
+
+
+def list_committees(session, chamber: str | None = None) -> list[dict]:
+    """Committees (optionally of one chamber) with their subcommittees nested."""
+    query = sa.select(committees).order_by(committees.c.thomas_id)
+    if chamber is not None:
+        query = query.where(committees.c.chamber == chamber)
+
+    result, by_id = [], {}
+    # Parents sort before their subcommittees (a parent's ID is their prefix)
+    for row in session.execute(query).mappings():
+        if row["parent_id"] is None:
+            by_id[row["thomas_id"]] = {**row, "subcommittees": []}
+            result.append(by_id[row["thomas_id"]])
+        elif row["parent_id"] in by_id:
+            by_id[row["parent_id"]]["subcommittees"].append(
+                {"thomas_id": row["thomas_id"], "name": row["name"]}
+            )
+    return result
+
+
+def committee_detail(session, thomas_id: str) -> dict | None:
+    """
+    A committee or subcommittee with its members (majority first, by rank)
+    and, for a committee, its subcommittees.
+
+    Returns:
+        The committee, or None if there is no such committee.
+    """
+    # One query: the committee row joined to its members, plus a row per
+    # subcommittee (found through the parent_id index) with no member columns
+    rows = session.execute(
+        sa.select(
+            committees,
+            memberships.c.bioguide_id,
+            memberships.c.name.label("member_name"),
+            memberships.c.party,
+            memberships.c.rank,
+            memberships.c.title,
+        )
+        .select_from(
+            committees.outerjoin(
+                memberships,
+                sa.and_(
+                    memberships.c.committee_id == committees.c.thomas_id,
+                    committees.c.thomas_id == thomas_id,
+                ),
+            )
+        )
+        .where(
+            sa.or_(
+                committees.c.thomas_id == thomas_id, committees.c.parent_id == thomas_id
+            )
+        )
+        .order_by(committees.c.thomas_id, memberships.c.party, memberships.c.rank)
+    ).mappings()
+
+    committee, members, subcommittees = None, [], []
+    for row in rows:
+        if row["thomas_id"] != thomas_id:
+            subcommittees.append({"thomas_id": row["thomas_id"], "name": row["name"]})
+            continue
+        if committee is None:
+            committee = {name: row[name] for name in committees.c.keys()}
+        if row["bioguide_id"] is not None:
+            members.append(
+                {
+                    "bioguide_id": row["bioguide_id"],
+                    "name": row["member_name"],
+                    "party": row["party"],
+                    "rank": row["rank"],
+                    "title": row["title"],
+                }
+            )
+    if committee is None:
+        return None
+    return committee | {"members": members, "subcommittees": subcommittees}
+
+
+def committees_of(session, bioguide_id: str) -> list[dict]:
+    """A legislator's committee and subcommittee assignments."""
+    rows = session.execute(
+        sa.select(
+            committees.c.thomas_id,
+            committees.c.parent_id,
+            committees.c.name,
+            committees.c.chamber,
+            memberships.c.party,
+            memberships.c.rank,
+            memberships.c.title,
+        )
+        .select_from(memberships)
+        .join(committees, committees.c.thomas_id == memberships.c.committee_id)
+        .where(memberships.c.bioguide_id == bioguide_id)
+        # Subcommittees sort right after their committee
+        .order_by(memberships.c.committee_id)
+    ).mappings()
+    return [dict(row) for row in rows]
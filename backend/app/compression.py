@@ -0,0 +1,249 @@
+"""
+zstd compression of cached Congress.gov bodies with trained dictionaries
+
+Member and bill-action payloads are small JSON documents that repeat the same
+keys and values. Compressed one at a time they barely shrink, but compressed
+against a dictionary trained on a sample of them they shrink ~10x, so the
+upstream_cache table and the workers' local caches hold an order of magnitude
+more entries in the same bytes. Each kind of payload gets its own dictionary,
+stored in compression_dictionaries. Every zstd frame names the dictionary it
+was written with, so entries written with an older dictionary still decode.
+
+Bodies stay compressed until a response needs them. A client that already
+holds the dictionary (Compression Dictionary Transport, RFC 9842) is sent
+the stored frame as-is with Content-Encoding: dcz. Frames written before the
+first dictionary was trained go out as-is to clients that accept zstd.
+Responses link to their dictionary so browsers fetch it when idle.
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+import time
+
+import sqlalchemy as sa
+import zstandard
+from flask import Flask, Response, request, url_for
+
+from . import db
+from .models import CompressionDictionary
+
+logger = logging.getLogger(__name__)
+
+# dcz bodies: a zstd skippable frame holding the dictionary's SHA-256, then the
+# dictionary-compressed frame
+DCZ_HEADER = b"\x5e\x2a\x4d\x18\x20\x00\x00\x00"
+
+# Fewer samples than this train a dictionary that does more harm than good
+MIN_SAMPLES = 100
+# Dictionaries kept per kind, so frames written just before a retrain decode
+KEEP_DICTIONARIES = 2
+
+
+class Dictionary:
+    """A trained zstd dictionary, ready to compress with."""
+
+    __slots__ = ("id", "kind", "data", "sha256", "trained_at", "zstd")
+
+    def __init__(self, kind: str, data: bytes, trained_at: float, level: int):
+        self.zstd = zstandard.ZstdCompressionDict(data)
+        self.zstd.precompute_compress(level=level)
+        self.id = self.zstd.dict_id()
+        self.kind = kind
+        self.data = data
+        self.sha256 = hashlib.sha256(data).digest()
+        self.trained_at = trained_at
+
+    @property
+    def structured_hash(self) -> str:
+        """The SHA-256 as an RFC 8941 byte sequence, as in Available-Dictionary."""
+        return f":{base64.b64encode(self.sha256).decode()}:"
+
+
+def accepted_encodings() -> set[str]:
+    """Content codings the current request accepts (q=0 excluded)."""
+    accepted = set()
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        if coding and q not in ("0", "0.0", "0.00", "0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class Codec:
+    """Per-worker compressor with the newest dictionary of each kind."""
+
+    def __init__(self, app: Flask, level: int = 9, reload_seconds: float = 60):
+        """
+        Initialize the codec.
+
+        Args:
+            app: Application whose primary database holds the dictionaries.
+            level: zstd compression level for cache writes.
+            reload_seconds: How often a worker looks for a newer dictionary.
+        """
+        self.app = app
+        self.level = level
+        self.reload_seconds = reload_seconds
+        self._dictionaries: dict[int, Dictionary] = {}
+        self._current: dict[str, Dictionary | None] = {}
+        self._checked_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _engine(self) -> sa.Engine:
+        with self.app.app_context():
+            return db.engine
+
+    def _load(self, row) -> Dictionary:
+        dictionary = Dictionary(row.kind, row.data, row.trained_at, self.level)
+        with self._lock:
+            return self._dictionaries.setdefault(dictionary.id, dictionary)
+
+    def current(self, kind: str) -> Dictionary | None:
+        """The newest dictionary trained for `kind`, if any."""
+        now = time.monotonic()
+        if now - self._checked_at.get(kind, float("-inf")) < self.reload_seconds:
+            return self._current.get(kind)
+
+        table = CompressionDictionary.__table__
+        with self._engine().connect() as conn:
+            newest = conn.execute(
+                sa.select(table.c.id)
+                .where(table.c.kind == kind)
+                .order_by(table.c.trained_at.desc())
+                .limit(1)
+            ).scalar()
+        self._current[kind] = None if newest is None else self.dictionary(newest)
+        self._checked_at[kind] = now
+        return self._current[kind]
+
+    def dictionary(self, dict_id: int) -> Dictionary:
+        """
+        A dictionary by its zstd ID.
+
+        Raises:
+            LookupError: If no such dictionary is stored.
+        """
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is not None:
+            return dictionary
+        table = CompressionDictionary.__table__
+        with self._engine().connect() as conn:
+            row = conn.execute(sa.select(table).where(table.c.id == dict_id)).first()
+        if row is None:
+            raise LookupError(f"No compression dictionary {dict_id}")
+        return self._load(row)
+
+    def by_hash(self, sha256: str) -> Dictionary | None:
+        table = CompressionDictionary.__table__
+        with self._engine().connect() as conn:
+            dict_id = conn.execute(
+                sa.select(table.c.id).where(table.c.sha256 == sha256)
+            ).scalar()
+        return None if dict_id is None else self.dictionary(dict_id)
+
+    def compress(self, kind: str, body: bytes) -> bytes:
+        """A zstd frame of `body`, with the current dictionary of `kind` if any."""
+        dictionary = self.current(kind)
+        if dictionary is None:
+            return zstandard.ZstdCompressor(level=self.level).compress(body)
+        compressor = zstandard.ZstdCompressor(dict_data=dictionary.zstd)
+        return compressor.compress(body)
+
+    def decompress(self, frame: bytes) -> bytes:
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        if not dict_id:
+            return zstandard.ZstdDecompressor().decompress(frame)
+        dictionary = self.dictionary(dict_id)
+        return zstandard.ZstdDecompressor(dict_data=dictionary.zstd).decompress(frame)
+
+    def train(self, kind: str, samples: list[bytes], size: int) -> Dictionary:
+        """
+        Train, store and start using a new dictionary for `kind`.
+
+        Args:
+            kind: Payload kind the samples belong to.
+            samples: Uncompressed bodies.
+            size: Dictionary size in bytes.
+
+        Raises:
+            zstandard.ZstdError: If the samples are too few or too alike.
+        """
+        data = zstandard.train_dictionary(size, samples).as_bytes()
+        dictionary = Dictionary(kind, data, time.time(), self.level)
+        with self._engine().begin() as conn:
+            conn.execute(
+                sa.insert(CompressionDictionary.__table__).values(
+                    id=dictionary.id,
+                    kind=kind,
+                    data=data,
+                    sha256=dictionary.sha256.hex(),
+                    trained_at=dictionary.trained_at,
+                )
+            )
+        logger.info(
+            f"Trained {len(data)} byte {kind} dictionary {dictionary.id} "
+            f"on {len(samples)} samples"
+        )
+        with self._lock:
+            self._dictionaries[dictionary.id] = dictionary
+        self._current[kind] = dictionary
+        self._checked_at[kind] = time.monotonic()
+        return dictionary
+
+    def prune(self, kind: str) -> int:
+        """Delete all but the newest KEEP_DICTIONARIES dictionaries of `kind`."""
+        table = CompressionDictionary.__table__
+        keep = (
+            sa.select(table.c.id)
+            .where(table.c.kind == kind)
+            .order_by(table.c.trained_at.desc())
+            .limit(KEEP_DICTIONARIES)
+        )
+        with self._engine().begin() as conn:
+            deleted = conn.execute(
+                sa.delete(table).where(table.c.kind == kind, table.c.id.not_in(keep))
+            )
+        return deleted.rowcount
+
+    def response(self, frame: bytes, kind: str, match: str | None = None) -> Response:
+        """
+        A JSON response for a stored frame, passed through compressed when the
+        client can decode it.
+
+        Args:
+            frame: zstd frame of a JSON body.
+            kind: Payload kind, whose newest dictionary the response links to.
+            match: URL pattern the dictionary applies to. Responses without
+                one do not link a dictionary.
+        """
+        dict_id = zstandard.get_frame_parameters(frame).dict_id
+        dictionary = self.dictionary(dict_id) if dict_id else None
+        accepted = accepted_encodings()
+        available = request.headers.get("Available-Dictionary")
+
+        encoding = None
+        if dictionary is None and "zstd" in accepted:
+            body, encoding = frame, "zstd"
+        elif (
+            dictionary is not None
+            and "dcz" in accepted
+            and available == dictionary.structured_hash
+        ):
+            body, encoding = DCZ_HEADER + dictionary.sha256 + frame, "dcz"
+        else:
+            body = self.decompress(frame)
+
+        response = self.app.response_class(body, mimetype="application/json")
+        response.vary.update(("Accept-Encoding", "Available-Dictionary"))
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+
+        newest = self.current(kind)
+        if newest is not None and match is not None:
+            if available != newest.structured_hash:
+                url = url_for("compression_dictionary", sha256=newest.sha256.hex())
+                response.headers["Link"] = f'<{url}>; rel="compression-dictionary"'
+        return response
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 class Config:
@@ -9,3 +10,99 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv(
         "DATABASE_URL", "sqlite:////app/instance/civiliscope.db"
     )
+
+    # SQLite connection tuning (see app/database.py); SQLITE_TUNING=false
+    # falls back to SQLAlchemy defaults
+    SQLITE_TUNING = os.getenv("SQLITE_TUNING", "true").lower() == "true"
+    SQLITE_READONLY_REQUESTS = (
+        os.getenv("SQLITE_READONLY_REQUESTS", "true").lower() == "true"
+    )
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+    SQLITE_POOL_SIZE = int(
+        os.getenv("SQLITE_POOL_SIZE", os.getenv("GUNICORN_THREADS", "4"))
+    )
+
+    # How often each worker reads the dataset version published by ingest; this
+    # bounds how stale in-process caches (roster store, replica) can be
+    DATA_VERSION_CHECK_SECONDS = float(os.getenv("DATA_VERSION_CHECK_SECONDS", "2"))
+
+    # Dataset versions whose roster changes /api/legislators/changes can serve;
+    # older history is compacted and clients must re-download the rosters
+    CHANGES_RETENTION_VERSIONS = int(os.getenv("CHANGES_RETENTION_VERSIONS", "100"))
+
+    # Serve request reads from a per-worker in-memory copy of the database,
+    # reloaded when ingest publishes a new dataset version
+    SQLITE_MEMORY_REPLICA = (
+        os.getenv("SQLITE_MEMORY_REPLICA", "false").lower() == "true"
+    )
+
+    # /api/stream/updates (see app/events.py): how often each worker polls for
+    # new events, keepalive and reconnect intervals, and the per-connection
+    # limits. Connections close after STREAM_MAX_SECONDS and clients resume.
+    STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "1"))
+    STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+    STREAM_RETRY_SECONDS = float(os.getenv("STREAM_RETRY_SECONDS", "5"))
+    STREAM_MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "3600"))
+    STREAM_MAX_BILLS = int(os.getenv("STREAM_MAX_BILLS", "100"))
+    STREAM_MAX_PENDING = int(os.getenv("STREAM_MAX_PENDING", "256"))
+    STREAM_EVENT_RETENTION_HOURS = float(
+        os.getenv("STREAM_EVENT_RETENTION_HOURS", "24")
+    )
+
+    # Periodic sync jobs (see app/scheduler.py). Each worker runs a scheduler
+    # thread; a lease in the database lets only one of them run each job.
+    SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+    SCHEDULER_TICK_SECONDS = float(os.getenv("SCHEDULER_TICK_SECONDS", "5"))
+    ROSTER_SYNC_INTERVAL = float(os.getenv("ROSTER_SYNC_INTERVAL", str(24 * 3600)))
+    BILL_SYNC_INTERVAL = float(os.getenv("BILL_SYNC_INTERVAL", "120"))
+    # Bill action lists one bill sync run may fetch; watched bills missing from
+    # the bill listing take turns, least recently checked first
+    BILL_SYNC_MAX_FETCHES = int(os.getenv("BILL_SYNC_MAX_FETCHES", "50"))
+
+    # Shared cache of member and bill-action payloads (see app/upstream_cache.py).
+    # Entries are served for their TTL; the `refresh` job spends at most
+    # REFRESH_BUDGET_PER_HOUR Congress.gov calls keeping the most-read ones fresh.
+    MEMBER_CACHE_TTL = float(os.getenv("MEMBER_CACHE_TTL", str(6 * 3600)))
+    BILL_ACTIONS_CACHE_TTL = float(os.getenv("BILL_ACTIONS_CACHE_TTL", "900"))
+    # Per-worker W-TinyLFU caches in front of the table, bounded in bytes
+    MEMBER_CACHE_BYTES = int(os.getenv("MEMBER_CACHE_BYTES", str(8 * 1024 * 1024)))
+    BILL_ACTIONS_CACHE_BYTES = int(
+        os.getenv("BILL_ACTIONS_CACHE_BYTES", str(8 * 1024 * 1024))
+    )
+    # Assembled /api/legislators/<id>/profile bodies per worker, and the
+    # threads that read Congress.gov details while the local parts are queried
+    PROFILE_CACHE_BYTES = int(os.getenv("PROFILE_CACHE_BYTES", str(4 * 1024 * 1024)))
+    PROFILE_FETCH_THREADS = int(os.getenv("PROFILE_FETCH_THREADS", "4"))
+    LOCAL_CACHE_RECHECK_SECONDS = float(os.getenv("LOCAL_CACHE_RECHECK_SECONDS", "30"))
+    # Both tiers store zstd frames; the `dictionaries` job trains one dictionary
+    # per payload kind from cached bodies and replaces it after a week
+    CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", "9"))
+    CACHE_DICTIONARY_BYTES = int(os.getenv("CACHE_DICTIONARY_BYTES", "32768"))
+    CACHE_DICTIONARY_MAX_AGE = float(
+        os.getenv("CACHE_DICTIONARY_MAX_AGE", str(7 * 24 * 3600))
+    )
+    ACCESS_HALF_LIFE = float(os.getenv("ACCESS_HALF_LIFE", str(6 * 3600)))
+    ACCESS_FLUSH_SECONDS = float(os.getenv("ACCESS_FLUSH_SECONDS", "30"))
+    REFRESH_INTERVAL = float(os.getenv("REFRESH_INTERVAL", "60"))
+    REFRESH_BUDGET_PER_HOUR = int(os.getenv("REFRESH_BUDGET_PER_HOUR", "600"))
+    REFRESH_MIN_HEAT = float(os.getenv("REFRESH_MIN_HEAT", "1"))
+
+    # Overall budget (seconds) for the upstream Congress.gov calls made while
+    # serving a single request. Kept well under gunicorn's --timeout.
+    CONGRESS_API_DEADLINE = float(os.getenv("CONGRESS_API_DEADLINE", "20"))
+
+    # Per-route latency/size histograms and the Prometheus /metrics endpoint
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Opt-in request profiling (see app/profiling.py). Requests are only
+    # profiled when they send `X-Profile: <PROFILING_TOKEN>`.
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+    PROFILING_DIR = os.getenv(
+        "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "civiliscope-profiles")
+    )
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
@@ -0,0 +1,182 @@
+"""
+SQLite connection setup
+
+Applies WAL journaling, memory mapping, page cache and synchronous settings to
+every connection, sizes the connection pool for SQLite and gives request
+handlers a read-only engine so page reads never take the write path. Set
+SQLITE_TUNING=false to get SQLAlchemy's defaults back (e.g. to benchmark).
+With SQLITE_MEMORY_REPLICA=true request reads go to an in-memory copy of the
+file instead (see app/replica.py). Every worker also gets a DatasetWatcher
+(see app/invalidation.py).
+"""
+
+import logging
+import os
+import weakref
+
+import sqlalchemy as sa
+from flask import Flask, current_app, has_request_context
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy.exc import OperationalError
+
+from .replica import MemoryReplica
+
+logger = logging.getLogger(__name__)
+
+READONLY_ENGINE = "sqlite_readonly"
+MEMORY_REPLICA = "sqlite_memory_replica"
+
+# File-backed engines whose pooled connections a forked child must not reuse
+_file_engines: weakref.WeakSet = weakref.WeakSet()
+
+
+def _reset_engines_after_fork():
+    # Drop (without closing) connections inherited from the parent, e.g. under
+    # gunicorn --preload; each child opens its own on first use.
+    for engine in list(_file_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_engines_after_fork)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads made while handling a request to the in-memory
+    replica or, failing that, the read-only engine. Flushes, and anything
+    outside a request (ingest, CLI, create_all), use the read-write engine.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context():
+            replica = current_app.extensions.get(MEMORY_REPLICA)
+            if replica is not None:
+                return replica.engine
+            engine = current_app.extensions.get(READONLY_ENGINE)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def is_sqlite_file(url: sa.URL) -> bool:
+    """Whether `url` names an on-disk SQLite database (not :memory:)."""
+    return url.get_backend_name() == "sqlite" and url.database not in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def _pragmas(config: dict, readonly: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA busy_timeout = {config['SQLITE_BUSY_TIMEOUT_MS']}",
+        f"PRAGMA mmap_size = {config['SQLITE_MMAP_SIZE']}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size = -{config['SQLITE_CACHE_SIZE_KB']}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if readonly:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # journal_mode is stored in the file; readers pick it up from there
+        pragmas.append("PRAGMA journal_mode = WAL")
+        pragmas.append(f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}")
+    return pragmas
+
+
+def _listen_for_connect(engine: sa.Engine, pragmas: list[str]):
+    @sa.event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def engine_options(config: dict) -> dict:
+    """
+    SQLAlchemy engine options for a tuned SQLite file database.
+
+    Every pooled connection keeps its own prepared-statement cache, so the pool
+    is kept at one connection per request thread with a small overflow rather
+    than being recycled.
+    """
+    return {
+        "pool_size": config["SQLITE_POOL_SIZE"],
+        "max_overflow": config["SQLITE_POOL_SIZE"],
+        "pool_timeout": config["SQLITE_BUSY_TIMEOUT_MS"] / 1000,
+        "connect_args": {
+            "check_same_thread": False,
+            "cached_statements": config["SQLITE_STATEMENT_CACHE"],
+        },
+    }
+
+
+def init_database(app: Flask, db: SQLAlchemy):
+    """
+    Initialize `db` for `app`, tuning the engine when it is a SQLite file.
+
+    Args:
+        app: Flask application being created.
+        db: The application's SQLAlchemy extension.
+    """
+    url = sa.make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    tuned = app.config["SQLITE_TUNING"] and is_sqlite_file(url)
+    replicate = app.config["SQLITE_MEMORY_REPLICA"] and is_sqlite_file(url)
+    if tuned:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config) | (
+            app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+        )
+
+    db.init_app(app)
+
+    # Imported here: the version model needs `db`, which needs RoutingSession
+    from .invalidation import DATASET_WATCHER, DatasetWatcher
+
+    file_path = None
+    with app.app_context():
+        watcher = DatasetWatcher(
+            db.engine, check_seconds=app.config["DATA_VERSION_CHECK_SECONDS"]
+        )
+        if is_sqlite_file(url):
+            file_path = os.path.abspath(db.engine.url.database)
+            _file_engines.add(db.engine)
+    app.extensions[DATASET_WATCHER] = watcher
+    if replicate:
+        app.extensions[MEMORY_REPLICA] = MemoryReplica(
+            file_path, watcher.current, pool_size=app.config["SQLITE_POOL_SIZE"]
+        )
+    if not tuned:
+        return
+
+    with app.app_context():
+        engine = db.engine
+        _listen_for_connect(engine, _pragmas(app.config, readonly=False))
+
+        if app.config["SQLITE_READONLY_REQUESTS"]:
+            readonly = sa.create_engine(
+                f"sqlite:///file:{file_path}?mode=ro&uri=true",
+                **engine_options(app.config),
+            )
+            _listen_for_connect(readonly, _pragmas(app.config, readonly=True))
+            _file_engines.add(readonly)
+            app.extensions[READONLY_ENGINE] = readonly
+
+    logger.info(f"Tuned SQLite engine for {url.database}")
+
+
+def create_schema(db: SQLAlchemy):
+    """
+    Create missing tables. Workers starting together can race between the
+    existence check and CREATE TABLE; the loser simply checks again.
+    """
+    try:
+        db.create_all()
+    except OperationalError as e:
+        if "already exists" not in str(e):
+            raise
+        db.session.rollback()
+        db.create_all()
@@ -0,0 +1,242 @@
+"""
+Update events for /api/stream/updates
+
+Producers (ingest publishing a roster version, the background bill sync)
+insert update_events rows in their own transactions. In each worker, one
+EventBroker thread polls that table and fans new rows out to the
+connected stream clients. Idle connections therefore cost a queue each
+rather than a database query, whatever their number. Row ids double as
+SSE event IDs, so a client reconnecting with Last-Event-ID is sent the
+rows it missed.
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from flask import Flask
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import UpdateEvent, WatchedBill
+
+logger = logging.getLogger(__name__)
+
+EVENT_BROKER = "event_broker"
+
+ROSTER_TOPIC = "roster"
+
+BILL_TYPES = frozenset(
+    {"hr", "s", "hjres", "sjres", "hconres", "sconres", "hres", "sres"}
+)
+_BILL_KEY = re.compile(r"^(\d{1,3})/([a-z]+)/(\d{1,5})$")
+
+
+def bill_key(congress: int, bill_type: str, number: int) -> str:
+    """Canonical bill key, e.g. '119/hr/1' (the actions route's path)."""
+    return f"{congress}/{bill_type.lower()}/{number}"
+
+
+def parse_bill_key(key: str) -> tuple[int, str, int] | None:
+    """(congress, bill_type, number) for a valid bill key, otherwise None."""
+    match = _BILL_KEY.match(key.strip().lower())
+    if match is None or match[2] not in BILL_TYPES:
+        return None
+    return int(match[1]), match[2], int(match[3])
+
+
+def bill_topic(key: str) -> str:
+    return f"bill:{key}"
+
+
+def publish_event(session, kind: str, topic: str, data: dict):
+    """
+    Add an update event to `session`'s transaction. Stream clients receive it
+    once the caller commits.
+
+    Args:
+        session: Session holding the writes the event announces.
+        kind: SSE event name, e.g. 'roster' or 'bill_action'.
+        topic: What clients subscribe to, e.g. 'roster' or 'bill:119/hr/1'.
+        data: JSON payload.
+    """
+    session.execute(
+        sa.insert(UpdateEvent.__table__).values(
+            kind=kind, topic=topic, data=data, created_at=datetime.now(UTC)
+        )
+    )
+
+
+def prune_events(session, max_age: timedelta) -> int:
+    """Delete events older than `max_age`; returns the number removed."""
+    table = UpdateEvent.__table__
+    result = session.execute(
+        sa.delete(table).where(table.c.created_at < datetime.now(UTC) - max_age)
+    )
+    return result.rowcount
+
+
+def watch_bills(engine: sa.Engine, keys: list[str]):
+    """Record that stream clients want actions for these bills."""
+    if not keys:
+        return
+    table = WatchedBill.__table__
+    now = datetime.now(UTC)
+    statement = sqlite_insert(table).values(
+        [{"bill": key, "subscribed_at": now} for key in keys]
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            statement.on_conflict_do_update(
+                index_elements=[table.c.bill],
+                set_={"subscribed_at": statement.excluded.subscribed_at},
+            )
+        )
+
+
+def format_sse(kind: str, data: dict, event_id: int | None = None) -> str:
+    """One server-sent event in wire format."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def events_after(conn, after_id: int, topics=None, limit: int = 500) -> list[dict]:
+    """
+    Events with an id above `after_id`, oldest first.
+
+    Args:
+        conn: Connection to read through.
+        after_id: Last event ID already delivered.
+        topics: Only return events for these topics (default: all).
+        limit: Maximum number of events returned.
+    """
+    table = UpdateEvent.__table__
+    query = (
+        sa.select(table.c.id, table.c.kind, table.c.topic, table.c.data)
+        .where(table.c.id > after_id)
+        .order_by(table.c.id)
+        .limit(limit)
+    )
+    if topics is not None:
+        query = query.where(table.c.topic.in_(topics))
+    return [dict(row) for row in conn.execute(query).mappings()]
+
+
+def history_starts_after(conn) -> int | None:
+    """
+    Highest event ID that has been pruned, or None if no events remain, in
+    which case whether a client missed any can't be told.
+    """
+    oldest = conn.execute(sa.select(sa.func.min(UpdateEvent.__table__.c.id))).scalar()
+    return None if oldest is None else oldest - 1
+
+
+class Subscription:
+    """One stream client's topics and pending events."""
+
+    def __init__(self, topics: frozenset[str], max_pending: int):
+        self.topics = topics
+        self.events: queue.Queue = queue.Queue(maxsize=max_pending)
+        # Set when the client fell too far behind; it must reconnect and resume
+        self.overflowed = False
+
+
+class EventBroker:
+    """Per-worker fan-out of new update_events rows to stream clients."""
+
+    def __init__(self, app: Flask, poll_seconds: float = 1.0, max_pending: int = 256):
+        """
+        Initialize the broker. The polling thread starts with the first subscriber.
+
+        Args:
+            app: Application whose primary database is polled.
+            poll_seconds: Interval between polls while clients are connected.
+            max_pending: Events queued per client before it is disconnected.
+        """
+        self.app = app
+        self.poll_seconds = poll_seconds
+        self.max_pending = max_pending
+        self.last_id = 0
+        self._subscriptions: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _engine(self) -> sa.Engine:
+        # The primary: a replica only reloads when a dataset version is published
+        with self.app.app_context():
+            return db.engine
+
+    def _start(self):
+        # Threads do not survive fork; a preloaded app starts one per worker
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._engine().connect() as conn:
+            last = conn.execute(sa.select(sa.func.max(UpdateEvent.__table__.c.id)))
+            self.last_id = last.scalar() or 0
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._run, name="event-broker", daemon=True
+        )
+        self._thread.start()
+
+    def subscribe(self, topics) -> Subscription:
+        """Register a client; it receives events committed from now on."""
+        subscription = Subscription(frozenset(topics), self.max_pending)
+        with self._lock:
+            self._start()
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            if not self._subscriptions:
+                continue
+            try:
+                self.poll()
+            except sa.exc.SQLAlchemyError as e:
+                logger.warning(f"Could not poll update events: {e}")
+
+    def poll(self) -> int:
+        """Deliver events committed since the last poll; returns how many."""
+        with self._engine().connect() as conn:
+            events = events_after(conn, self.last_id)
+        if not events:
+            return 0
+
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for event in events:
+            for subscription in subscriptions:
+                if event["topic"] not in subscription.topics:
+                    continue
+                try:
+                    subscription.events.put_nowait(event)
+                except queue.Full:
+                    subscription.overflowed = True
+        self.last_id = events[-1]["id"]
+        return len(events)
+
+
+def init_events(app: Flask):
+    """Attach an EventBroker to `app`."""
+    app.extensions[EVENT_BROKER] = EventBroker(
+        app,
+        poll_seconds=app.config["STREAM_POLL_SECONDS"],
+        max_pending=app.config["STREAM_MAX_PENDING"],
+    )
@@ -0,0 +1,106 @@
+"""
+Dataset version: how ingest tells every worker's caches to reload
+
+Ingest calls publish_dataset() in the same transaction as its writes, which
+bumps a single monotonic version row. Each worker's DatasetWatcher reads that
+row at most every DATA_VERSION_CHECK_SECONDS, and in-process caches (roster
+store, in-memory replica, response caches) compare the version they were
+built from with DatasetWatcher.current() on access and rebuild lazily. Data
+is therefore never staler than the check interval, and no restart is needed.
+"""
+
+import logging
+import threading
+import time
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from flask import current_app
+
+from .events import ROSTER_TOPIC, publish_event
+from .models import DatasetVersion
+
+logger = logging.getLogger(__name__)
+
+DATASET_WATCHER = "dataset_watcher"
+
+
+def publish_dataset(session, source: str) -> int:
+    """
+    Bump the dataset version inside `session`'s transaction. Workers see the
+    new version (and the data written with it) once the caller commits.
+
+    Args:
+        session: Session holding the writes being published.
+        source: Who published (e.g. 'ingest'), kept for debugging.
+
+    Returns:
+        The new version number.
+    """
+    table = DatasetVersion.__table__
+    values = {"published_at": datetime.now(UTC), "source": source}
+    updated = session.execute(
+        table.update()
+        .where(table.c.id == 1)
+        .values(version=table.c.version + 1, **values)
+    )
+    if updated.rowcount == 0:
+        session.execute(table.insert().values(id=1, version=1, **values))
+    version = session.execute(
+        sa.select(table.c.version).where(table.c.id == 1)
+    ).scalar_one()
+    # Stream clients hear about the new version in the same commit
+    publish_event(session, "roster", ROSTER_TOPIC, {"version": version})
+    logger.info(f"Publishing dataset version {version} from {source}")
+    return version
+
+
+class DatasetWatcher:
+    """Cheap, throttled view of the published dataset version."""
+
+    def __init__(self, engine: sa.Engine, check_seconds: float = 2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            engine: Read-write engine of the primary database (never a replica).
+            check_seconds: Minimum interval between reads of the version row.
+        """
+        self.engine = engine
+        self.check_seconds = check_seconds
+        self._version = 0
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> int:
+        table = DatasetVersion.__table__
+        with self.engine.connect() as conn:
+            version = conn.execute(
+                sa.select(table.c.version).where(table.c.id == 1)
+            ).scalar()
+        return version or 0
+
+    def current(self) -> int:
+        """The latest published version, read at most every `check_seconds`."""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_seconds:
+            return self._version
+
+        with self._lock:
+            if self._checked_at is None or now - self._checked_at >= self.check_seconds:
+                try:
+                    version = self._read()
+                except sa.exc.SQLAlchemyError as e:
+                    # Keep serving the current version; retry after the interval
+                    logger.warning(f"Could not read dataset version: {e}")
+                else:
+                    if version != self._version:
+                        logger.info(f"Dataset version {self._version} -> {version}")
+                    self._version = version
+                self._checked_at = now
+            return self._version
+
+
+def current_dataset_version() -> int:
+    """The current application's dataset version."""
+    return current_app.extensions[DATASET_WATCHER].current()
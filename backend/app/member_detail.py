@@ -0,0 +1,267 @@
+"""
+Typed projection of Congress.gov member details
+
+/api/members/<id> used to forward Congress.gov's response untouched. It is
+now parsed once, when the cache is filled, into the slotted records below,
+and only the fields the frontend reads are kept (DEFAULT_FIELDS). A few more
+can be requested with ?fields= (EXTRA_FIELDS). Responses keep Congress.gov's
+names and nesting under "member", so clients read them the same way, but
+fields Congress.gov adds, renames or drops no longer leak through.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _str(value) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _items(value) -> list[dict]:
+    # Lists are sometimes wrapped as {"item": [...]} upstream
+    if isinstance(value, dict):
+        value = value.get("item")
+    return [item for item in value or [] if isinstance(item, dict)]
+
+
+@dataclass(frozen=True, slots=True)
+class Term:
+    chamber: str | None
+    congress: int | None
+    member_type: str | None
+    state_name: str | None
+    start_year: int | None
+    end_year: int | None
+    district: int | None
+
+    @classmethod
+    def from_api(cls, term: dict) -> "Term":
+        return cls(
+            chamber=_str(term.get("chamber")),
+            congress=_int(term.get("congress")),
+            member_type=_str(term.get("memberType")),
+            state_name=_str(term.get("stateName")),
+            start_year=_int(term.get("startYear")),
+            end_year=_int(term.get("endYear")),
+            district=_int(term.get("district")),
+        )
+
+    def to_json(self) -> dict:
+        data = {
+            "chamber": self.chamber,
+            "congress": self.congress,
+            "memberType": self.member_type,
+            "stateName": self.state_name,
+            "startYear": self.start_year,
+        }
+        if self.end_year is not None:
+            data["endYear"] = self.end_year
+        if self.district is not None:
+            data["district"] = self.district
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class PartySpan:
+    party_name: str | None
+    party_abbreviation: str | None
+    start_year: int | None
+    end_year: int | None
+
+    @classmethod
+    def from_api(cls, party: dict) -> "PartySpan":
+        return cls(
+            party_name=_str(party.get("partyName")),
+            party_abbreviation=_str(party.get("partyAbbreviation")),
+            start_year=_int(party.get("startYear")),
+            end_year=_int(party.get("endYear")),
+        )
+
+    def to_json(self) -> dict:
+        data = {
+            "partyName": self.party_name,
+            "partyAbbreviation": self.party_abbreviation,
+            "startYear": self.start_year,
+        }
+        if self.end_year is not None:
+            data["endYear"] = self.end_year
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class LeadershipRole:
+    congress: int | None
+    type: str | None
+
+    def to_json(self) -> dict:
+        return {"congress": self.congress, "type": self.type}
+
+
+@dataclass(frozen=True, slots=True)
+class LegislationCount:
+    count: int
+    url: str | None
+
+    @classmethod
+    def from_api(cls, value) -> "LegislationCount":
+        value = value if isinstance(value, dict) else {}
+        return cls(count=_int(value.get("count")) or 0, url=_str(value.get("url")))
+
+    def to_json(self) -> dict:
+        return {"count": self.count, "url": self.url}
+
+
+@dataclass(frozen=True, slots=True)
+class Address:
+    office_address: str | None
+    city: str | None
+    zip_code: int | None
+    phone_number: str | None
+
+    def to_json(self) -> dict:
+        return {
+            "officeAddress": self.office_address,
+            "city": self.city,
+            "zipCode": self.zip_code,
+            "phoneNumber": self.phone_number,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class MemberDetail:
+    """The parts of a Congress.gov member record that we serve."""
+
+    bioguide_id: str
+    direct_order_name: str | None
+    first_name: str | None
+    last_name: str | None
+    inverted_order_name: str | None
+    honorific_name: str | None
+    state: str | None
+    birth_year: str | None
+    image_url: str | None
+    current_member: bool | None
+    official_website_url: str | None
+    address: Address | None
+    terms: tuple[Term, ...]
+    party_history: tuple[PartySpan, ...]
+    leadership: tuple[LeadershipRole, ...]
+    sponsored: LegislationCount
+    cosponsored: LegislationCount
+    update_date: str | None
+
+    @classmethod
+    def from_api(cls, payload: dict) -> "MemberDetail | None":
+        """
+        Parse a Congress.gov /member/<id> response, or a to_json() projection
+        (it has the same shape).
+
+        Returns:
+            The member, or None if the response has no member record.
+        """
+        member = payload.get("member") if isinstance(payload, dict) else None
+        if not isinstance(member, dict) or not _str(member.get("bioguideId")):
+            return None
+
+        depiction = member.get("depiction")
+        address = member.get("addressInformation")
+        return cls(
+            bioguide_id=member["bioguideId"],
+            direct_order_name=_str(member.get("directOrderName")),
+            first_name=_str(member.get("firstName")),
+            last_name=_str(member.get("lastName")),
+            inverted_order_name=_str(member.get("invertedOrderName")),
+            honorific_name=_str(member.get("honorificName")),
+            state=_str(member.get("state")),
+            birth_year=_str(member.get("birthYear")),
+            image_url=_str(depiction.get("imageUrl"))
+            if isinstance(depiction, dict)
+            else None,
+            current_member=member.get("currentMember")
+            if isinstance(member.get("currentMember"), bool)
+            else None,
+            official_website_url=_str(member.get("officialWebsiteUrl")),
+            address=Address(
+                office_address=_str(address.get("officeAddress")),
+                city=_str(address.get("city")),
+                zip_code=_int(address.get("zipCode")),
+                phone_number=_str(address.get("phoneNumber")),
+            )
+            if isinstance(address, dict)
+            else None,
+            terms=tuple(Term.from_api(t) for t in _items(member.get("terms"))),
+            party_history=tuple(
+                PartySpan.from_api(p) for p in _items(member.get("partyHistory"))
+            ),
+            leadership=tuple(
+                LeadershipRole(_int(r.get("congress")), _str(r.get("type")))
+                for r in _items(member.get("leadership"))
+            ),
+            sponsored=LegislationCount.from_api(member.get("sponsoredLegislation")),
+            cosponsored=LegislationCount.from_api(member.get("cosponsoredLegislation")),
+            update_date=_str(member.get("updateDate")),
+        )
+
+    def to_json(self, fields: Iterable[str] = ()) -> dict:
+        """
+        The response body: DEFAULT_FIELDS plus `fields`.
+
+        Args:
+            fields: Names from EXTRA_FIELDS (or DEFAULT_FIELDS, a no-op).
+        """
+        member = {}
+        for name, encode in FIELDS.items():
+            if name in DEFAULT_FIELDS or name in fields:
+                value = encode(self)
+                if value is not None:
+                    member[name] = value
+        return {"member": member}
+
+
+FIELDS: dict[str, Callable[[MemberDetail], object]] = {
+    "bioguideId": lambda m: m.bioguide_id,
+    "directOrderName": lambda m: m.direct_order_name,
+    "firstName": lambda m: m.first_name,
+    "lastName": lambda m: m.last_name,
+    "invertedOrderName": lambda m: m.inverted_order_name,
+    "honorificName": lambda m: m.honorific_name,
+    "state": lambda m: m.state,
+    "birthYear": lambda m: m.birth_year,
+    "depiction": lambda m: {"imageUrl": m.image_url} if m.image_url else None,
+    "currentMember": lambda m: m.current_member,
+    "officialWebsiteUrl": lambda m: m.official_website_url,
+    "addressInformation": lambda m: m.address.to_json() if m.address else None,
+    "terms": lambda m: [t.to_json() for t in m.terms],
+    "partyHistory": lambda m: [p.to_json() for p in m.party_history],
+    "leadership": lambda m: [r.to_json() for r in m.leadership],
+    "sponsoredLegislation": lambda m: m.sponsored.to_json(),
+    "cosponsoredLegislation": lambda m: m.cosponsored.to_json(),
+    "updateDate": lambda m: m.update_date,
+}
+
+# What the legislator page reads
+DEFAULT_FIELDS = frozenset(
+    {
+        "bioguideId",
+        "directOrderName",
+        "lastName",
+        "honorificName",
+        "state",
+        "birthYear",
+        "depiction",
+        "terms",
+        "partyHistory",
+        "leadership",
+        "sponsoredLegislation",
+        "cosponsoredLegislation",
+        "updateDate",
+    }
+)
+EXTRA_FIELDS = frozenset(FIELDS) - DEFAULT_FIELDS
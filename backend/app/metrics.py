@@ -0,0 +1,279 @@
+"""
+Request and upstream instrumentation and the Prometheus /metrics endpoint
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (start.sh does) so every worker
+writes its samples to a shared directory and /metrics aggregates all of them;
+gunicorn.conf.py clears the directory on start and marks exited workers dead.
+"""
+
+import os
+import time
+
+from flask import Flask, Response, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from external_api import telemetry
+from external_api.circuit_breaker import CircuitBreaker
+from external_api.services import get_upstream_status
+
+from . import scheduler
+from .profiles import PROFILE_STORE
+from .upstream_cache import UPSTREAM_CACHE
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+SIZE_BUCKETS = tuple(2**n for n in range(8, 23, 2))  # 256 B .. 4 MiB
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 1800.0, 3600.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by route template.",
+    ["blueprint", "route", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, by route template and status code.",
+    ["blueprint", "route", "method", "status"],
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size, by route template.",
+    ["blueprint", "route"],
+    buckets=SIZE_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled.",
+    ["blueprint"],
+    multiprocess_mode="livesum",
+)
+
+# Congress.gov calls, labelled by endpoint template (e.g. /member/{bioguideId})
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Time spent in one Congress.gov call including retries, by endpoint template.",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUESTS = Counter(
+    "upstream_requests_total",
+    "Congress.gov calls, by endpoint template and final status or error.",
+    ["endpoint", "status"],
+)
+UPSTREAM_RESPONSE_SIZE = Histogram(
+    "upstream_response_size_bytes",
+    "Congress.gov response body size, by endpoint template.",
+    ["endpoint"],
+    buckets=SIZE_BUCKETS,
+)
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Retries made by Congress.gov calls, by endpoint template.",
+    ["endpoint"],
+)
+UPSTREAM_QUOTA = Gauge(
+    "upstream_ratelimit_remaining",
+    "Last X-RateLimit-Remaining (and -Limit) reported by Congress.gov.",
+    ["header"],
+    multiprocess_mode="mostrecent",
+)
+
+# Client state, refreshed after every request that called the upstream
+BREAKER_STATES = {
+    CircuitBreaker.CLOSED: 0,
+    CircuitBreaker.HALF_OPEN: 1,
+    CircuitBreaker.OPEN: 2,
+}
+BREAKER_STATE = Gauge(
+    "upstream_circuit_breaker_state",
+    "Circuit breaker state per worker: 0 closed, 1 half-open, 2 open.",
+    ["name"],
+    multiprocess_mode="liveall",
+)
+LIMITER_TOKENS = Gauge(
+    "upstream_rate_limiter_tokens",
+    "Tokens left in the shared Congress.gov token bucket.",
+    ["name"],
+    multiprocess_mode="mostrecent",
+)
+POOL_EVENTS = Gauge(
+    "upstream_pool_events",
+    "Keep-alive pool counters summed over live workers.",
+    ["event"],
+    multiprocess_mode="livesum",
+)
+
+# Per-worker member and bill-action caches (app/upstream_cache.py)
+CACHE_EVENTS = Gauge(
+    "upstream_cache_events",
+    "Local cache hits, misses, evictions and rejections summed over live workers.",
+    ["cache", "event"],
+    multiprocess_mode="livesum",
+)
+CACHE_BYTES = Gauge(
+    "upstream_cache_bytes",
+    "Bytes held by the local caches, summed over live workers.",
+    ["cache"],
+    multiprocess_mode="livesum",
+)
+
+
+# Background sync jobs run by app/scheduler.py
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "Wall time of one scheduled job run, by job and outcome.",
+    ["job", "outcome"],
+    buckets=JOB_BUCKETS,
+)
+JOB_RUNS = Counter(
+    "scheduler_job_runs_total",
+    "Scheduled job runs, by job and outcome.",
+    ["job", "outcome"],
+)
+JOB_LAST_SUCCESS = Gauge(
+    "scheduler_job_last_success_timestamp_seconds",
+    "Unix time the job last finished successfully.",
+    ["job"],
+    multiprocess_mode="max",
+)
+
+
+def _labels() -> tuple[str, str]:
+    """(blueprint, route template) for the current request, bounded cardinality."""
+    rule = request.url_rule
+    return request.blueprint or "app", rule.rule if rule else "<unmatched>"
+
+
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_blueprint = request.blueprint or "app"
+    IN_FLIGHT.labels(g._metrics_blueprint).inc()
+
+
+def _after_request(response: Response) -> Response:
+    started = g.pop("_metrics_started", None)
+    if started is None:
+        return response
+
+    blueprint, route = _labels()
+    REQUEST_LATENCY.labels(blueprint, route, request.method).observe(
+        time.perf_counter() - started
+    )
+    REQUESTS.labels(blueprint, route, request.method, response.status_code).inc()
+    # Measuring a streamed body (e.g. the event stream) would buffer all of it
+    size = None if response.is_streamed else response.calculate_content_length()
+    if size is not None:
+        RESPONSE_SIZE.labels(blueprint, route).observe(size)
+
+    for name in (UPSTREAM_CACHE, PROFILE_STORE):
+        cache = current_app.extensions.get(name)
+        if cache is not None:
+            _refresh_cache_gauges(cache)
+
+    if telemetry.upstream_time()[1]:
+        try:
+            _refresh_upstream_gauges()
+        except Exception as e:
+            current_app.logger.error(f"Failed to refresh upstream gauges: {e}")
+    return response
+
+
+def _observe_upstream(call: telemetry.UpstreamCall):
+    UPSTREAM_LATENCY.labels(call.endpoint, call.status).observe(call.seconds)
+    UPSTREAM_REQUESTS.labels(call.endpoint, call.status).inc()
+    if call.bytes_received:
+        UPSTREAM_RESPONSE_SIZE.labels(call.endpoint).observe(call.bytes_received)
+    if call.retries:
+        UPSTREAM_RETRIES.labels(call.endpoint).inc(call.retries)
+    if call.ratelimit_remaining is not None:
+        UPSTREAM_QUOTA.labels("remaining").set(call.ratelimit_remaining)
+    if call.ratelimit_limit is not None:
+        UPSTREAM_QUOTA.labels("limit").set(call.ratelimit_limit)
+
+
+def _observe_job(run: scheduler.JobRun):
+    JOB_DURATION.labels(run.job, run.outcome).observe(run.seconds)
+    JOB_RUNS.labels(run.job, run.outcome).inc()
+    if run.outcome == scheduler.SUCCESS:
+        JOB_LAST_SUCCESS.labels(run.job).set(run.finished_at)
+
+
+def _refresh_upstream_gauges():
+    status = get_upstream_status()
+    breaker = status["circuit_breaker"]
+    BREAKER_STATE.labels(breaker["name"]).set(BREAKER_STATES[breaker["state"]])
+    limiter = status["rate_limiter"]
+    if limiter is not None:
+        LIMITER_TOKENS.labels(limiter["name"]).set(limiter["tokens"])
+    pool = status["connection_pool"]
+    for event in (
+        "connections_opened",
+        "connections_reused",
+        "checkouts_waited",
+        "pool_exhausted",
+    ):
+        POOL_EVENTS.labels(event).set(pool[event])
+
+
+def _refresh_cache_gauges(cache):
+    for kind, stats in cache.stats().items():
+        for event in ("hits", "misses", "evictions", "rejections"):
+            CACHE_EVENTS.labels(kind, event).set(stats[event])
+        CACHE_BYTES.labels(kind).set(stats["bytes"])
+
+
+def _teardown_request(exc):
+    # Runs even when the request failed before after_request
+    blueprint = g.pop("_metrics_blueprint", None)
+    if blueprint is not None:
+        IN_FLIGHT.labels(blueprint).dec()
+
+
+def metrics_view():
+    """Render every worker's metrics in the Prometheus text format."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app: Flask):
+    """
+    Instrument every request of `app`, every Congress.gov call and every
+    scheduled job run, and expose the results at /metrics.
+
+    Args:
+        app: Flask application to instrument.
+    """
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    telemetry.add_listener(_observe_upstream)
+    scheduler.add_listener(_observe_job)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -21,3 +21,189 @@ class Senator(Legislator):
 class Representative(Legislator):
     __tablename__ = "representatives"
     district = db.Column(db.Integer, nullable=False)
+
+
+class Term(db.Model):
+    # Every term of every legislator in the congress-legislators files, not
+    # just the latest one kept in senators/representatives
+    __tablename__ = "terms"
+    id = db.Column(db.Integer, primary_key=True)
+    bioguide_id = db.Column(db.String(7), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    type = db.Column(db.String(3), nullable=False)  # sen or rep
+    state = db.Column(db.String(2), nullable=False)
+    district = db.Column(db.Integer)  # representatives only; 0 is at-large
+    senate_class = db.Column(db.Integer)
+    party = db.Column(db.String(50))
+    start = db.Column(db.Date, nullable=False)
+    end = db.Column(db.Date, nullable=False)
+
+
+class TermCongress(db.Model):
+    # Interval index over terms: one row per Congress a term overlaps, so a
+    # date only has to be compared with the terms in its Congress (see
+    # app/terms.py). ix_term_congresses_seat covers ?state= and &district=.
+    __tablename__ = "term_congresses"
+    __table_args__ = (
+        db.Index("ix_term_congresses_seat", "congress", "state", "district", "term_id"),
+    )
+    congress = db.Column(db.Integer, primary_key=True)
+    term_id = db.Column(db.Integer, primary_key=True)
+    state = db.Column(db.String(2), nullable=False)
+    district = db.Column(db.Integer)
+
+
+class Committee(db.Model):
+    # committees-current.yaml; a subcommittee's thomas_id is its parent's
+    # followed by its own number (e.g. SSAF13), as in the membership file
+    __tablename__ = "committees"
+    thomas_id = db.Column(db.String(10), primary_key=True)
+    parent_id = db.Column(db.String(10), index=True)
+    name = db.Column(db.String(200), nullable=False)
+    chamber = db.Column(db.String(10), nullable=False)  # house, senate or joint
+    url = db.Column(db.String(255))
+
+
+class CommitteeMembership(db.Model):
+    # committee-membership-current.yaml. Both directions are answered from an
+    # index alone: the table is WITHOUT ROWID, so rows are stored in
+    # (committee_id, bioguide_id) order, and ix_committee_memberships_member
+    # covers the per-legislator query (see app/committees.py).
+    __tablename__ = "committee_memberships"
+    __table_args__ = (
+        db.Index(
+            "ix_committee_memberships_member",
+            "bioguide_id",
+            "committee_id",
+            "party",
+            "rank",
+            "title",
+        ),
+        {"sqlite_with_rowid": False},
+    )
+    committee_id = db.Column(db.String(10), primary_key=True)
+    bioguide_id = db.Column(db.String(7), primary_key=True)
+    name = db.Column(db.String(100))
+    party = db.Column(db.String(10))  # majority or minority
+    rank = db.Column(db.Integer)
+    title = db.Column(db.String(50))
+
+
+class DistrictOffice(db.Model):
+    # legislators-district-offices.yaml
+    __tablename__ = "district_offices"
+    id = db.Column(db.String(60), primary_key=True)
+    bioguide_id = db.Column(db.String(7), nullable=False, index=True)
+    address = db.Column(db.String(200))
+    suite = db.Column(db.String(100))
+    building = db.Column(db.String(100))
+    city = db.Column(db.String(50))
+    state = db.Column(db.String(2))
+    zip = db.Column(db.String(10))
+    phone = db.Column(db.String(20))
+    fax = db.Column(db.String(20))
+    hours = db.Column(db.String(200))
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+
+
+class SocialAccount(db.Model):
+    # legislators-social-media.yaml; account_id is the platform's numeric ID
+    __tablename__ = "social_accounts"
+    bioguide_id = db.Column(db.String(7), primary_key=True)
+    platform = db.Column(db.String(20), primary_key=True)
+    handle = db.Column(db.String(100))
+    account_id = db.Column(db.String(40))
+
+
+class DatasetVersion(db.Model):
+    # Single row bumped by ingest when it publishes (see app/invalidation.py)
+    __tablename__ = "dataset_version"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    published_at = db.Column(db.DateTime)
+    source = db.Column(db.String(50))
+    # Changes at or below this version were compacted away (see app/changes.py)
+    compacted_through = db.Column(db.Integer, nullable=False, default=0)
+
+
+class RosterChange(db.Model):
+    # Field-level roster diff recorded by each ingest
+    __tablename__ = "roster_changes"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, index=True)
+    chamber = db.Column(db.String(20), nullable=False)
+    bioguide_id = db.Column(db.String(7), nullable=False)
+    op = db.Column(db.String(6), nullable=False)
+    fields = db.Column(db.JSON)
+
+
+class UpdateEvent(db.Model):
+    # Events pushed by /api/stream/updates (see app/events.py). AUTOINCREMENT
+    # keeps ids (the SSE event IDs) from being reused after pruning.
+    __tablename__ = "update_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    topic = db.Column(db.String(40), nullable=False)
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+class WatchedBill(db.Model):
+    # Bills stream clients subscribed to; the bill sync fetches their actions
+    __tablename__ = "watched_bills"
+    bill = db.Column(db.String(20), primary_key=True)
+    subscribed_at = db.Column(db.DateTime, nullable=False)
+
+
+class BillSyncState(db.Model):
+    # Latest action the bill sync has seen per bill
+    __tablename__ = "bill_sync_state"
+    bill = db.Column(db.String(20), primary_key=True)
+    latest_action = db.Column(db.String(64), nullable=False)
+    checked_at = db.Column(db.DateTime, nullable=False)
+
+
+class ScheduledJob(db.Model):
+    # Lease and schedule of each background job (see app/scheduler.py); times
+    # are Unix timestamps
+    __tablename__ = "scheduled_jobs"
+    name = db.Column(db.String(50), primary_key=True)
+    holder = db.Column(db.String(100))
+    lease_expires_at = db.Column(db.Float)
+    next_run_at = db.Column(db.Float, nullable=False)
+    last_started_at = db.Column(db.Float)
+    last_finished_at = db.Column(db.Float)
+    last_outcome = db.Column(db.String(20))
+    failures = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UpstreamCacheEntry(db.Model):
+    # Shared cache of Congress.gov payloads (see app/upstream_cache.py); times
+    # are Unix timestamps
+    __tablename__ = "upstream_cache"
+    kind = db.Column(db.String(20), primary_key=True)
+    key = db.Column(db.String(40), primary_key=True)
+    # zstd frame of the JSON body; its header names the dictionary it needs
+    body = db.Column(db.LargeBinary, nullable=False)
+    fetched_at = db.Column(db.Float, nullable=False, index=True)
+
+
+class CompressionDictionary(db.Model):
+    # zstd dictionaries trained on cached bodies (see app/compression.py)
+    __tablename__ = "compression_dictionaries"
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    kind = db.Column(db.String(20), nullable=False, index=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    trained_at = db.Column(db.Float, nullable=False)
+
+
+class AccessCount(db.Model):
+    # Requests per cached key and hour, summed over workers; decayed on read
+    __tablename__ = "access_counts"
+    kind = db.Column(db.String(20), primary_key=True)
+    key = db.Column(db.String(40), primary_key=True)
+    window = db.Column(db.Integer, primary_key=True, index=True)
+    count = db.Column(db.Integer, nullable=False)
@@ -0,0 +1,175 @@
+"""
+Composite legislator profiles
+
+/api/legislators/<id>/profile answers the legislator page in one round trip:
+the roster row, committee assignments, district offices, social accounts and
+the cached Congress.gov member details. The upstream read is started on a
+helper thread first, so a Congress.gov fetch overlaps the local queries
+instead of following them.
+
+Each worker caches assembled profiles in a W-TinyLFU cache keyed by bioguide
+ID. An entry is tagged with the dataset version its local parts were read at
+and the fetched_at of the member body it embeds. When both still match, the
+encoded body is served as-is. When only the member body changed, the local
+parts are reused. The pair is also the response's ETag.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple
+
+import sqlalchemy as sa
+from flask import Flask, current_app
+
+from external_api.deadline import Deadline
+
+from . import db
+from .committees import committees_of
+from .invalidation import current_dataset_version
+from .models import DistrictOffice, SocialAccount
+from .roster import get_roster
+from .tinylfu import WTinyLFU
+from .upstream_cache import MEMBER, CachedBody, cached_upstream
+
+PROFILE_STORE = "profile_store"
+
+
+class Profile(NamedTuple):
+    dataset_version: int
+    member_fetched_at: float | None
+    local: dict  # everything read from the database, at dataset_version
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f"{self.dataset_version}-{self.member_fetched_at or 0:.3f}"
+
+
+def load_local(bioguide_id: str) -> dict:
+    """The profile's local parts: roster row, committees, offices and social."""
+    roster = get_roster()
+    chamber, record = None, roster.senators.by_id.get(bioguide_id)
+    if record is not None:
+        chamber = "senate"
+    else:
+        record = roster.representatives.by_id.get(bioguide_id)
+        if record is not None:
+            chamber = "house"
+
+    offices = db.session.execute(
+        sa.select(DistrictOffice.__table__)
+        .where(DistrictOffice.bioguide_id == bioguide_id)
+        .order_by(DistrictOffice.id)
+    ).mappings()
+    social = db.session.execute(
+        sa.select(
+            SocialAccount.platform, SocialAccount.handle, SocialAccount.account_id
+        )
+        .where(SocialAccount.bioguide_id == bioguide_id)
+        .order_by(SocialAccount.platform)
+    )
+
+    return {
+        "chamber": chamber,
+        "legislator": None if record is None else record.detail(),
+        "committees": committees_of(db.session, bioguide_id),
+        "offices": [
+            {k: v for k, v in row.items() if k != "bioguide_id"} for row in offices
+        ],
+        "social": {
+            platform: {"handle": handle, "id": account_id}
+            for platform, handle, account_id in social
+        },
+    }
+
+
+def _found(local: dict) -> bool:
+    return local["legislator"] is not None or any(
+        local[part] for part in ("committees", "offices", "social")
+    )
+
+
+class ProfileStore:
+    """Per-worker cache of assembled profiles and the threads fetching members."""
+
+    def __init__(self, app: Flask, max_bytes: int, threads: int = 4):
+        """
+        Initialize the store.
+
+        Args:
+            app: Application whose JSON provider encodes the profiles.
+            max_bytes: Size of the profile cache.
+            threads: Helper threads for upstream member reads.
+        """
+        self.app = app
+        self.cache = WTinyLFU(max_bytes)
+        self.threads = threads
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _submit(self, fn, *args) -> Future:
+        # Created on first use, so a worker forked from a preloaded app
+        # starts its own threads
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.threads, thread_name_prefix="profile"
+                    )
+        # Carry request context (priority class, staleness) into the thread
+        ctx = contextvars.copy_context()
+        return self._executor.submit(ctx.run, fn, *args)
+
+    def get(self, bioguide_id: str, deadline: Deadline | None = None) -> Profile | None:
+        """
+        The current profile, assembled again only if its parts changed.
+
+        Returns:
+            The profile, or None if neither the database nor Congress.gov
+            knows the ID.
+        """
+        pending = self._submit(cached_upstream, MEMBER, bioguide_id, deadline)
+
+        version = current_dataset_version()
+        cached = self.cache.get(bioguide_id)
+        if cached is not None and cached.dataset_version == version:
+            local = cached.local
+        else:
+            cached, local = None, load_local(bioguide_id)
+
+        member: CachedBody | None = pending.result()
+        fetched_at = None if member is None else member.fetched_at
+        if cached is not None and cached.member_fetched_at == fetched_at:
+            return cached
+        if member is None and not _found(local):
+            return None
+
+        document = {
+            "bioguide_id": bioguide_id,
+            **local,
+            "member": None if member is None else member.json()["member"],
+        }
+        body = self.app.json.response(document).get_data()
+        profile = Profile(version, fetched_at, local, body)
+        # The parsed local parts take about as much memory again as the body
+        self.cache.put(bioguide_id, profile, len(bioguide_id) + 2 * len(body))
+        return profile
+
+    def stats(self) -> dict[str, dict]:
+        """This worker's profile cache counters, for /health/cache."""
+        return {"profile": self.cache.stats().to_dict()}
+
+
+def get_profile(bioguide_id: str, deadline: Deadline | None = None) -> Profile | None:
+    """Read a profile through the current application's ProfileStore."""
+    return current_app.extensions[PROFILE_STORE].get(bioguide_id, deadline)
+
+
+def init_profiles(app: Flask):
+    """Attach a ProfileStore to `app`."""
+    app.extensions[PROFILE_STORE] = ProfileStore(
+        app,
+        app.config["PROFILE_CACHE_BYTES"],
+        threads=app.config["PROFILE_FETCH_THREADS"],
+    )
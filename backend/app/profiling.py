@@ -0,0 +1,192 @@
+"""
+Opt-in per-request profiling
+
+With PROFILING_ENABLED=true and a PROFILING_TOKEN set, a request carrying
+`X-Profile: <token>` runs under a profiler from the first before_request hook
+to the last after_request hook, so it covers the view, SQLAlchemy queries,
+JSON encoding and Congress.gov calls made on the request thread. Profiles are
+written to PROFILING_DIR and can be fetched from /debug/profiles/<name> with
+the same header.
+
+X-Profile-Mode selects the profiler:
+    sample   (default) stack sampler writing folded stacks, one
+             `frame;frame;frame count` line per stack, ready for
+             flamegraph.pl, speedscope or inferno.
+    cprofile deterministic cProfile, written as a pstats dump (snakeviz,
+             flameprof, `python -m pstats`). Only one can run per process
+             (Python 3.12+ refuses a second), so a cprofile request that
+             arrives while another is running is sampled instead.
+
+When PROFILING_ENABLED is false no hook is registered at all.
+"""
+
+import cProfile
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import Flask, abort, current_app, g, request, send_from_directory
+
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+
+# Held while a cProfile is enabled in this process
+_cprofile_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval from a helper
+    thread. Only the profiled thread is sampled, so work it hands off to other
+    threads (e.g. parallel page fetches) shows up as time spent waiting.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """
+        Initialize the sampler.
+
+        Args:
+            thread_id: Identifier of the thread to sample (threading.get_ident()).
+            interval: Seconds between samples.
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    @staticmethod
+    def _label(frame) -> str:
+        module = frame.f_globals.get("__name__", "?")
+        return f"{module}:{frame.f_code.co_qualname}".replace(";", ",")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        """Samples in the folded-stack format read by flamegraph tools."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+def _authorized() -> bool:
+    token = current_app.config["PROFILING_TOKEN"]
+    supplied = request.headers.get("X-Profile", "")
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def _profile_name(extension: str) -> str:
+    endpoint = re.sub(r"[^A-Za-z0-9_.-]", "_", request.endpoint or "unmatched")
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}-{endpoint}-{uuid.uuid4().hex[:8]}.{extension}"
+
+
+def _stop(mode: str, profiler):
+    if mode == CPROFILE:
+        profiler.disable()
+        _cprofile_lock.release()
+    else:
+        profiler.stop()
+
+
+def _start_profile():
+    if "X-Profile" not in request.headers or not _authorized():
+        return
+
+    mode = request.headers.get("X-Profile-Mode", SAMPLE).lower()
+    profiler = None
+    if mode == CPROFILE and _cprofile_lock.acquire(blocking=False):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another tool (e.g. coverage) holds the profiling hook
+            _cprofile_lock.release()
+            profiler = None
+    if profiler is None:
+        mode = SAMPLE
+        profiler = StackSampler(
+            threading.get_ident(),
+            current_app.config["PROFILING_INTERVAL_MS"] / 1000,
+        )
+        profiler.start()
+    g._profile = (mode, profiler, time.perf_counter())
+
+
+def _finish_profile(response):
+    active = g.pop("_profile", None)
+    if active is None:
+        return response
+
+    mode, profiler, started = active
+    elapsed = time.perf_counter() - started
+    directory = current_app.config["PROFILING_DIR"]
+    os.makedirs(directory, exist_ok=True)
+
+    _stop(mode, profiler)
+    if mode == CPROFILE:
+        name = _profile_name("prof")
+        profiler.dump_stats(os.path.join(directory, name))
+    else:
+        name = _profile_name("folded")
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(profiler.folded())
+
+    current_app.logger.info(f"Profiled {request.path} in {elapsed:.3f}s -> {name}")
+    response.headers["X-Profile-File"] = name
+    response.headers["X-Profile-Seconds"] = f"{elapsed:.3f}"
+    return response
+
+
+def _teardown_profile(exc):
+    # A request that failed before after_request must not leave a profiler running
+    active = g.pop("_profile", None)
+    if active is not None:
+        _stop(*active[:2])
+
+
+def download_profile(name: str):
+    """Return a stored profile; requires the same X-Profile token."""
+    if not _authorized():
+        abort(404)
+    return send_from_directory(
+        current_app.config["PROFILING_DIR"], name, mimetype="text/plain"
+    )
+
+
+def init_profiling(app: Flask):
+    """
+    Register the profiling hooks and download route on `app`. Call before any
+    other hooks are registered so the profile spans them all.
+
+    Args:
+        app: Flask application to instrument.
+    """
+    if not app.config["PROFILING_TOKEN"]:
+        app.logger.warning("PROFILING_ENABLED is set without PROFILING_TOKEN")
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_teardown_profile)
+    app.add_url_rule("/debug/profiles/<name>", "download_profile", download_profile)
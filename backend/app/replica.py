@@ -0,0 +1,120 @@
+"""
+In-memory read replica of the roster database
+
+Each worker copies the published SQLite file into memory and serves request
+reads from that copy, so roster queries never touch the disk or its locks.
+The copy is rebuilt on first use after ingest publishes a new dataset version
+(see app/invalidation.py).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryReplica:
+    """
+    Read-only in-memory snapshot of a SQLite file behind a SQLAlchemy engine.
+
+    The snapshot is taken with Connection.serialize() and every pooled
+    connection deserializes its own copy, so threads never share a
+    connection. A reload builds a new engine and swaps it in; sessions
+    already holding a connection finish on the old snapshot.
+    """
+
+    def __init__(
+        self, path: str, dataset_version: Callable[[], int], pool_size: int = 4
+    ):
+        """
+        Initialize the replica. Nothing is loaded until first use.
+
+        Args:
+            path: SQLite database file to mirror.
+            dataset_version: Returns the published dataset version (throttled).
+            pool_size: In-memory connections kept per worker.
+        """
+        self.path = path
+        self.dataset_version = dataset_version
+        self.pool_size = pool_size
+        self.reloads = 0
+        self._engine: sa.Engine | None = None
+        self._version: int | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _open_source(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def _connect(self, snapshot: bytes) -> sqlite3.Connection:
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        conn.deserialize(snapshot)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _load(self, version: int):
+        """Take a fresh snapshot of the file and build an engine over it."""
+        if self._pid != os.getpid():
+            # Never reuse pooled connections inherited across fork
+            self._pid = os.getpid()
+            self._engine = None
+
+        started = time.perf_counter()
+        source = self._open_source()
+        try:
+            snapshot = bytearray(source.serialize())
+        finally:
+            source.close()
+        # Header bytes 18-19 mark a WAL database, which an in-memory copy cannot
+        # open; switch the copy back to the rollback journal format
+        snapshot[18:20] = b"\x01\x01"
+        snapshot = bytes(snapshot)
+
+        old = self._engine
+        self._engine = sa.create_engine(
+            "sqlite://",
+            creator=lambda: self._connect(snapshot),
+            poolclass=sa.pool.QueuePool,
+            pool_size=self.pool_size,
+            max_overflow=self.pool_size,
+        )
+        self._version = version
+        if old is not None:
+            old.dispose(close=False)
+            self.reloads += 1
+        logger.info(
+            f"Loaded {len(snapshot)} byte in-memory replica of {self.path} "
+            f"(dataset version {version}) in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+
+    def _current(self, version: int) -> bool:
+        return (
+            self._engine is not None
+            and self._version == version
+            and self._pid == os.getpid()
+        )
+
+    @property
+    def engine(self) -> sa.Engine:
+        """The current snapshot's engine, reloading first after a new version."""
+        engine = self._engine
+        if self._current(self.dataset_version()):
+            return engine
+        return self.refresh()
+
+    def refresh(self) -> sa.Engine:
+        """Load the file now if it has never been loaded or a new version exists."""
+        with self._lock:
+            version = self.dataset_version()
+            if not self._current(version):
+                self._load(version)
+            return self._engine
@@ -0,0 +1,243 @@
+"""
+Immutable in-process roster store
+
+The senator and representative routes answer from here instead of querying
+through SQLAlchemy. Each worker reads both tables once into slotted records
+with indexes by bioguide ID, state and party, pre-encodes the JSON bodies,
+and swaps in a new Roster when ingest publishes a new dataset version (see
+app/invalidation.py).
+"""
+
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+import sqlalchemy as sa
+from flask import Flask, Response, current_app
+
+from . import db
+from .invalidation import DATASET_WATCHER
+from .models import Representative, Senator
+
+logger = logging.getLogger(__name__)
+
+ROSTER_STORE = "roster_store"
+
+
+class LegislatorRecord(ABC):
+    """Read-only row of a roster table."""
+
+    __slots__ = (
+        "bioguide_id",
+        "full_name",
+        "last_name",
+        "state",
+        "party",
+        "photo_url",
+        "term_start",
+        "term_end",
+    )
+    FIELDS = __slots__
+
+    def __init__(self, row: sa.RowMapping):
+        for name in self.FIELDS:
+            object.__setattr__(self, name, row[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @abstractmethod
+    def summary(self) -> dict:
+        """Fields returned by the list route."""
+
+    @abstractmethod
+    def detail(self) -> dict:
+        """Fields returned by the detail route."""
+
+
+class SenatorRecord(LegislatorRecord):
+    __slots__ = ("seat_number",)
+    FIELDS = LegislatorRecord.FIELDS + __slots__
+
+    def summary(self) -> dict:
+        return {
+            "bioguide_id": self.bioguide_id,
+            "name": self.full_name,
+            "state": self.state,
+            "party": self.party,
+            "photo_url": self.photo_url,
+            "seat_number": self.seat_number,
+        }
+
+    def detail(self) -> dict:
+        return self.summary() | {
+            "term_start": self.term_start,
+            "term_end": self.term_end,
+        }
+
+
+class RepresentativeRecord(LegislatorRecord):
+    __slots__ = ("district",)
+    FIELDS = LegislatorRecord.FIELDS + __slots__
+
+    def summary(self) -> dict:
+        return {
+            "bioguide_id": self.bioguide_id,
+            "name": self.full_name,
+            "state": self.state,
+            "district": self.district,
+            "party": self.party,
+            "photo_url": self.photo_url,
+        }
+
+    def detail(self) -> dict:
+        return self.summary() | {
+            "term_start": self.term_start,
+            "term_end": self.term_end,
+        }
+
+
+class Chamber:
+    """One chamber's records (sorted by last name), indexes and encoded bodies."""
+
+    __slots__ = (
+        "records",
+        "by_id",
+        "by_state",
+        "by_party",
+        "_summaries",
+        "_list_body",
+        "_detail_bodies",
+    )
+
+    def __init__(self, records: list[LegislatorRecord], json):
+        """
+        Build the indexes and pre-encode every response body.
+
+        Args:
+            records: Records in list order.
+            json: The app's JSON provider (app.json), so bodies match jsonify.
+        """
+        by_state, by_party = defaultdict(list), defaultdict(list)
+        for record in records:
+            by_state[record.state].append(record)
+            by_party[record.party].append(record)
+
+        self.records = tuple(records)
+        self.by_id = {r.bioguide_id: r for r in records}
+        self.by_state = {k: tuple(v) for k, v in by_state.items()}
+        self.by_party = {k: tuple(v) for k, v in by_party.items()}
+        self._summaries = {r.bioguide_id: r.summary() for r in records}
+        self._list_body = _encode(json, list(self._summaries.values()))
+        self._detail_bodies = {
+            r.bioguide_id: _encode(json, r.detail()) for r in records
+        }
+
+    def list_body(self, state: str | None = None, party: str | None = None) -> bytes:
+        """Encoded list response, optionally filtered by state and/or party."""
+        if state is None and party is None:
+            return self._list_body
+
+        selected = self.records
+        if state is not None:
+            selected = self.by_state.get(state.upper(), ())
+        if party is not None:
+            wanted = {r.bioguide_id for r in self.by_party.get(party, ())}
+            selected = [r for r in selected if r.bioguide_id in wanted]
+        return _encode(
+            current_app.json, [self._summaries[r.bioguide_id] for r in selected]
+        )
+
+    def detail_body(self, bioguide_id: str) -> bytes | None:
+        """Encoded detail response, or None if the ID is not in this chamber."""
+        return self._detail_bodies.get(bioguide_id)
+
+
+class Roster:
+    """Immutable snapshot of both chambers at one dataset version."""
+
+    __slots__ = ("version", "senators", "representatives", "built_at")
+
+    def __init__(self, version, senators: Chamber, representatives: Chamber):
+        self.version = version
+        self.senators = senators
+        self.representatives = representatives
+        self.built_at = time.time()
+
+
+def _encode(json, payload) -> bytes:
+    # Exactly the bytes jsonify would produce (separators, trailing newline)
+    return json.response(payload).get_data()
+
+
+def _load_chamber(conn, model, record_class, json) -> Chamber:
+    rows = conn.execute(
+        sa.select(model.__table__).order_by(model.__table__.c.last_name)
+    ).mappings()
+    return Chamber([record_class(row) for row in rows], json)
+
+
+class RosterStore:
+    """Holds the current Roster and rebuilds it when the dataset version changes."""
+
+    def __init__(self, app: Flask):
+        """
+        Initialize the store. The roster is built on first use.
+
+        Args:
+            app: Application whose database and JSON encoder are used.
+        """
+        self.app = app
+        self.builds = 0
+        self._roster: Roster | None = None
+        self._lock = threading.Lock()
+
+    def _build(self, version) -> Roster:
+        started = time.perf_counter()
+        json = self.app.json
+        # Read the file directly: a replica may not have caught up yet
+        with self.app.app_context(), db.engine.connect() as conn:
+            roster = Roster(
+                version,
+                _load_chamber(conn, Senator, SenatorRecord, json),
+                _load_chamber(conn, Representative, RepresentativeRecord, json),
+            )
+        self.builds += 1
+        logger.info(
+            f"Built roster ({len(roster.senators.records)} senators, "
+            f"{len(roster.representatives.records)} representatives) in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        return roster
+
+    def get(self) -> Roster:
+        """The current roster, rebuilt first if a new dataset version was published."""
+        version = self.app.extensions[DATASET_WATCHER].current()
+        roster = self._roster
+        if roster is not None and roster.version == version:
+            return roster
+
+        with self._lock:
+            roster = self._roster
+            if roster is None or roster.version != version:
+                roster = self._build(version)
+                # Readers holding the old roster keep using it; no locking needed
+                self._roster = roster
+            return roster
+
+
+def get_roster() -> Roster:
+    """The current application's roster."""
+    return current_app.extensions[ROSTER_STORE].get()
+
+
+def json_response(body: bytes) -> Response:
+    """Wrap a pre-encoded JSON body in a response."""
+    return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+
+def init_roster(app: Flask):
+    """Attach a RosterStore to `app`."""
+    app.extensions[ROSTER_STORE] = RosterStore(app)
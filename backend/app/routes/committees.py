@@ -0,0 +1,21 @@
+from flask import Blueprint, abort, jsonify, request
+
+from .. import db
+from ..committees import committee_detail, list_committees
+
+bp = Blueprint("committees", __name__, url_prefix="/api/committees")
+
+
+@bp.route("/", methods=["GET"])
+def get_all_committees():
+    # ?chamber=house, senate or joint
+    return jsonify(list_committees(db.session, request.args.get("chamber")))
+
+
+@bp.route("/<thomas_id>", methods=["GET"])
+def get_committee(thomas_id):
+    """A committee or subcommittee (e.g. SSAF or SSAF13) and its members."""
+    committee = committee_detail(db.session, thomas_id.upper())
+    if committee is None:
+        abort(404)
+    return jsonify(committee)
@@ -1,18 +1,22 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify
 
+from external_api.deadline import Deadline
 from external_api.services import (
-    get_bill_actions_service,
     get_bills_for_current_congress,
     get_current_congress,
 )
 
+from ..events import bill_key
+from ..upstream_cache import BILL_ACTIONS, cached_upstream
+
 bp = Blueprint("congress", __name__, url_prefix="/api/congress")
 
 
 @bp.route("/current", methods=["GET"])
 def get_current_congress_info():
     """Get current Congress information from Congress.gov API."""
-    congress_data = get_current_congress()
+    deadline = Deadline(current_app.config["CONGRESS_API_DEADLINE"])
+    congress_data = get_current_congress(deadline=deadline)
 
     if congress_data is None:
         return jsonify({"error": "Current congress information not available"}), 404
@@ -23,7 +27,8 @@ def get_current_congress_info():
 @bp.route("/bills", methods=["GET"])
 def get_bills():
     """Get bills for the current Congress from Congress.gov API."""
-    bills_data = get_bills_for_current_congress()
+    deadline = Deadline(current_app.config["CONGRESS_API_DEADLINE"])
+    bills_data = get_bills_for_current_congress(deadline=deadline)
 
     if bills_data is None:
         return jsonify({"error": "Bills information not available"}), 404
@@ -70,7 +75,10 @@ def get_bill_actions(congress: int, bill_type: str, bill_number: int):
             }
         ), 400
 
-    actions_data = get_bill_actions_service(congress, bill_type.lower(), bill_number)
+    deadline = Deadline(current_app.config["CONGRESS_API_DEADLINE"])
+    actions_data = cached_upstream(
+        BILL_ACTIONS, bill_key(congress, bill_type, bill_number), deadline=deadline
+    )
 
     if actions_data is None:
         return jsonify(
@@ -79,4 +87,4 @@ def get_bill_actions(congress: int, bill_type: str, bill_number: int):
             }
         ), 404
 
-    return jsonify(actions_data)
+    return actions_data.response()
@@ -0,0 +1,50 @@
+from flask import Blueprint, current_app, jsonify, request
+
+from external_api.deadline import Deadline
+
+from .. import db
+from ..changes import HistoryCompacted, changes_since
+from ..committees import committees_of
+from ..profiles import get_profile
+from ..roster import json_response
+
+bp = Blueprint("legislators", __name__, url_prefix="/api/legislators")
+
+
+@bp.route("/changes", methods=["GET"])
+def get_changes():
+    """Roster inserts, updates and deletes published after ?since=<version>."""
+    since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        return jsonify({"error": "since must be a non-negative dataset version"}), 400
+
+    try:
+        feed = changes_since(db.session, since)
+    except HistoryCompacted as e:
+        # 410 tells the client to re-download the full rosters
+        return jsonify({"error": str(e), "compacted_through": e.compacted_through}), 410
+
+    return jsonify({"since": since} | feed)
+
+
+@bp.route("/<bioguide_id>/profile", methods=["GET"])
+def get_profile_route(bioguide_id):
+    """
+    Everything the legislator page shows in one response (see app/profiles.py):
+    roster row, committees, district offices, social accounts and the
+    Congress.gov member details.
+    """
+    deadline = Deadline(current_app.config["CONGRESS_API_DEADLINE"])
+    profile = get_profile(bioguide_id, deadline=deadline)
+    if profile is None:
+        return jsonify({"error": "Legislator not found"}), 404
+
+    response = json_response(profile.body)
+    response.set_etag(profile.etag)
+    return response.make_conditional(request)
+
+
+@bp.route("/<bioguide_id>/committees", methods=["GET"])
+def get_committees(bioguide_id):
+    """Committee and subcommittee assignments, with rank and title."""
+    return jsonify(committees_of(db.session, bioguide_id))
@@ -1,16 +1,38 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, request
 
-from external_api.services import get_member_details
+from external_api.deadline import Deadline
+
+from ..member_detail import EXTRA_FIELDS, FIELDS, MemberDetail
+from ..upstream_cache import MEMBER, cached_upstream
 
 bp = Blueprint("members", __name__, url_prefix="/api/members")
 
 
 @bp.route("/<bioguide_id>", methods=["GET"])
 def get_member(bioguide_id):
-    """Get detailed member information from Congress.gov API by bioguide ID."""
-    member_data = get_member_details(bioguide_id)
+    """
+    Get member details from Congress.gov by bioguide ID: the fields the
+    legislator page reads, plus any of app.member_detail.EXTRA_FIELDS listed
+    in ?fields=.
+    """
+    fields = set(filter(None, request.args.get("fields", "").split(",")))
+    unknown = fields - FIELDS.keys()
+    if unknown:
+        return jsonify(
+            {
+                "error": f"Unknown fields: {', '.join(sorted(unknown))}",
+                "available": sorted(EXTRA_FIELDS),
+            }
+        ), 400
+
+    deadline = Deadline(current_app.config["CONGRESS_API_DEADLINE"])
+    extras = fields & EXTRA_FIELDS
+    # One cached entry per member; without extras the default view is served
+    member_data = cached_upstream(MEMBER, bioguide_id, deadline, full=bool(extras))
 
     if member_data is None:
         return jsonify({"error": "Member not found"}), 404
 
-    return jsonify(member_data)
+    if not extras:
+        return member_data.response()
+    return jsonify(MemberDetail.from_api(member_data.json()).to_json(extras))
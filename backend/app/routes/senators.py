@@ -1,42 +1,23 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, abort, request
 
-from ..models import Senator
+from ..roster import get_roster, json_response
 
 bp = Blueprint("senators", __name__, url_prefix="/api/senators")
 
 
 @bp.route("/", methods=["GET"])
 def get_all_senators():
-    senators = Senator.query.order_by(Senator.last_name).all()
-    # Can modify s.to_dict() to return only specific fields if needed
-    return jsonify(
-        [
-            {
-                "bioguide_id": s.bioguide_id,
-                "name": s.full_name,
-                "state": s.state,
-                "party": s.party,
-                "photo_url": s.photo_url,
-                "seat_number": s.seat_number,
-            }
-            for s in senators
-        ]
+    # Served from the in-process roster; ?state=VT and ?party=Democrat filter it
+    senators = get_roster().senators
+    return json_response(
+        senators.list_body(request.args.get("state"), request.args.get("party"))
     )
 
 
 # Limited usecase - default to member api
 @bp.route("/<string:bioguide_id>", methods=["GET"])
 def get_senator(bioguide_id):
-    senator = Senator.query.get_or_404(bioguide_id)
-    return jsonify(
-        {
-            "bioguide_id": senator.bioguide_id,
-            "name": senator.full_name,
-            "state": senator.state,
-            "party": senator.party,
-            "term_start": senator.term_start,
-            "term_end": senator.term_end,
-            "photo_url": senator.photo_url,
-            "seat_number": senator.seat_number,
-        }
-    )
+    body = get_roster().senators.detail_body(bioguide_id)
+    if body is None:
+        abort(404)
+    return json_response(body)
@@ -0,0 +1,104 @@
+import queue
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+
+from .. import db
+from ..events import (
+    EVENT_BROKER,
+    ROSTER_TOPIC,
+    bill_key,
+    bill_topic,
+    events_after,
+    format_sse,
+    history_starts_after,
+    parse_bill_key,
+    watch_bills,
+)
+
+bp = Blueprint("stream", __name__, url_prefix="/api/stream")
+
+
+@bp.route("/updates", methods=["GET"])
+def stream_updates():
+    """
+    Server-sent events: roster version bumps plus new actions for the bills in
+    ?bills=119/hr/1,119/s/5. Reconnecting clients send Last-Event-ID (or
+    ?lastEventId=) and are sent the events they missed.
+    """
+    config = current_app.config
+    bills = []
+    for key in filter(None, request.args.get("bills", "").split(",")):
+        parsed = parse_bill_key(key)
+        if parsed is None:
+            return jsonify(
+                {"error": f"Invalid bill '{key}', expected e.g. 119/hr/1"}
+            ), 400
+        bills.append(bill_key(*parsed))
+    if len(bills) > config["STREAM_MAX_BILLS"]:
+        return jsonify(
+            {"error": f"At most {config['STREAM_MAX_BILLS']} bills per stream"}
+        ), 400
+
+    last_id = request.headers.get("Last-Event-ID", request.args.get("lastEventId"))
+    if last_id is not None:
+        if not last_id.isdigit():
+            return jsonify({"error": "Last-Event-ID must be an event ID"}), 400
+        last_id = int(last_id)
+
+    topics = {ROSTER_TOPIC} | {bill_topic(key) for key in bills}
+    broker = current_app.extensions[EVENT_BROKER]
+    engine = db.engine
+    watch_bills(engine, bills)
+
+    # Subscribe before reading the backlog so nothing committed in between is
+    # lost; events delivered twice are skipped by ID below
+    subscription = broker.subscribe(topics)
+    backlog, resync = [], False
+    if last_id is not None:
+        with engine.connect() as conn:
+            pruned_through = history_starts_after(conn)
+            # With no events left (e.g. all pruned), the client may have
+            # missed some, so it resyncs too
+            resync = pruned_through is None or last_id < pruned_through
+            after = last_id
+            while page := events_after(conn, after, topics):
+                backlog.extend(page)
+                after = page[-1]["id"]
+
+    retry_ms = int(config["STREAM_RETRY_SECONDS"] * 1000)
+    heartbeat = config["STREAM_HEARTBEAT_SECONDS"]
+    ends_at = time.monotonic() + config["STREAM_MAX_SECONDS"]
+
+    def generate():
+        yield f"retry: {retry_ms}\n\n"
+        if resync:
+            # Older events were pruned: the client should refetch what it shows
+            yield format_sse("resync", {"reason": "history pruned"})
+
+        sent = last_id or 0
+        for event in backlog:
+            yield format_sse(event["kind"], event["data"], event["id"])
+            sent = event["id"]
+
+        # Connections end after STREAM_MAX_SECONDS (or when the client falls too
+        # far behind) and the browser resumes from its Last-Event-ID
+        while not subscription.overflowed:
+            remaining = ends_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = subscription.events.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            if event["id"] > sent:
+                yield format_sse(event["kind"], event["data"], event["id"])
+                sent = event["id"]
+
+    response = current_app.response_class(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(lambda: broker.unsubscribe(subscription))
+    return response
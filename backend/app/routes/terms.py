@@ -0,0 +1,38 @@
+from datetime import date
+
+from flask import Blueprint, jsonify, request
+
+from .. import db
+from ..terms import terms_on
+
+bp = Blueprint("terms", __name__, url_prefix="/api/terms")
+
+
+@bp.route("/", methods=["GET"], strict_slashes=False)
+def get_terms():
+    """
+    Who served on ?date=YYYY-MM-DD, optionally narrowed by ?state=NY,
+    &district=10 and ?type=sen or rep.
+    """
+    try:
+        day = date.fromisoformat(request.args.get("date", ""))
+    except ValueError:
+        return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+
+    state = request.args.get("state")
+    district = request.args.get("district", type=int)
+    if "district" in request.args and (district is None or state is None):
+        return jsonify({"error": "district must be a number, with state"}), 400
+    term_type = request.args.get("type")
+    if term_type not in (None, "sen", "rep"):
+        return jsonify({"error": "type must be sen or rep"}), 400
+
+    return jsonify(
+        terms_on(
+            db.session,
+            day,
+            state=state.upper() if state else None,
+            district=district,
+            term_type=term_type,
+        )
+    )
@@ -0,0 +1,272 @@
+"""
+In-process scheduler for periodic sync jobs
+
+Every worker runs a Scheduler thread, but a job only runs where its lease in
+the scheduled_jobs table was claimed. Claiming is one conditional UPDATE, so
+exactly one worker (on any host sharing the database) wins each run. The
+row also holds the next due time, which is spread by jitter and pushed out
+with exponential backoff after failures. A worker that dies mid-run stops
+blocking the job once its lease expires. Listeners registered with
+add_listener receive a JobRun per run (app.metrics turns them into
+Prometheus samples).
+"""
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from flask import Flask
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import db
+from .models import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER = "scheduler"
+
+SUCCESS, FAILURE = "success", "failure"
+
+
+@dataclass(frozen=True)
+class Job:
+    """A periodic job. `func` is called with the app (not inside a context)."""
+
+    name: str
+    func: Callable[[Flask], object]
+    interval: float  # seconds between successful runs
+    timeout: float  # lease length; another worker may take over after this
+    jitter: float = 0.1  # +/- fraction of each delay, so workers and hosts spread out
+    retry_after: float = 60.0  # first delay after a failure, doubled per failure
+    max_backoff: float = 3600.0
+
+
+@dataclass(frozen=True)
+class JobRun:
+    """Outcome of one job run."""
+
+    job: str
+    outcome: str  # SUCCESS or FAILURE
+    seconds: float
+    finished_at: float
+
+
+_listeners: list[Callable[[JobRun], None]] = []
+_listeners_lock = threading.Lock()
+
+
+def add_listener(listener: Callable[[JobRun], None]):
+    """Call `listener` with every JobRun in this process."""
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[JobRun], None]):
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def _jittered(delay: float, jitter: float) -> float:
+    return delay * (1 + random.uniform(-jitter, jitter))
+
+
+def next_delay(job: Job, failures: int) -> float:
+    """Seconds until `job` is due again after a run with `failures` in a row."""
+    if failures == 0:
+        return _jittered(job.interval, job.jitter)
+    backoff = min(job.max_backoff, job.retry_after * 2 ** (failures - 1))
+    return _jittered(backoff, job.jitter)
+
+
+class Scheduler:
+    """Runs due jobs whose lease this process claims."""
+
+    def __init__(self, app: Flask, jobs: list[Job], tick_seconds: float = 5.0):
+        """
+        Initialize the scheduler. Nothing runs until start() or run_pending().
+
+        Args:
+            app: Application whose database holds the leases.
+            jobs: Jobs to run.
+            tick_seconds: How often due times are checked.
+        """
+        self.app = app
+        self.jobs = {job.name: job for job in jobs}
+        self.tick_seconds = tick_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}"
+        # Locally known due times, so idle ticks do not touch the database
+        self._due_at: dict[str, float] = {}
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def _engine(self) -> sa.Engine:
+        with self.app.app_context():
+            return db.engine
+
+    def start(self):
+        """
+        Start the scheduler thread in this process, once. Called per request:
+        threads do not survive fork, and a preloaded gunicorn master must
+        never run jobs itself.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self.holder = f"{socket.gethostname()}:{self._pid}"
+            self._due_at.clear()
+            self._thread = threading.Thread(
+                target=self.run_forever, name="scheduler", daemon=True
+            )
+            self._thread.start()
+            logger.info(
+                f"Started scheduler in pid {self._pid} ({', '.join(self.jobs)})"
+            )
+
+    def run_forever(self):
+        while True:
+            try:
+                self.run_pending()
+            except sa.exc.SQLAlchemyError as e:
+                logger.warning(f"Scheduler could not reach the database: {e}")
+            time.sleep(self.tick_seconds)
+
+    def run_pending(self, names=None) -> list[JobRun]:
+        """
+        Run every job (or every job in `names`) that is due and not leased.
+
+        Returns:
+            The runs made by this process.
+        """
+        runs = []
+        for name, job in self.jobs.items():
+            if names is not None and name not in names:
+                continue
+            if time.time() < self._due_at.get(name, 0):
+                continue
+            if self._claim(job):
+                runs.append(self._run(job))
+        return runs
+
+    def _claim(self, job: Job) -> bool:
+        table = ScheduledJob.__table__
+        now = time.time()
+        engine = self._engine()
+        with engine.connect() as conn:
+            row = conn.execute(
+                sa.select(
+                    table.c.next_run_at, table.c.holder, table.c.lease_expires_at
+                ).where(table.c.name == job.name)
+            ).first()
+        if row is not None:
+            if row.next_run_at > now:
+                self._due_at[job.name] = row.next_run_at
+                return False
+            if row.holder is not None and row.lease_expires_at > now:
+                return False
+
+        # Checked again inside one UPDATE, so only one claimant can match
+        with engine.begin() as conn:
+            if row is None:
+                conn.execute(
+                    sqlite_insert(table)
+                    .values(name=job.name, next_run_at=now, failures=0)
+                    .on_conflict_do_nothing()
+                )
+            claimed = conn.execute(
+                table.update()
+                .where(
+                    table.c.name == job.name,
+                    table.c.next_run_at <= now,
+                    sa.or_(table.c.holder.is_(None), table.c.lease_expires_at <= now),
+                )
+                .values(
+                    holder=self.holder,
+                    lease_expires_at=now + job.timeout,
+                    last_started_at=now,
+                )
+            )
+        return claimed.rowcount == 1
+
+    def _run(self, job: Job) -> JobRun:
+        logger.info(f"Running job {job.name} in {self.holder}")
+        started = time.perf_counter()
+        outcome = SUCCESS
+        try:
+            job.func(self.app)
+        except Exception:
+            outcome = FAILURE
+            logger.exception(f"Job {job.name} failed")
+        run = JobRun(job.name, outcome, time.perf_counter() - started, time.time())
+        self._finish(job, run)
+
+        with _listeners_lock:
+            listeners = list(_listeners)
+        for listener in listeners:
+            try:
+                listener(run)
+            except Exception as e:
+                logger.error(f"Job listener failed: {e}")
+        return run
+
+    def _finish(self, job: Job, run: JobRun):
+        table = ScheduledJob.__table__
+        with self._engine().begin() as conn:
+            failures = conn.execute(
+                sa.select(table.c.failures).where(table.c.name == job.name)
+            ).scalar_one()
+            failures = 0 if run.outcome == SUCCESS else failures + 1
+            next_run_at = run.finished_at + next_delay(job, failures)
+            released = conn.execute(
+                table.update()
+                .where(table.c.name == job.name, table.c.holder == self.holder)
+                .values(
+                    holder=None,
+                    lease_expires_at=None,
+                    next_run_at=next_run_at,
+                    last_finished_at=run.finished_at,
+                    last_outcome=run.outcome,
+                    failures=failures,
+                )
+            )
+        if released.rowcount == 0:
+            logger.warning(
+                f"Job {job.name} outlived its {job.timeout:.0f}s lease; "
+                "another worker may have run it too"
+            )
+        self._due_at[job.name] = next_run_at
+        logger.info(
+            f"Job {job.name} finished ({run.outcome}) in {run.seconds:.1f}s; "
+            f"next run in {next_run_at - run.finished_at:.0f}s"
+        )
+
+    def status(self) -> list[dict]:
+        """Every job's row, for /health/scheduler."""
+        table = ScheduledJob.__table__
+        with self._engine().connect() as conn:
+            rows = conn.execute(sa.select(table).order_by(table.c.name)).mappings()
+            return [dict(row) for row in rows]
+
+
+def init_scheduler(app: Flask, jobs: list[Job]):
+    """
+    Attach a Scheduler to `app` that starts with the worker's first request.
+
+    Args:
+        app: Flask application being created.
+        jobs: Jobs to run.
+    """
+    scheduler = Scheduler(app, jobs, tick_seconds=app.config["SCHEDULER_TICK_SECONDS"])
+    app.extensions[SCHEDULER] = scheduler
+    app.before_request(scheduler.start)
@@ -0,0 +1,93 @@
+"""
+Who served when
+
+Ingest loads every term into terms and buckets each one by the Congresses it
+overlaps in term_congresses (see data_ingestion/parse_member_data.py). A
+lookup for a date reads only the bucket of that date's Congress, through an
+index on (congress, state, district), and compares start and end dates on
+those few hundred terms. Without the buckets, `start <= date AND end >= date`
+could use an index on only one of the two bounds and would scan the terms on
+one side of the date.
+"""
+
+from datetime import date
+
+import sqlalchemy as sa
+
+from .models import Term, TermCongress
+
+terms = Term.__table__
+term_congresses = TermCongress.__table__
+
+
+def get_congress_from_date(d: date, range_type: str | None = None) -> int:
+    """
+    The Congress that `d` falls in; from congress-legislators'
+    scripts/utils.py, which the app cannot import.
+
+    Congresses change over at noon on January 3 (March 4 through 1933), so
+    that day belongs to two Congresses. range_type='start' picks the one
+    beginning and 'end' the one ending.
+
+    Raises:
+        ValueError: If `d` is a transition day and range_type is not given.
+    """
+    if d.year % 2 == 0:
+        # Even years lie entirely within one Congress
+        year = d.year
+    else:
+        transition = date(d.year, 3, 4) if d.year < 1935 else date(d.year, 1, 3)
+        if d < transition:
+            year = d.year - 1
+        elif d > transition:
+            year = d.year
+        elif range_type == "end":
+            year = d.year - 1
+        elif range_type == "start":
+            year = d.year
+        else:
+            raise ValueError(
+                f"Date {d} is ambiguous; must pass range_type='start' or 'end'."
+            )
+    return (year + 1) // 2 - 894
+
+
+def congresses_of(start: date, end: date) -> range:
+    """The Congresses a term from `start` to `end` overlaps."""
+    return range(
+        get_congress_from_date(start, "start"), get_congress_from_date(end, "end") + 1
+    )
+
+
+def terms_on(
+    session,
+    day: date,
+    state: str | None = None,
+    district: int | None = None,
+    term_type: str | None = None,
+) -> list[dict]:
+    """
+    Terms in effect on `day`, optionally for one state, district or chamber.
+    On a transition day both the outgoing and the incoming terms are returned.
+    """
+    bucket = sa.select(term_congresses.c.term_id).where(
+        term_congresses.c.congress.in_(
+            {
+                get_congress_from_date(day, "end"),
+                get_congress_from_date(day, "start"),
+            }
+        )
+    )
+    if state is not None:
+        bucket = bucket.where(term_congresses.c.state == state)
+    if district is not None:
+        bucket = bucket.where(term_congresses.c.district == district)
+
+    query = (
+        sa.select(terms)
+        .where(terms.c.id.in_(bucket), terms.c.start <= day, terms.c.end >= day)
+        .order_by(terms.c.state, terms.c.type.desc(), terms.c.district, terms.c.start)
+    )
+    if term_type is not None:
+        query = query.where(terms.c.type == term_type)
+    return [dict(row) for row in session.execute(query).mappings()]
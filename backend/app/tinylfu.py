@@ -0,0 +1,247 @@
+"""
+Byte-bounded W-TinyLFU cache
+
+New keys enter a small LRU window (1% of the bytes). A key pushed out of the
+window is only admitted to the main segmented LRU if a count-min sketch says
+it has been requested more often, recently, than the entries it would
+evict. A crawler walking every bioguide ID therefore churns the window but
+cannot displace members that are read all the time, which is what happens to
+a plain LRU. The sketch halves its counters every `10 * width` requests, so
+frequency reflects recent popularity rather than all-time totals.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+WINDOW_FRACTION = 0.01
+PROTECTED_FRACTION = 0.8
+
+SKETCH_DEPTH = 4  # rows, each indexed by 16 bits of the key's 64-bit hash
+MAX_WIDTH = 1 << 16
+MAX_COUNT = 15  # 4-bit counters, as in the TinyLFU paper
+
+
+class FrequencySketch:
+    """Count-min sketch of key frequencies with periodic aging."""
+
+    def __init__(self, width: int):
+        """
+        Initialize the sketch.
+
+        Args:
+            width: Counters per row, rounded up to a power of two (at most
+                65536). Roughly the number of distinct keys whose frequencies
+                should be told apart.
+        """
+        self.width = min(1 << max(width - 1, 1).bit_length(), MAX_WIDTH)
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width) for _ in range(SKETCH_DEPTH)]
+        self._sample_size = 10 * self.width
+        self._additions = 0
+
+    def _indexes(self, key):
+        # str hashes are SipHash, so the four 16-bit slices are independent
+        h, mask = hash(key), self._mask
+        return [h & mask, (h >> 16) & mask, (h >> 32) & mask, (h >> 48) & mask]
+
+    def frequency(self, key) -> int:
+        """Estimated recent requests for `key` (never an underestimate)."""
+        return min(
+            row[i] for row, i in zip(self._rows, self._indexes(key), strict=True)
+        )
+
+    def increment(self, key):
+        """Count one request for `key`."""
+        indexes = self._indexes(key)
+        # Conservative update: only the smallest counters can be too low
+        count = min(row[i] for row, i in zip(self._rows, indexes, strict=True))
+        if count < MAX_COUNT:
+            for row, i in zip(self._rows, indexes, strict=True):
+                if row[i] == count:
+                    row[i] = count + 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def _age(self):
+        self._rows = [bytearray(c >> 1 for c in row) for row in self._rows]
+        self._additions //= 2
+
+
+@dataclass
+class CacheStats:
+    """Counters of one cache since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # admitted entries later pushed out of the main region
+    rejections: int = 0  # window entries refused admission by the sketch
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+
+class _Segment(OrderedDict):
+    """LRU-ordered key -> (value, size) map that tracks its total size."""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes = 0
+
+    def add(self, key, entry):
+        self[key] = entry
+        self.bytes += entry[1]
+
+    def remove(self, key):
+        entry = self.pop(key)
+        self.bytes -= entry[1]
+        return entry
+
+    def pop_lru(self):
+        key, entry = self.popitem(last=False)
+        self.bytes -= entry[1]
+        return key, entry
+
+
+class WTinyLFU:
+    """Thread-safe cache bounded by the total size of its values."""
+
+    def __init__(self, max_bytes: int, sketch_width: int | None = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the summed sizes passed to put().
+            sketch_width: Counters per sketch row. Defaults to one per KiB of
+                max_bytes, i.e. several per entry for payloads of a few KiB.
+        """
+        self.max_bytes = max_bytes
+        self.window_max = max(int(max_bytes * WINDOW_FRACTION), 1)
+        self.main_max = max_bytes - self.window_max
+        self.protected_max = int(self.main_max * PROTECTED_FRACTION)
+        self.sketch = FrequencySketch(sketch_width or max(max_bytes // 1024, 64))
+
+        self._window = _Segment()
+        self._probation = _Segment()
+        self._protected = _Segment()
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _segments(self):
+        return self._window, self._probation, self._protected
+
+    def __len__(self) -> int:
+        return sum(len(segment) for segment in self._segments())
+
+    def __contains__(self, key) -> bool:
+        return any(key in segment for segment in self._segments())
+
+    def get(self, key):
+        """The cached value for `key`, or None. Counts towards its frequency."""
+        with self._lock:
+            self.sketch.increment(key)
+            if key in self._probation:
+                entry = self._probation.remove(key)
+                self._protected.add(key, entry)
+                self._shrink_protected()
+            else:
+                for segment in (self._window, self._protected):
+                    if key in segment:
+                        segment.move_to_end(key)
+                        entry = segment[key]
+                        break
+                else:
+                    self._stats.misses += 1
+                    return None
+            self._stats.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        """
+        Cache `value` under `key`. A key that is already cached keeps its place.
+
+        Args:
+            key: Hashable key.
+            value: Value to cache.
+            size: Bytes charged against max_bytes for this entry.
+        """
+        with self._lock:
+            for segment in self._segments():
+                if key in segment:
+                    segment.remove(key)
+                    if size <= self.main_max:
+                        segment.add(key, (value, size))
+                    self._shrink_main()
+                    self._shrink_protected()
+                    break
+            else:
+                if size > self.main_max:
+                    self._stats.rejections += 1
+                    return
+                self._window.add(key, (value, size))
+
+            while self._window.bytes > self.window_max:
+                self._admit(*self._window.pop_lru())
+
+    def discard(self, key):
+        """Drop `key` if it is cached."""
+        with self._lock:
+            for segment in self._segments():
+                if key in segment:
+                    segment.remove(key)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                **{
+                    **asdict(self._stats),
+                    "entries": len(self),
+                    "bytes": sum(segment.bytes for segment in self._segments()),
+                }
+            )
+
+    def _main_bytes(self) -> int:
+        return self._probation.bytes + self._protected.bytes
+
+    def _shrink_protected(self):
+        # Overflow from the protected segment gets another chance on probation
+        while self._protected.bytes > self.protected_max:
+            self._probation.add(*self._protected.pop_lru())
+
+    def _shrink_main(self):
+        # Only needed when an entry grows in place
+        while self._main_bytes() > self.main_max:
+            segment = self._probation or self._protected
+            segment.pop_lru()
+            self._stats.evictions += 1
+
+    def _admit(self, candidate, entry):
+        """Move a window evictee into probation if it beats the entries it displaces."""
+        size = entry[1]
+        free = self.main_max - self._main_bytes()
+        victims = []
+        # Least recently used first: probation, then protected
+        for segment in (self._probation, self._protected):
+            for victim, (_, victim_size) in segment.items():
+                if free >= size:
+                    break
+                victims.append((segment, victim))
+                free += victim_size
+
+        # Ties go to the incumbents, so a one-off key never displaces anything
+        frequency = self.sketch.frequency(candidate)
+        if any(frequency <= self.sketch.frequency(v) for _, v in victims):
+            self._stats.rejections += 1
+            return
+        for segment, victim in victims:
+            segment.remove(victim)
+            self._stats.evictions += 1
+        self._probation.add(candidate, entry)
@@ -0,0 +1,549 @@
+"""
+Shared cache of Congress.gov member and bill-action payloads, refreshed by heat
+
+Routes read payloads from the upstream_cache table and only call Congress.gov
+when an entry is missing or older than its resource's TTL. Every cache read
+also counts towards the key's heat. Workers batch those counts into hourly
+access_counts rows, and the counts are decayed with a half-life when they are
+read. The `refresh` job (see data_ingestion/scheduler.py) spends a fixed
+upstream budget per run. It refreshes the entries with the highest
+heat * age / TTL first, so a key is refreshed roughly in proportion to how
+often it is read. Keys colder than REFRESH_MIN_HEAT are never refreshed and
+simply expire.
+
+Each worker also keeps the payloads it serves in a byte-bounded W-TinyLFU
+cache per resource (see app/tinylfu.py), so hot members are answered without
+touching SQLite and a crawl of every bioguide ID cannot evict them. A local
+entry is checked against the table every LOCAL_CACHE_RECHECK_SECONDS so that
+payloads refreshed by another worker are picked up. The table holds the whole
+member payload; a resource's `view` (the default member projection) is what
+the local tier holds and get() serves, unless a ?fields= request asks for
+the whole payload.
+
+Both tiers hold zstd frames compressed with a dictionary trained per kind
+(see app/compression.py), so sizes are charged at ~1/10 of the JSON. get()
+returns a CachedBody, which is only decompressed (and parsed) when the
+response cannot pass the frame through. The `dictionaries` job trains the
+dictionaries once enough bodies are cached and retrains them weekly.
+"""
+
+import contextvars
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import sqlalchemy as sa
+import zstandard
+from flask import Flask, Response, current_app
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from external_api.deadline import Deadline
+from external_api.fallback import note_stale, reset_staleness, staleness
+from external_api.rate_limiter import BACKGROUND, upstream_priority
+from external_api.services import get_bill_actions_service, get_member_details
+
+from . import db
+from .compression import MIN_SAMPLES, Codec
+from .events import parse_bill_key
+from .member_detail import EXTRA_FIELDS, MemberDetail
+from .models import AccessCount, UpstreamCacheEntry
+from .tinylfu import WTinyLFU
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_CACHE = "upstream_cache"
+
+MEMBER, BILL_ACTIONS = "member", "bill_actions"
+
+WINDOW_SECONDS = 3600
+
+# Entries younger than this fraction of their TTL are never refreshed, so the
+# hottest key cannot take the whole budget run after run
+MIN_AGE_FRACTION = 0.1
+
+
+@dataclass(frozen=True)
+class Resource:
+    """A kind of cached payload."""
+
+    kind: str
+    fetch: Callable[[str, Deadline | None], dict | None]
+    ttl: float  # seconds an entry is served before a request refetches it
+    max_bytes: int = 8 * 1024 * 1024  # per-worker local cache size
+    match: str | None = None  # URL pattern of the route serving it, for dcz
+    # The part of a stored payload that get() serves and local caches hold,
+    # unless the whole payload is asked for; None serves it whole
+    view: Callable[[dict], dict] | None = None
+
+
+class LocalEntry(NamedTuple):
+    frame: bytes
+    fetched_at: float
+    checked_at: float  # when the shared table was last read for this key
+
+
+class CachedBody:
+    """A cached JSON body, decompressed only when needed."""
+
+    __slots__ = ("frame", "fetched_at", "resource", "codec")
+
+    def __init__(
+        self, frame: bytes, fetched_at: float, resource: Resource, codec: Codec
+    ):
+        self.frame = frame
+        self.fetched_at = fetched_at  # identifies this version of the body
+        self.resource = resource
+        self.codec = codec
+
+    def body(self) -> bytes:
+        return self.codec.decompress(self.frame)
+
+    def json(self) -> dict:
+        return json.loads(self.body())
+
+    def response(self) -> Response:
+        """The body as a response to the current request (see Codec.response)."""
+        return self.codec.response(
+            self.frame, self.resource.kind, match=self.resource.match
+        )
+
+
+def _fetch_member(key: str, deadline: Deadline | None) -> dict | None:
+    # Parsed once here; the table holds every typed field, so ?fields=
+    # requests are answered from the same entry
+    member = MemberDetail.from_api(get_member_details(key, deadline=deadline))
+    return None if member is None else member.to_json(EXTRA_FIELDS)
+
+
+def _member_view(payload: dict) -> dict:
+    # The default projection, served without ?fields=
+    return MemberDetail.from_api(payload).to_json()
+
+
+def _fetch_bill_actions(key: str, deadline: Deadline | None) -> dict | None:
+    congress, bill_type, number = parse_bill_key(key)
+    return get_bill_actions_service(congress, bill_type, number, deadline=deadline)
+
+
+def decayed(count: float, age: float, half_life: float) -> float:
+    """`count` events seen `age` seconds ago, decayed by `half_life`."""
+    return count * 2 ** (-max(age, 0.0) / half_life)
+
+
+class UpstreamCache:
+    """Cache reads, per-worker access counting and the heat-ordered refresher."""
+
+    def __init__(
+        self,
+        app: Flask,
+        resources: list[Resource],
+        half_life: float = 6 * 3600,
+        flush_seconds: float = 30,
+        min_heat: float = 1.0,
+        recheck_seconds: float = 30,
+        codec: Codec | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            app: Application whose primary database holds the cache.
+            resources: Cached payload kinds.
+            half_life: Seconds for an access to lose half its weight.
+            flush_seconds: How often a worker writes its access counts.
+            min_heat: Decayed accesses below which a key is left to expire.
+            recheck_seconds: How long a local entry is served before the
+                shared table is read again.
+            codec: Compressor for stored bodies.
+        """
+        self.app = app
+        self.resources = {r.kind: r for r in resources}
+        self.half_life = half_life
+        self.flush_seconds = flush_seconds
+        self.min_heat = min_heat
+        self.recheck_seconds = recheck_seconds
+        self.local = {r.kind: WTinyLFU(r.max_bytes) for r in resources}
+        self.codec = codec or Codec(app)
+        self._counts: Counter = Counter()
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _engine(self) -> sa.Engine:
+        # The primary: replicas only reload when a dataset version is published
+        with self.app.app_context():
+            return db.engine
+
+    def get(
+        self, kind: str, key: str, deadline: Deadline | None = None, full: bool = False
+    ) -> CachedBody | None:
+        """
+        A body no older than its resource's TTL, fetched if needed.
+
+        Args:
+            full: Return the whole stored payload rather than the resource's
+                view of it. Read from the table, not the local cache.
+
+        Returns:
+            The body, or None if Congress.gov has none (or failed).
+        """
+        resource, local = self.resources[kind], self.local[kind]
+        now = time.time()
+        cached = None if full else local.get(key)
+        if (
+            cached is not None
+            and now - cached.checked_at < self.recheck_seconds
+            and now - cached.fetched_at < resource.ttl
+        ):
+            self.record_access(kind, key)
+            return CachedBody(cached.frame, cached.fetched_at, resource, self.codec)
+
+        table = UpstreamCacheEntry.__table__
+        with self._engine().connect() as conn:
+            row = conn.execute(
+                sa.select(table.c.body, table.c.fetched_at).where(
+                    table.c.kind == kind, table.c.key == key
+                )
+            ).first()
+
+        if row is not None and now - row.fetched_at < resource.ttl:
+            frame, fetched_at, payload = row.body, row.fetched_at, None
+        else:
+            payload, stale_age = self._fetch(resource, key, deadline)
+            if payload is None:
+                local.discard(key)
+                return None
+            if stale_age is not None:
+                # A last-known-good fallback: serve it (the request is already
+                # flagged stale) but never cache it as a fresh fetch
+                if not full and resource.view is not None:
+                    payload = resource.view(payload)
+                frame = self._encode(kind, payload)
+                return CachedBody(frame, now - stale_age, resource, self.codec)
+            frame, fetched_at = self._store(kind, key, payload)
+
+        self.record_access(kind, key)
+        if full:
+            return CachedBody(frame, fetched_at, resource, self.codec)
+        if resource.view is not None:
+            # Built once per worker and entry version, then held locally
+            if payload is None:
+                payload = json.loads(self.codec.decompress(frame))
+            frame = self._encode(kind, resource.view(payload))
+        local.put(key, LocalEntry(frame, fetched_at, now), len(key) + len(frame))
+        return CachedBody(frame, fetched_at, resource, self.codec)
+
+    @staticmethod
+    def _fetch(
+        resource: Resource, key: str, deadline: Deadline | None
+    ) -> tuple[dict | None, float | None]:
+        """
+        Fetch `key`, noting whether the payload was a stale fallback.
+
+        Returns:
+            The payload and, if it came from the last-known-good cache, its age.
+        """
+
+        def fetch():
+            # A fresh staleness record, so earlier stale calls in the same
+            # request don't mark this payload stale
+            reset_staleness()
+            return resource.fetch(key, deadline), staleness()
+
+        payload, stale_age = contextvars.copy_context().run(fetch)
+        if stale_age is not None:
+            note_stale(stale_age)  # still flag the request's response
+        return payload, stale_age
+
+    def _encode(self, kind: str, payload: dict) -> bytes:
+        return self.codec.compress(kind, self.app.json.dumps(payload).encode())
+
+    def _store(self, kind: str, key: str, payload: dict) -> tuple[bytes, float]:
+        table = UpstreamCacheEntry.__table__
+        frame = self._encode(kind, payload)
+        fetched_at = time.time()
+        statement = sqlite_insert(table).values(
+            kind=kind, key=key, body=frame, fetched_at=fetched_at
+        )
+        try:
+            with self._engine().begin() as conn:
+                conn.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[table.c.kind, table.c.key],
+                        set_={
+                            "body": statement.excluded.body,
+                            "fetched_at": statement.excluded.fetched_at,
+                        },
+                    )
+                )
+        except sa.exc.SQLAlchemyError as e:
+            # begin() has rolled back; the payload is still served, and this
+            # worker's local cache holds it until the next recheck
+            logger.warning(f"Could not cache {kind} {key}: {e}")
+        return frame, fetched_at
+
+    def stats(self) -> dict[str, dict]:
+        """This worker's local cache counters per resource, for /health/cache."""
+        return {kind: local.stats().to_dict() for kind, local in self.local.items()}
+
+    def record_access(self, kind: str, key: str):
+        """Count one read of a key; counts are written every `flush_seconds`."""
+        with self._lock:
+            self._counts[kind, key] += 1
+            due = time.monotonic() - self._flushed_at >= self.flush_seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Add this worker's pending access counts to the current window."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        if not counts:
+            return
+
+        table = AccessCount.__table__
+        window = int(time.time() // WINDOW_SECONDS)
+        statement = sqlite_insert(table).values(
+            [
+                {"kind": kind, "key": key, "window": window, "count": count}
+                for (kind, key), count in counts.items()
+            ]
+        )
+        try:
+            with self._engine().begin() as conn:
+                conn.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[table.c.kind, table.c.key, table.c.window],
+                        set_={"count": table.c.count + statement.excluded.count},
+                    )
+                )
+        except sa.exc.SQLAlchemyError as e:
+            # begin() has rolled back; keep the counts for the next flush
+            logger.warning(f"Could not record {len(counts)} access counts: {e}")
+            with self._lock:
+                self._counts.update(counts)
+
+    def heat(self, conn, now: float) -> dict[tuple[str, str], float]:
+        """Decayed access count of every key read within the horizon."""
+        table = AccessCount.__table__
+        heat: Counter = Counter()
+        for kind, key, window, count in conn.execute(
+            sa.select(table.c.kind, table.c.key, table.c.window, table.c.count)
+        ):
+            window_end = (window + 1) * WINDOW_SECONDS
+            heat[kind, key] += decayed(count, now - window_end, self.half_life)
+        return heat
+
+    def refresh(self, budget: int) -> int:
+        """
+        Refetch up to `budget` entries, hottest and stalest first; drop expired
+        entries and access counts too old to matter.
+
+        Returns:
+            Number of entries refreshed.
+        """
+        self.flush()
+        now = time.time()
+        entries = UpstreamCacheEntry.__table__
+        with self._engine().connect() as conn:
+            heat = self.heat(conn, now)
+            rows = conn.execute(
+                sa.select(entries.c.kind, entries.c.key, entries.c.fetched_at)
+            ).all()
+
+        # Expected stale reads avoided by refreshing the entry now
+        candidates = []
+        for kind, key, fetched_at in rows:
+            resource = self.resources.get(kind)
+            age, key_heat = now - fetched_at, heat.get((kind, key), 0.0)
+            if resource is None or key_heat < self.min_heat:
+                continue
+            if age < resource.ttl * MIN_AGE_FRACTION:
+                continue
+            candidates.append((-key_heat * age / resource.ttl, kind, key))
+        heapq.heapify(candidates)
+
+        refreshed = 0
+        with upstream_priority(BACKGROUND):
+            while candidates and refreshed < budget:
+                _, kind, key = heapq.heappop(candidates)
+                payload, stale_age = self._fetch(self.resources[kind], key, None)
+                refreshed += 1
+                # A stale fallback is no newer than what is cached
+                if payload is not None and stale_age is None:
+                    self._store(kind, key, payload)
+
+        self._prune(now)
+        logger.info(
+            f"Refreshed {refreshed} of {len(candidates) + refreshed} warm cache "
+            f"entries ({len(rows)} cached, budget {budget})"
+        )
+        return refreshed
+
+    def _prune(self, now: float):
+        entries, counts = UpstreamCacheEntry.__table__, AccessCount.__table__
+        # Past ~8 half-lives a window adds under 1/256 of its count
+        oldest_window = int((now - 8 * self.half_life) // WINDOW_SECONDS)
+        with self._engine().begin() as conn:
+            for kind, resource in self.resources.items():
+                conn.execute(
+                    sa.delete(entries).where(
+                        entries.c.kind == kind,
+                        entries.c.fetched_at < now - resource.ttl,
+                    )
+                )
+            # Kinds no longer cached (e.g. the old member_full)
+            conn.execute(
+                sa.delete(entries).where(entries.c.kind.not_in(self.resources))
+            )
+            conn.execute(sa.delete(counts).where(counts.c.window < oldest_window))
+
+    def train_dictionaries(
+        self, size: int, retrain_seconds: float, samples: int = 2000
+    ) -> int:
+        """
+        Train a dictionary for every kind without a recent one, then recompress
+        that kind's entries with it.
+
+        Args:
+            size: Dictionary size in bytes.
+            retrain_seconds: Age after which a dictionary is replaced.
+            samples: Bodies sampled per kind.
+
+        Returns:
+            Number of dictionaries trained.
+        """
+        table = UpstreamCacheEntry.__table__
+        trained = 0
+        for kind in self.resources:
+            current = self.codec.current(kind)
+            if (
+                current is not None
+                and time.time() - current.trained_at < retrain_seconds
+            ):
+                continue
+            with self._engine().connect() as conn:
+                rows = conn.execute(
+                    sa.select(table.c.key, table.c.body, table.c.fetched_at).where(
+                        table.c.kind == kind
+                    )
+                ).all()
+            if len(rows) < MIN_SAMPLES:
+                continue
+
+            bodies = {row.key: self.codec.decompress(row.body) for row in rows}
+            sample = random.sample(list(bodies.values()), min(samples, len(bodies)))
+            try:
+                self.codec.train(kind, sample, size)
+            except zstandard.ZstdError as e:
+                logger.warning(f"Could not train a {kind} dictionary: {e}")
+                continue
+            trained += 1
+
+            # Unless a request stored a newer body in the meantime
+            frames = {
+                row.key: self.codec.compress(kind, bodies[row.key]) for row in rows
+            }
+            with self._engine().begin() as conn:
+                for row in rows:
+                    conn.execute(
+                        table.update()
+                        .where(
+                            table.c.kind == kind,
+                            table.c.key == row.key,
+                            table.c.fetched_at == row.fetched_at,
+                        )
+                        .values(body=frames[row.key])
+                    )
+            self.codec.prune(kind)
+
+            # Other workers pick the new frames up when they recheck
+            local, now = self.local[kind], time.time()
+            view = self.resources[kind].view
+            for row in rows:
+                if row.key in local:
+                    frame = frames[row.key]
+                    if view is not None:
+                        frame = self._encode(kind, view(json.loads(bodies[row.key])))
+                    entry = LocalEntry(frame, row.fetched_at, now)
+                    local.put(row.key, entry, len(row.key) + len(frame))
+        return trained
+
+
+def cached_upstream(
+    kind: str, key: str, deadline: Deadline | None = None, full: bool = False
+) -> CachedBody | None:
+    """Read `key` through the current application's upstream cache."""
+    return current_app.extensions[UPSTREAM_CACHE].get(kind, key, deadline, full)
+
+
+def refresh_upstream_cache(app: Flask) -> int:
+    """The `refresh` job: spend this run's share of the hourly refresh budget."""
+    config = app.config
+    budget = int(config["REFRESH_BUDGET_PER_HOUR"] * config["REFRESH_INTERVAL"] / 3600)
+    return app.extensions[UPSTREAM_CACHE].refresh(max(budget, 1))
+
+
+def train_cache_dictionaries(app: Flask) -> int:
+    """The `dictionaries` job."""
+    config = app.config
+    return app.extensions[UPSTREAM_CACHE].train_dictionaries(
+        config["CACHE_DICTIONARY_BYTES"], config["CACHE_DICTIONARY_MAX_AGE"]
+    )
+
+
+def dictionary_view(sha256: str):
+    """Serve a dictionary for clients to decode dcz responses with."""
+    cache = current_app.extensions[UPSTREAM_CACHE]
+    dictionary = cache.codec.by_hash(sha256)
+    # Only dictionaries of a kind served by a route, scoped to that route
+    resource = None if dictionary is None else cache.resources.get(dictionary.kind)
+    if resource is None or resource.match is None:
+        return {"error": "Unknown dictionary"}, 404
+    response = current_app.response_class(
+        dictionary.data, mimetype="application/octet-stream"
+    )
+    response.headers["Use-As-Dictionary"] = f'match="{resource.match}"'
+    # Content-addressed, so it never changes
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+def init_upstream_cache(app: Flask):
+    """Attach an UpstreamCache for member and bill-action payloads to `app`."""
+    config = app.config
+    app.extensions[UPSTREAM_CACHE] = UpstreamCache(
+        app,
+        [
+            Resource(
+                MEMBER,
+                _fetch_member,
+                ttl=config["MEMBER_CACHE_TTL"],
+                max_bytes=config["MEMBER_CACHE_BYTES"],
+                match="/api/members/*",
+                view=_member_view,
+            ),
+            Resource(
+                BILL_ACTIONS,
+                _fetch_bill_actions,
+                ttl=config["BILL_ACTIONS_CACHE_TTL"],
+                max_bytes=config["BILL_ACTIONS_CACHE_BYTES"],
+                match="/api/congress/bills/*",
+            ),
+        ],
+        half_life=config["ACCESS_HALF_LIFE"],
+        flush_seconds=config["ACCESS_FLUSH_SECONDS"],
+        min_heat=config["REFRESH_MIN_HEAT"],
+        recheck_seconds=config["LOCAL_CACHE_RECHECK_SECONDS"],
+        codec=Codec(app, level=config["CACHE_COMPRESSION_LEVEL"]),
+    )
+    app.add_url_rule(
+        "/api/dictionaries/<sha256>", "compression_dictionary", dictionary_view
+    )
@@ -5,9 +5,13 @@ from datetime import datetime
 import yaml
 
 from app import create_app, db
+from app.changes import record_changes, roster_snapshot
+from app.invalidation import publish_dataset
 from app.models import Representative, Senator
+from external_api.rate_limiter import BACKGROUND, upstream_priority
 from external_api.services import get_member_image_urls
 
+from .parse_member_data import fetch_historical, load_member_data, member_data_rows
 from .web_scrapers import ProfileImageScraper, SenateDeskScraper
 
 DATA_FILE = os.path.join(os.path.dirname(__file__), "congress/legislators-current.yaml")
@@ -71,22 +75,29 @@ def save_photo_cache():
         print(f"Error saving photo cache: {e}")
 
 
-def ingest():
-    app = create_app()
+def ingest(app=None):
+    # The scheduler passes the worker's app; run standalone, we create one
+    app = app or create_app()
     with app.app_context():
-        print("Clearing existing data...")
-        Senator.query.delete()
-        Representative.query.delete()
-        db.session.commit()
-
+        # Parse and fetch everything before the transaction starts, so the
+        # write lock is not held across file parsing, scrapes and API calls
         print("Loading YAML...")
         legislators = load_yaml()
+        fetch_historical()
+        member_data = member_data_rows()
 
         senator_seats = get_senate_seat_maps()
         print("Number of senator seats loaded: ", len(senator_seats))
 
-        # Get dict of profile links
-        profile_dict = get_member_image_urls()
+        # Get dict of profile links (background sync yields quota to web requests)
+        with upstream_priority(BACKGROUND):
+            profile_dict = get_member_image_urls()
+
+        # Clear and reload in one transaction so readers never see an empty roster
+        before = roster_snapshot(db.session)
+        print("Clearing existing data...")
+        Senator.query.delete()
+        Representative.query.delete()
 
         for leg in legislators:
             full_name = leg["name"]["official_full"]
@@ -130,6 +141,14 @@ def ingest():
                 )
                 db.session.add(rep)
 
+        # Committees, offices and social accounts, published with the roster
+        load_member_data(db.session, member_data)
+
+        # Committed together with the data; workers reload their caches lazily
+        version = publish_dataset(db.session, source="ingest")
+        record_changes(
+            db.session, version, before, app.config["CHANGES_RETENTION_VERSIONS"]
+        )
         db.session.commit()
 
         # Save photo cache after ingestion
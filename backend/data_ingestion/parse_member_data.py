@@ -0,0 +1,284 @@
+"""
+Committees, committee memberships, district offices, social accounts and terms
+
+Loaded from the unitedstates/congress-legislators files next to
+legislators-current.yaml. Terms cover every term of every legislator in
+legislators-current.yaml and legislators-historical.yaml; the historical file
+is not in the checkout, so fetch_historical() downloads it from the project's
+published data. parse_legislators.ingest() reloads these tables in the same
+transaction as the roster, so they are published under the same dataset
+version. Run on its own to reload just these tables:
+
+    python -m data_ingestion.parse_member_data
+"""
+
+import logging
+import os
+import time
+from datetime import date
+
+import requests
+import yaml
+
+from app import create_app, db
+from app.invalidation import publish_dataset
+from app.models import (
+    Committee,
+    CommitteeMembership,
+    DistrictOffice,
+    SocialAccount,
+    Term,
+    TermCongress,
+)
+from app.terms import congresses_of
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "congress")
+COMMITTEES_FILE = os.path.join(DATA_DIR, "committees-current.yaml")
+MEMBERSHIP_FILE = os.path.join(DATA_DIR, "committee-membership-current.yaml")
+OFFICES_FILE = os.path.join(DATA_DIR, "legislators-district-offices.yaml")
+SOCIAL_FILE = os.path.join(DATA_DIR, "legislators-social-media.yaml")
+HISTORICAL_FILE = os.path.join(DATA_DIR, "legislators-historical.yaml")
+HISTORICAL_URL = (
+    "https://unitedstates.github.io/congress-legislators/legislators-historical.yaml"
+)
+# Legislators only move into the historical file when they leave office
+HISTORICAL_MAX_AGE = 7 * 24 * 3600
+LEGISLATOR_FILES = (os.path.join(DATA_DIR, "legislators-current.yaml"), HISTORICAL_FILE)
+
+OFFICE_FIELDS = (
+    "address",
+    "suite",
+    "building",
+    "city",
+    "state",
+    "zip",
+    "phone",
+    "fax",
+    "hours",
+    "latitude",
+    "longitude",
+)
+
+
+def _load(path):
+    # libyaml's loader, when PyYAML was built with it, parses ~10x faster
+    with open(path) as f:
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def committee_rows(committees: list[dict]) -> list[dict]:
+    """Rows for committees and their subcommittees."""
+    rows = []
+    for committee in committees:
+        parent = committee["thomas_id"]
+        rows.append(
+            {
+                "thomas_id": parent,
+                "parent_id": None,
+                "name": committee["name"],
+                "chamber": committee["type"],
+                "url": committee.get("url"),
+            }
+        )
+        for sub in committee.get("subcommittees") or []:
+            rows.append(
+                {
+                    "thomas_id": parent + sub["thomas_id"],
+                    "parent_id": parent,
+                    "name": sub["name"],
+                    "chamber": committee["type"],
+                    "url": None,
+                }
+            )
+    return rows
+
+
+def membership_rows(membership: dict[str, list[dict]]) -> list[dict]:
+    """Rows for every member of every committee and subcommittee."""
+    rows = {}
+    for committee_id, members in membership.items():
+        for member in members or []:
+            if "bioguide" not in member:
+                continue
+            # Keyed by the primary key, in case the file lists someone twice
+            rows[committee_id, member["bioguide"]] = {
+                "committee_id": committee_id,
+                "bioguide_id": member["bioguide"],
+                "name": member.get("name"),
+                "party": member.get("party"),
+                "rank": member.get("rank"),
+                "title": member.get("title"),
+            }
+    return list(rows.values())
+
+
+def office_rows(legislators: list[dict]) -> list[dict]:
+    rows = []
+    for legislator in legislators:
+        bioguide = legislator["id"].get("bioguide")
+        if bioguide is None:
+            continue
+        for office in legislator.get("offices") or []:
+            row = {"id": office["id"], "bioguide_id": bioguide}
+            for field in OFFICE_FIELDS:
+                value = office.get(field)
+                # zip codes and suites are sometimes parsed as numbers
+                if value is not None and field not in ("latitude", "longitude"):
+                    value = str(value)
+                row[field] = value
+            rows.append(row)
+    return rows
+
+
+def social_rows(legislators: list[dict]) -> list[dict]:
+    """One row per platform; e.g. `twitter` and `twitter_id` become one row."""
+    rows = []
+    for legislator in legislators:
+        bioguide = legislator["id"].get("bioguide")
+        if bioguide is None:
+            continue
+        social = legislator.get("social") or {}
+        platforms = {key.removesuffix("_id") for key in social}
+        for platform in sorted(platforms):
+            account_id = social.get(f"{platform}_id")
+            rows.append(
+                {
+                    "bioguide_id": bioguide,
+                    "platform": platform,
+                    "handle": social.get(platform),
+                    "account_id": None if account_id is None else str(account_id),
+                }
+            )
+    return rows
+
+
+def term_rows(legislators: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    Rows for terms and for term_congresses, the Congress buckets indexing
+    them (see app/terms.py).
+    """
+    terms, buckets = [], []
+    for legislator in legislators:
+        name = legislator["name"]
+        full_name = name.get("official_full") or f"{name['first']} {name['last']}"
+        for term in legislator["terms"]:
+            term_id = len(terms) + 1
+            start = date.fromisoformat(term["start"])
+            end = date.fromisoformat(term["end"])
+            district = term.get("district")
+            terms.append(
+                {
+                    "id": term_id,
+                    "bioguide_id": legislator["id"]["bioguide"],
+                    "name": full_name,
+                    "type": term["type"],
+                    "state": term["state"],
+                    "district": district,
+                    "senate_class": term.get("class"),
+                    "party": term.get("party"),
+                    "start": start,
+                    "end": end,
+                }
+            )
+            for congress in congresses_of(start, end):
+                buckets.append(
+                    {
+                        "congress": congress,
+                        "term_id": term_id,
+                        "state": term["state"],
+                        "district": district,
+                    }
+                )
+    return terms, buckets
+
+
+def fetch_historical(max_age: float = HISTORICAL_MAX_AGE) -> bool:
+    """
+    Download legislators-historical.yaml unless the local copy is younger
+    than `max_age` seconds.
+
+    Returns:
+        Whether a copy, fresh or not, is available.
+    """
+    try:
+        if time.time() - os.path.getmtime(HISTORICAL_FILE) < max_age:
+            return True
+    except FileNotFoundError:
+        pass
+
+    try:
+        response = requests.get(HISTORICAL_URL, timeout=60)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logger.warning(f"Could not download {HISTORICAL_URL}: {e}")
+        return os.path.exists(HISTORICAL_FILE)
+
+    # Written aside and renamed, so a failed write never leaves half a file
+    partial = HISTORICAL_FILE + ".part"
+    with open(partial, "wb") as f:
+        f.write(response.content)
+    os.replace(partial, HISTORICAL_FILE)
+    logger.info(f"Downloaded {len(response.content)} bytes of historical legislators")
+    return True
+
+
+def _load_legislators() -> list[dict]:
+    legislators = []
+    for path in LEGISLATOR_FILES:
+        if os.path.exists(path):
+            legislators.extend(_load(path))
+        else:
+            logger.warning(
+                f"{os.path.basename(path)} not found; /api/terms will not cover "
+                "its legislators"
+            )
+    return legislators
+
+
+def member_data_rows() -> dict:
+    """Parse every file into rows per model; no database access."""
+    terms, buckets = term_rows(_load_legislators())
+    return {
+        Committee: committee_rows(_load(COMMITTEES_FILE)),
+        CommitteeMembership: membership_rows(_load(MEMBERSHIP_FILE)),
+        DistrictOffice: office_rows(_load(OFFICES_FILE)),
+        SocialAccount: social_rows(_load(SOCIAL_FILE)),
+        Term: terms,
+        TermCongress: buckets,
+    }
+
+
+def load_member_data(session, rows: dict | None = None) -> dict[str, int]:
+    """
+    Replace the tables' contents inside `session`'s transaction; the caller
+    publishes and commits. Pass `rows` from member_data_rows() to parse the
+    files before the transaction starts.
+
+    Returns:
+        Rows loaded per table.
+    """
+    loaded = {}
+    for model, model_rows in (rows or member_data_rows()).items():
+        table = model.__table__
+        session.execute(table.delete())
+        if model_rows:
+            session.execute(table.insert(), model_rows)
+        loaded[table.name] = len(model_rows)
+    logger.info("Loaded " + ", ".join(f"{n} {name}" for name, n in loaded.items()))
+    return loaded
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    fetch_historical()
+    app = create_app()
+    with app.app_context():
+        load_member_data(db.session)
+        publish_dataset(db.session, source="member_data")
+        db.session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Periodic sync jobs and a sidecar entry point for the scheduler
+
+The web workers run these jobs in-process when SCHEDULER_ENABLED is set (see
+app/scheduler.py). Run the scheduler as its own process instead with:
+
+    python -m data_ingestion.scheduler           # run jobs as they fall due
+    python -m data_ingestion.scheduler --once roster   # run 'roster' now if due
+"""
+
+import argparse
+import logging
+import time
+
+from app.scheduler import Job, Scheduler
+from app.upstream_cache import refresh_upstream_cache, train_cache_dictionaries
+from external_api.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+BILL_SYNC_LEASE = 600
+
+
+def sync_roster(app):
+    # Legislators, senate seats and member photos; imported here because the
+    # scrapers pull in selenium
+    from .parse_legislators import ingest
+
+    ingest(app)
+
+
+def sync_bill_actions(app):
+    from .sync_bills import sync_bills
+
+    # Stop fetching with time to commit before the lease lets another worker in
+    sync_bills(app, deadline=Deadline(BILL_SYNC_LEASE * 0.8))
+
+
+def jobs(config) -> list[Job]:
+    """The sync jobs, with intervals from the app config."""
+    return [
+        Job(
+            "roster",
+            sync_roster,
+            interval=config["ROSTER_SYNC_INTERVAL"],
+            timeout=3600,
+        ),
+        Job(
+            "bills",
+            sync_bill_actions,
+            interval=config["BILL_SYNC_INTERVAL"],
+            timeout=BILL_SYNC_LEASE,
+            retry_after=30,
+            max_backoff=1800,
+        ),
+        Job(
+            "refresh",
+            refresh_upstream_cache,
+            interval=config["REFRESH_INTERVAL"],
+            timeout=600,
+            retry_after=30,
+            max_backoff=1800,
+        ),
+        # Only trains when a kind has enough cached bodies and no recent dictionary
+        Job("dictionaries", train_cache_dictionaries, interval=3600, timeout=600),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*", help="Only these jobs (default: all)")
+    parser.add_argument(
+        "--once", action="store_true", help="Run due jobs once, then exit"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    from app import create_app
+
+    app = create_app()
+    scheduler = Scheduler(
+        app, jobs(app.config), tick_seconds=app.config["SCHEDULER_TICK_SECONDS"]
+    )
+    names = set(args.names) or None
+    while True:
+        scheduler.run_pending(names)
+        if args.once:
+            break
+        time.sleep(scheduler.tick_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Background bill sync: turns new Congress.gov floor actions into stream events
+
+Each run fetches the current Congress's bill list once and compares every
+bill's latest action with the one seen last run. Bills that stream clients
+subscribed to (watched_bills) have their full action list fetched when they
+change, so every new action is pushed rather than only the latest. Events
+go to update_events, which /api/stream/updates serves.
+
+Watched bills missing from the listing can't be compared, so they are fetched
+in turns: at most BILL_SYNC_MAX_FETCHES action lists per run, changed bills
+first, then the least recently checked. A run also stops fetching when its
+deadline (set from the scheduler lease) passes; the rest wait for the next.
+
+    python -m data_ingestion.sync_bills --interval 120
+"""
+
+import argparse
+import hashlib
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app import create_app, db
+from app.events import bill_key, bill_topic, parse_bill_key, prune_events, publish_event
+from app.models import BillSyncState, WatchedBill
+from external_api.deadline import Deadline
+from external_api.rate_limiter import BACKGROUND, upstream_priority
+from external_api.services import (
+    get_bill_actions_service,
+    get_bills_for_current_congress,
+)
+
+logger = logging.getLogger(__name__)
+
+# Watched bills nobody has subscribed to for this long are no longer fetched
+WATCH_TTL = timedelta(days=7)
+
+
+def action_fingerprint(action: dict) -> str:
+    """Stable identity of one action (Congress.gov actions have no ID)."""
+    key = "|".join(
+        str(action.get(name) or "") for name in ("actionDate", "actionCode", "text")
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def new_actions(actions: list[dict], seen: str) -> list[dict]:
+    """
+    Actions listed before the last-seen one, oldest first.
+
+    Args:
+        actions: A bill's actions, most recent first (Congress.gov order).
+        seen: Fingerprint of the latest action seen last run.
+    """
+    fresh = []
+    for action in actions:
+        if action_fingerprint(action) == seen:
+            break
+        fresh.append(action)
+    else:
+        # Last-seen action not found (e.g. amended upstream); report the latest
+        fresh = actions[:1]
+    return list(reversed(fresh))
+
+
+def _watched(session) -> set[str]:
+    table = WatchedBill.__table__
+    since = datetime.now(UTC) - WATCH_TTL
+    return set(
+        session.execute(
+            sa.select(table.c.bill).where(table.c.subscribed_at >= since)
+        ).scalars()
+    )
+
+
+def _seen(session) -> dict[str, tuple[str, datetime]]:
+    table = BillSyncState.__table__
+    return {
+        bill: (latest_action, checked_at)
+        for bill, latest_action, checked_at in session.execute(
+            sa.select(table.c.bill, table.c.latest_action, table.c.checked_at)
+        )
+    }
+
+
+def _due(
+    watched: set[str], latest: dict[str, dict], seen: dict[str, tuple[str, datetime]]
+) -> list[str]:
+    """
+    Watched bills whose action lists need fetching, in the order they get
+    them: those the listing shows changed, then those missing from it, least
+    recently checked (or never) first.
+    """
+    changed = sorted(
+        key
+        for key in watched & latest.keys()
+        if action_fingerprint(latest[key]) != seen.get(key, ("",))[0]
+    )
+    unlisted = sorted(
+        watched - latest.keys(),
+        key=lambda key: (key in seen, seen[key][1] if key in seen else None, key),
+    )
+    return changed + unlisted
+
+
+def sync_bills(app, deadline: Deadline | None = None) -> int:
+    """
+    Run one sync and commit its events.
+
+    Args:
+        app: Application whose database receives the events.
+        deadline: When to stop fetching action lists; bills not reached are
+            fetched by a later run.
+
+    Returns:
+        Number of bill_action events published.
+
+    Raises:
+        RuntimeError: If the bill list could not be fetched.
+    """
+    with app.app_context(), upstream_priority(BACKGROUND):
+        session = db.session
+        watched = _watched(session)
+        seen = _seen(session)
+
+        latest: dict[str, dict] = {}
+        listing = get_bills_for_current_congress(deadline=deadline)
+        if listing is None:
+            # Fail the run so the scheduler backs off instead of recording success
+            raise RuntimeError("Could not fetch the current Congress's bills")
+        for bill in listing.get("bills", []):
+            if bill.get("latestAction"):
+                key = bill_key(bill["congress"], bill["type"], bill["number"])
+                latest[key] = bill["latestAction"]
+
+        due = _due(watched, latest, seen)
+        fetched: dict[str, list[dict]] = {}
+        for key in due[: app.config["BILL_SYNC_MAX_FETCHES"]]:
+            if deadline is not None and deadline.expired:
+                break
+            congress, bill_type, number = parse_bill_key(key)
+            data = get_bill_actions_service(
+                congress, bill_type, number, deadline=deadline
+            )
+            # A failed fetch still uses the bill's turn
+            fetched[key] = (data or {}).get("actions") or []
+        # Not reached this run: left unrecorded so they stay at the front
+        skipped = set(due) - fetched.keys()
+
+        published = 0
+        state = {}
+        for key in sorted((watched | latest.keys()) - skipped):
+            # An empty fingerprint means the bill was checked but has no baseline
+            baseline = seen.get(key, ("",))[0]
+            actions = fetched.get(key)
+            if actions is None:
+                action = latest[key]
+            elif actions:
+                action = actions[0]
+            else:
+                state[key] = baseline
+                continue
+
+            fingerprint = action_fingerprint(action)
+            state[key] = fingerprint
+            if baseline in ("", fingerprint):
+                # First sighting only records a baseline
+                continue
+            for fresh in new_actions(actions, baseline) if actions else [action]:
+                publish_event(
+                    session,
+                    "bill_action",
+                    bill_topic(key),
+                    {"bill": key, "action": fresh},
+                )
+                published += 1
+
+        if state:
+            now = datetime.now(UTC)
+            table = BillSyncState.__table__
+            statement = sqlite_insert(table).values(
+                [
+                    {"bill": k, "latest_action": v, "checked_at": now}
+                    for k, v in state.items()
+                ]
+            )
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[table.c.bill],
+                    set_={
+                        "latest_action": statement.excluded.latest_action,
+                        "checked_at": statement.excluded.checked_at,
+                    },
+                )
+            )
+        pruned = prune_events(
+            session, timedelta(hours=app.config["STREAM_EVENT_RETENTION_HOURS"])
+        )
+        session.commit()
+
+    logger.info(
+        f"Bill sync checked {len(state)} bills, fetched {len(fetched)} action "
+        f"lists ({len(skipped)} left for later), published {published} actions, "
+        f"pruned {pruned} old events"
+    )
+    return published
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--interval", type=float, default=0, help="Seconds between runs (0: run once)"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    app = create_app()
+    while True:
+        try:
+            sync_bills(app)
+        except Exception as e:
+            logger.error(f"Bill sync failed: {e}")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
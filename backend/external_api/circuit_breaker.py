@@ -0,0 +1,201 @@
+"""
+Circuit breaker for the Congress.gov upstream
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker.
+
+    Every upstream call records its outcome and latency. When the window holds
+    at least `min_calls` outcomes and either the failure rate or the slow-call
+    rate crosses its threshold, the circuit opens and calls fail fast for
+    `open_seconds`. After that it goes half-open and lets a trickle of probe
+    calls through: `close_after` consecutive successes close it again, any
+    failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str = "congress_api",
+        window_seconds: float = 60.0,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        close_after: int = 3,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Label used in logs and metrics.
+            window_seconds: Length of the rolling window of recorded outcomes.
+            min_calls: Minimum outcomes in the window before the breaker can trip.
+            failure_rate_threshold: Failure fraction that opens the circuit.
+            slow_call_seconds: Calls slower than this count as slow.
+            slow_rate_threshold: Slow-call fraction that opens the circuit.
+            open_seconds: How long the circuit stays open before probing.
+            half_open_max_calls: Concurrent probe calls allowed while half-open.
+            close_after: Consecutive probe successes needed to close the circuit.
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.close_after = close_after
+
+        self._lock = threading.Lock()
+        self._outcomes: deque[tuple[float, bool, bool]] = deque()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        # Counters exposed through snapshot()
+        self.rejected_calls = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        """Return the state, moving open -> half-open once the cooldown passes."""
+        if self._state == self.OPEN and now - self._opened_at >= self.open_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str):
+        logger.warning(f"Circuit '{self.name}' {self._state} -> {state}")
+        self._state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == self.OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+
+    def before_call(self):
+        """
+        Reserve permission for one upstream call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                probe slots taken.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and (
+                self._probes_in_flight < self.half_open_max_calls
+            ):
+                self._probes_in_flight += 1
+                return
+
+            self.rejected_calls += 1
+            raise CircuitOpenError(f"Circuit '{self.name}' is {state}")
+
+    def cancel(self):
+        """Release a call permitted by before_call() that never reached the upstream."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record(self, success: bool, latency: float):
+        """
+        Record the outcome of a call permitted by before_call().
+
+        Args:
+            success: Whether the upstream answered without a server-side error.
+            latency: Wall time of the call in seconds.
+        """
+        now = time.monotonic()
+        slow = latency >= self.slow_call_seconds
+
+        with self._lock:
+            state = self._current_state(now)
+
+            if state == self.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._transition(self.OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.close_after:
+                    self._transition(self.CLOSED)
+                return
+
+            if state == self.OPEN:
+                # Call started before the circuit opened; nothing to decide
+                return
+
+            self._outcomes.append((now, success, slow))
+            self._trim(now)
+
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+
+            failures = sum(1 for _, ok, _ in self._outcomes if not ok)
+            slow_calls = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+            if (
+                failures / calls >= self.failure_rate_threshold
+                or slow_calls / calls >= self.slow_rate_threshold
+            ):
+                self._transition(self.OPEN)
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def snapshot(self) -> dict:
+        """Return the breaker state and window statistics for metrics."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._current_state(now)
+            self._trim(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, ok, _ in self._outcomes if not ok)
+            slow_calls = sum(1 for _, _, is_slow in self._outcomes if is_slow)
+            return {
+                "name": self.name,
+                "state": state,
+                "window_calls": calls,
+                "window_failure_rate": failures / calls if calls else 0.0,
+                "window_slow_rate": slow_calls / calls if calls else 0.0,
+                "rejected_calls": self.rejected_calls,
+                "times_opened": self.times_opened,
+                "open_remaining_seconds": (
+                    max(0.0, self.open_seconds - (now - self._opened_at))
+                    if state == self.OPEN
+                    else 0.0
+                ),
+            }
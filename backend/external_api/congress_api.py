@@ -5,23 +5,67 @@ Congress.gov API client
 import json
 import logging
 import os
+import random
+import threading
+import time
+from collections.abc import Iterator
+from email.utils import parsedate_to_datetime
 
 import requests
 
+from .circuit_breaker import CircuitBreaker
+from .deadline import Deadline, DeadlineExceeded
+from .fallback import LastGoodCache, note_stale
+from .http_pool import PooledHTTPAdapter, PoolStats
+from .pagination import MAX_PAGE_SIZE, paginate
+from .rate_limiter import RateLimiter, RateLimitExceeded
+from .replay import adapter_from_env
+from .telemetry import UpstreamCall, endpoint_template, record
+
 logger = logging.getLogger(__name__)
 
 
 class CongressAPI:
     """Client for interacting with the Congress.gov API."""
 
-    BASE_URL = "https://api.congress.gov/v3"
-
-    def __init__(self, api_key: str | None = None):
+    # Point at a local stand-in (external_api.stub_server) for offline benchmarks
+    BASE_URL = os.getenv("CONGRESS_API_BASE_URL", "https://api.congress.gov/v3")
+
+    # Per-attempt timeouts (seconds) and retry policy for every outbound call
+    CONNECT_TIMEOUT = float(os.getenv("CONGRESS_API_CONNECT_TIMEOUT", "3.05"))
+    READ_TIMEOUT = float(os.getenv("CONGRESS_API_READ_TIMEOUT", "10"))
+    MAX_RETRIES = int(os.getenv("CONGRESS_API_MAX_RETRIES", "2"))
+    BACKOFF_BASE = 0.5
+    BACKOFF_MAX = 8.0
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    # Oldest last-known-good payload we are willing to serve when degraded
+    STALE_MAX_AGE = float(os.getenv("CONGRESS_API_STALE_MAX_AGE", "86400"))
+
+    # Pages a list call fetches in parallel; each needs its own connection
+    PAGE_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        max_retries: int | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
+        pool_size: int = 4,
+    ):
         """
         Initialize the Congress API client.
 
         Args:
             api_key: Congress.gov API key. If not provided, will look for CONGRESS_API_KEY env var.
+            connect_timeout: Seconds to wait for a TCP/TLS connection. Defaults to CONNECT_TIMEOUT.
+            read_timeout: Seconds to wait between bytes of a response. Defaults to READ_TIMEOUT.
+            max_retries: Retries after the first attempt on 429/5xx or network errors.
+            breaker: Circuit breaker guarding the upstream. A default one is created if omitted.
+            rate_limiter: Limiter shared by everything using the key. Defaults to RateLimiter.from_env().
+            pool_size: Keep-alive connections to api.congress.gov; match the caller's concurrency.
         """
         self.api_key = api_key or os.getenv("CONGRESS_API_KEY")
         if not self.api_key:
@@ -29,57 +73,385 @@ class CongressAPI:
                 "Congress.gov API key is required. Set CONGRESS_API_KEY environment variable."
             )
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {"X-API-Key": self.api_key, "Content-Type": "application/json"}
+        self.connect_timeout = (
+            connect_timeout if connect_timeout is not None else self.CONNECT_TIMEOUT
+        )
+        self.read_timeout = (
+            read_timeout if read_timeout is not None else self.READ_TIMEOUT
         )
+        self.max_retries = max_retries if max_retries is not None else self.MAX_RETRIES
+        self.breaker = breaker or CircuitBreaker()
+        self.last_good = LastGoodCache()
+        self.rate_limiter = rate_limiter or RateLimiter.from_env()
+
+        # One pool shared by every thread; sessions (cookies, headers) are per thread
+        self.pool_size = pool_size
+        self.pool_stats = PoolStats()
+        self.adapter = PooledHTTPAdapter(pool_size, stats=self.pool_stats)
+        self.transport = adapter_from_env(self.adapter)
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session, mounted on the shared connection pool."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(
+                {"X-API-Key": self.api_key, "Content-Type": "application/json"}
+            )
+            session.mount("https://", self.transport)
+            session.mount("http://", self.transport)
+            self._local.session = session
+        return session
+
+    def close(self):
+        """Close every pooled connection. The client must not be used afterwards."""
+        self.transport.close()
 
-    def get_current_members(self, chamber: str | None = None) -> list[dict]:
+    def worst_case_latency(self) -> float:
         """
-        Fetch all current congressional members.
+        Upper bound in seconds for a single `_get` call made without a deadline:
+        every attempt times out and every backoff sleeps for the maximum.
+        """
+        attempts = self.max_retries + 1
+        return attempts * (self.connect_timeout + self.read_timeout) + (
+            self.max_retries * self.BACKOFF_MAX
+        )
+
+    def _timeout_for(self, deadline: Deadline | None) -> tuple[float, float]:
+        """Build a (connect, read) timeout tuple clipped to the remaining deadline."""
+        if deadline is None:
+            return (self.connect_timeout, self.read_timeout)
+
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before request ({deadline})")
+        return (min(self.connect_timeout, remaining), min(self.read_timeout, remaining))
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) retry attempt."""
+        return random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2**attempt))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float | None:
+        """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def _observe_rate_limit(self, response: requests.Response):
+        """Feed the upstream's remaining-quota header back into the shared limiter."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if self.rate_limiter is None or remaining is None:
+            return
+        try:
+            self.rate_limiter.observe_remaining(int(remaining))
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _is_upstream_failure(error: requests.RequestException) -> bool:
+        """Whether an error reflects upstream health (5xx, 429, network) vs. a real answer."""
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            status = error.response.status_code
+            return status >= 500 or status == 429
+        return True
+
+    def _get(
+        self,
+        path: str,
+        params: dict | None = None,
+        deadline: Deadline | None = None,
+        endpoint: str | None = None,
+    ) -> requests.Response:
+        """
+        GET a Congress.gov resource through the circuit breaker and record the
+        call's latency, status, size, retries and quota headers.
+
+        The breaker sees how long the last attempt took upstream; telemetry gets
+        the whole call, including rate-limiter waits and retry backoff.
 
         Args:
-            chamber: Optional chamber filter ('house' or 'senate'). If None, gets both.
+            endpoint: Path template used to label the call (e.g. '/member/{bioguideId}').
+                Derived from `path` if omitted.
+
+        Raises:
+            CircuitOpenError: If the breaker is rejecting calls.
+            requests.RequestException: See `_get_with_retries`.
+        """
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceeded(f"Deadline exceeded before request ({deadline})")
+
+        trace = {"retries": 0, "response": None}
+        started = time.monotonic()
+        try:
+            self.breaker.before_call()
+            try:
+                response = self._get_with_retries(
+                    path, params=params, deadline=deadline, trace=trace
+                )
+            except (RateLimitExceeded, DeadlineExceeded):
+                # Throttled locally or out of the caller's time budget; says
+                # nothing about upstream health
+                self.breaker.cancel()
+                raise
+            except requests.RequestException as e:
+                self.breaker.record(
+                    not self._is_upstream_failure(e), trace.get("attempt_seconds", 0.0)
+                )
+                raise
+            except BaseException:
+                # Anything else is a local failure; don't leak a half-open probe
+                self.breaker.cancel()
+                raise
+            self.breaker.record(True, trace["attempt_seconds"])
+            return response
+        except requests.RequestException as e:
+            trace["error"] = type(e).__name__
+            raise
+        finally:
+            self._record_call(
+                endpoint or endpoint_template(path), time.monotonic() - started, trace
+            )
+
+    @staticmethod
+    def _record_call(endpoint: str, seconds: float, trace: dict):
+        """Publish an UpstreamCall for a finished `_get`."""
+        response = trace["response"]
+        if response is not None:
+            status = str(response.status_code)
+            size = len(response.content or b"")
+            headers = response.headers
+        else:
+            status = trace.get("error", "Error")
+            size = 0
+            headers = {}
+
+        def header_int(name: str) -> int | None:
+            try:
+                return int(headers[name])
+            except (KeyError, ValueError):
+                return None
+
+        record(
+            UpstreamCall(
+                endpoint=endpoint,
+                status=status,
+                seconds=seconds,
+                bytes_received=size,
+                retries=trace["retries"],
+                ratelimit_limit=header_int("X-RateLimit-Limit"),
+                ratelimit_remaining=header_int("X-RateLimit-Remaining"),
+            )
+        )
+
+    def _get_json(
+        self,
+        path: str,
+        params: dict | None = None,
+        deadline: Deadline | None = None,
+        endpoint: str | None = None,
+    ) -> dict:
+        """
+        GET a Congress.gov resource and decode it, falling back to the last good
+        payload for the same request when the upstream is failing or the circuit
+        is open. Stale payloads are noted so the route can flag the response.
+
+        Raises:
+            requests.RequestException: If the call fails and no usable fallback exists.
+        """
+        key = self.last_good.key(path, params)
+        try:
+            data = self._get(
+                path, params=params, deadline=deadline, endpoint=endpoint
+            ).json()
+        except requests.RequestException as e:
+            if not self._is_upstream_failure(e):
+                raise
+            cached = self.last_good.get(key)
+            if cached is None or cached[1] > self.STALE_MAX_AGE:
+                raise
+            data, age = cached
+            note_stale(age)
+            logger.warning(f"Serving stale response for {path} ({age:.0f}s old): {e}")
+            return data
+
+        self.last_good.put(key, data)
+        return data
+
+    def _get_with_retries(
+        self,
+        path: str,
+        params: dict | None = None,
+        deadline: Deadline | None = None,
+        trace: dict | None = None,
+    ) -> requests.Response:
+        """
+        GET a Congress.gov resource with timeouts, deadline and bounded retries.
+
+        Retries on connection errors, timeouts and RETRY_STATUSES using jittered
+        exponential backoff, honoring Retry-After when the server sends one.
+        A retry is never started if its delay would run past the deadline.
+        Every attempt first takes a token from the shared rate limiter.
+
+        Args:
+            path: Path relative to BASE_URL (e.g. '/member/A000055').
+            params: Optional query parameters.
+            deadline: Optional overall deadline shared with the caller.
+            trace: Optional dict updated with the retry count, last response and
+                duration of the last attempt.
 
         Returns:
-            List of member dictionaries with bioguide IDs and image URLs.
+            Successful response.
+
+        Raises:
+            requests.RequestException: On a non-retryable error, exhausted retries,
+                or DeadlineExceeded.
         """
-        members = []
-        offset = 0
-        limit = 250  # Max allowed by API
+        url = f"{self.BASE_URL}{path}"
+        attempt = 0
+        trace = trace if trace is not None else {}
 
         while True:
-            params = {
-                "format": "json",
-                "limit": limit,
-                "offset": offset,
-                "currentMember": "true",
-            }
-
-            if chamber:
-                params["chamber"] = chamber
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(deadline=deadline)
 
+            timeout = self._timeout_for(deadline)
+            sent = time.monotonic()
             try:
-                response = self.session.get(f"{self.BASE_URL}/member", params=params)
-                response.raise_for_status()
+                response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                trace["response"] = None
+                if attempt >= self.max_retries:
+                    raise
+                reason = str(e)
+                delay = self._backoff(attempt)
+            else:
+                trace["response"] = response
+                self._observe_rate_limit(response)
+                if (
+                    response.status_code not in self.RETRY_STATUSES
+                    or attempt >= self.max_retries
+                ):
+                    response.raise_for_status()
+                    return response
+
+                reason = f"HTTP {response.status_code}"
+                retry_after = self._retry_after(response)
+                if retry_after is not None and retry_after > self.BACKOFF_MAX:
+                    # Waiting that long would break our latency bound; give up now
+                    response.raise_for_status()
+                delay = (
+                    retry_after if retry_after is not None else self._backoff(attempt)
+                )
+            finally:
+                # Time on the wire only: limiter waits and backoff sleeps are ours
+                trace["attempt_seconds"] = time.monotonic() - sent
+
+            if deadline is not None and delay >= deadline.remaining():
+                raise DeadlineExceeded(
+                    f"Not retrying {path} after {reason}: backoff of {delay:.2f}s "
+                    f"exceeds remaining deadline ({deadline})"
+                )
 
-                data = response.json()
-                batch_members = data.get("members", [])
+            attempt += 1
+            trace["retries"] = attempt
+            logger.warning(
+                f"Retrying {path} ({reason}), attempt {attempt}/{self.max_retries} "
+                f"in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+    def paginate(
+        self,
+        path: str,
+        item_key: str,
+        params: dict | None = None,
+        page_size: int = MAX_PAGE_SIZE,
+        concurrency: int = 1,
+        max_items: int | None = None,
+        deadline: Deadline | None = None,
+        endpoint: str | None = None,
+    ) -> Iterator[dict]:
+        """
+        Lazily iterate every item of a paginated Congress.gov list endpoint.
 
-                if not batch_members:
-                    break
+        Args:
+            path: List endpoint path (e.g. '/bill/119').
+            item_key: Key holding the items in each page (e.g. 'bills').
+            params: Extra query parameters; offset/limit are managed here.
+            page_size: Items per page (max 250).
+            concurrency: Pages fetched ahead in parallel; 1 just prefetches the next.
+            max_items: Optional cap on the number of items.
+            deadline: Optional overall deadline shared by all pages.
+            endpoint: Path template labelling the page calls (e.g. '/bill/{congress}').
+
+        Yields:
+            Items in API order.
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched.
+        """
+        base_params = {"format": "json", **(params or {})}
 
-                members.extend(batch_members)
+        def fetch_page(offset: int, limit: int) -> dict:
+            page_params = base_params | {"offset": offset, "limit": limit}
+            return self._get_json(
+                path, params=page_params, deadline=deadline, endpoint=endpoint
+            )
 
-                # Check if we've got all members
-                if len(batch_members) < limit:
-                    break
+        return paginate(
+            fetch_page,
+            item_key,
+            page_size=page_size,
+            # More page fetches than connections would only queue for the pool
+            concurrency=min(concurrency, self.pool_size),
+            max_items=max_items,
+        )
 
-                offset += limit
+    def get_current_members(
+        self, chamber: str | None = None, deadline: Deadline | None = None
+    ) -> list[dict]:
+        """
+        Fetch all current congressional members.
 
-            except requests.RequestException as e:
-                logger.error(f"Error fetching members: {e}")
-                break
+        Args:
+            chamber: Optional chamber filter ('house' or 'senate'). If None, gets both.
+            deadline: Optional overall deadline for all pages.
+
+        Returns:
+            List of member dictionaries with bioguide IDs and image URLs.
+        """
+        params = {"format": "json", "currentMember": "true"}
+        if chamber:
+            params["chamber"] = chamber
+
+        members = []
+        try:
+            # ~540 members: fetch the remaining pages in parallel once count is known
+            members.extend(
+                self.paginate(
+                    "/member",
+                    "members",
+                    params,
+                    concurrency=self.PAGE_CONCURRENCY,
+                    deadline=deadline,
+                )
+            )
+        except requests.RequestException as e:
+            logger.error(f"Error fetching members: {e}")
 
         logger.info(f"Fetched {len(members)} current members from Congress.gov API")
         return members
@@ -129,21 +501,25 @@ class CongressAPI:
 
         return bioguide_to_url
 
-    def get_member(self, bioguide_id: str) -> dict | None:
+    def get_member(
+        self, bioguide_id: str, deadline: Deadline | None = None
+    ) -> dict | None:
         """
         Get specific member information by bioguide ID.
 
         Args:
             bioguide_id: The bioguide ID of the member to fetch.
+            deadline: Optional overall deadline for the call.
 
         Returns:
             Full JSON response from API, or None if not found.
         """
         try:
-            response = self.session.get(f"{self.BASE_URL}/member/{bioguide_id}")
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._get_json(
+                f"/member/{bioguide_id}",
+                deadline=deadline,
+                endpoint="/member/{bioguideId}",
+            )
 
             if data.get("member"):
                 logger.info(f"Fetched member details for bioguide ID: {bioguide_id}")
@@ -156,18 +532,18 @@ class CongressAPI:
             logger.error(f"Error fetching member {bioguide_id}: {e}")
             return None
 
-    def get_current_congress(self) -> dict | None:
+    def get_current_congress(self, deadline: Deadline | None = None) -> dict | None:
         """
         Get information about the current Congress.
 
+        Args:
+            deadline: Optional overall deadline for the call.
+
         Returns:
             Full JSON response from API containing current congress information, or None if error.
         """
         try:
-            response = self.session.get(f"{self.BASE_URL}/congress/current")
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._get_json("/congress/current", deadline=deadline)
 
             if data.get("congress"):
                 logger.info(
@@ -183,7 +559,11 @@ class CongressAPI:
             return None
 
     def get_bills_for_congress(
-        self, congress_number: int, limit: int | None = None, offset: int | None = None
+        self,
+        congress_number: int,
+        limit: int | None = None,
+        offset: int | None = None,
+        deadline: Deadline | None = None,
     ) -> dict | None:
         """
         Get bills for a specific congress.
@@ -192,6 +572,7 @@ class CongressAPI:
             congress_number: The congress number to fetch bills for.
             limit: Optional maximum number of bills to return.
             offset: Optional offset for pagination.
+            deadline: Optional overall deadline for the call.
 
         Returns:
             Full JSON response from API containing bills for the congress, or None if error.
@@ -204,12 +585,12 @@ class CongressAPI:
             if offset is not None:
                 params["offset"] = offset
 
-            response = self.session.get(
-                f"{self.BASE_URL}/bill/{congress_number}", params=params
+            data = self._get_json(
+                f"/bill/{congress_number}",
+                params=params,
+                deadline=deadline,
+                endpoint="/bill/{congress}",
             )
-            response.raise_for_status()
-
-            data = response.json()
 
             if data.get("bills"):
                 logger.info(
@@ -224,8 +605,43 @@ class CongressAPI:
             logger.error(f"Error fetching bills for Congress {congress_number}: {e}")
             return None
 
+    def iter_bills_for_congress(
+        self,
+        congress_number: int,
+        concurrency: int = PAGE_CONCURRENCY,
+        max_items: int | None = None,
+        deadline: Deadline | None = None,
+    ) -> Iterator[dict]:
+        """
+        Stream every bill for a congress without holding them all in memory.
+
+        Args:
+            congress_number: The congress number to fetch bills for.
+            concurrency: Pages fetched in parallel ahead of the consumer.
+            max_items: Optional cap on the number of bills.
+            deadline: Optional overall deadline for all pages.
+
+        Yields:
+            Bill summary dictionaries.
+
+        Raises:
+            requests.RequestException: If a page cannot be fetched.
+        """
+        return self.paginate(
+            f"/bill/{congress_number}",
+            "bills",
+            concurrency=concurrency,
+            max_items=max_items,
+            deadline=deadline,
+            endpoint="/bill/{congress}",
+        )
+
     def get_bill_actions(
-        self, congress: int, bill_type: str, bill_number: int
+        self,
+        congress: int,
+        bill_type: str,
+        bill_number: int,
+        deadline: Deadline | None = None,
     ) -> dict | None:
         """
         Get actions for a specific bill.
@@ -234,6 +650,7 @@ class CongressAPI:
             congress: The congress number.
             bill_type: The type of bill (e.g., 'hr', 's', 'hjres', 'sjres').
             bill_number: The bill number.
+            deadline: Optional overall deadline for the call.
 
         Returns:
             Full JSON response from API containing bill actions, or None if error.
@@ -241,13 +658,12 @@ class CongressAPI:
         try:
             params = {"format": "json"}
 
-            response = self.session.get(
-                f"{self.BASE_URL}/bill/{congress}/{bill_type}/{bill_number}/actions",
+            data = self._get_json(
+                f"/bill/{congress}/{bill_type}/{bill_number}/actions",
                 params=params,
+                deadline=deadline,
+                endpoint="/bill/{congress}/{billType}/{billNumber}/actions",
             )
-            response.raise_for_status()
-
-            data = response.json()
 
             if data.get("actions"):
                 logger.info(
@@ -0,0 +1,40 @@
+"""
+Request deadline budgets for outbound Congress.gov calls
+"""
+
+import time
+
+import requests
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised when an outbound call would run past the caller's deadline."""
+
+
+class Deadline:
+    """
+    A fixed point in time that a request (and every upstream call it makes)
+    must finish by. Routes create one and pass it down so that several
+    upstream calls share a single latency budget.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Initialize the deadline.
+
+        Args:
+            seconds: Budget in seconds, measured from now.
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s of {self.seconds}s)"
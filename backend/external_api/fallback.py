@@ -0,0 +1,80 @@
+"""
+Last-known-good responses served when the Congress.gov upstream is unavailable
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+# Age in seconds of the oldest stale payload served in the current request.
+# Held in a mutable dict so helper threads running in a copied context (e.g.
+# parallel page fetches) report back to the request that started them.
+_stale: ContextVar[dict | None] = ContextVar("stale", default=None)
+
+
+def reset_staleness():
+    """Forget any stale payloads noted for the current request."""
+    _stale.set({"age": None})
+
+
+def note_stale(age: float):
+    """Record that a stale payload of the given age was served."""
+    state = _stale.get()
+    if state is None:
+        state = {"age": None}
+        _stale.set(state)
+    state["age"] = age if state["age"] is None else max(state["age"], age)
+
+
+def staleness() -> float | None:
+    """Age of the oldest stale payload served in this request, or None."""
+    state = _stale.get()
+    return state["age"] if state else None
+
+
+class LastGoodCache:
+    """
+    Bounded LRU store of the most recent successful JSON payload per upstream
+    request. Only consulted when a live call fails or the circuit is open.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of payloads kept before evicting the LRU one.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, params: dict | None) -> tuple:
+        return (path, tuple(sorted((params or {}).items())))
+
+    def put(self, key: tuple, data: dict):
+        with self._lock:
+            self._entries[key] = (time.time(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: tuple) -> tuple[dict, float] | None:
+        """
+        Look up a payload.
+
+        Returns:
+            (payload, age in seconds), or None if nothing was stored.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        stored_at, data = entry
+        return data, time.time() - stored_at
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,130 @@
+"""
+Instrumented keep-alive connection pooling for the Congress.gov client
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+
+class PoolStats:
+    """Per-process counters describing how the connection pool is used."""
+
+    # Checkouts that block at least this long count as having waited
+    WAIT_THRESHOLD = 0.001
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.exhausted = 0
+
+    def record_checkout(self, fresh: bool, waited: float):
+        with self._lock:
+            if fresh:
+                self.opened += 1
+            else:
+                self.reused += 1
+            if waited >= self.WAIT_THRESHOLD:
+                self.waited += 1
+                self.wait_seconds += waited
+
+    def record_exhausted(self):
+        with self._lock:
+            self.exhausted += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            checkouts = self.opened + self.reused
+            return {
+                "connections_opened": self.opened,
+                "connections_reused": self.reused,
+                "reuse_ratio": self.reused / checkouts if checkouts else 0.0,
+                "checkouts_waited": self.waited,
+                "wait_seconds": self.wait_seconds,
+                "pool_exhausted": self.exhausted,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Counts fresh vs. reused connections and time spent waiting for one."""
+
+    stats: PoolStats
+    checkout_timeout: float
+
+    def _get_conn(self, timeout=None):
+        started = time.monotonic()
+        try:
+            conn = super()._get_conn(
+                timeout=timeout if timeout is not None else self.checkout_timeout
+            )
+        except EmptyPoolError:
+            # Re-raised as is: urllib3 returns a slot to the pool for any other
+            # error here, which would grow it past its size
+            self.stats.record_exhausted()
+            raise
+        # A connection without a socket will open (and TLS handshake) a new one
+        fresh = getattr(conn, "sock", None) is None
+        self.stats.record_checkout(fresh, time.monotonic() - started)
+        return conn
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with a blocking, fixed-size keep-alive pool per host.
+
+    Blocking mode means a burst of concurrent calls waits (up to
+    `checkout_timeout`) for a pooled connection instead of opening throwaway
+    ones, so the number of TLS handshakes is bounded by `pool_size`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        stats: PoolStats | None = None,
+        checkout_timeout: float = 5.0,
+    ):
+        """
+        Initialize the adapter.
+
+        Args:
+            pool_size: Connections kept per host; match the caller's concurrency.
+            stats: Counters to update. A new PoolStats is created if omitted.
+            checkout_timeout: Seconds to wait for a free connection.
+        """
+        self.stats = stats or PoolStats()
+        self.checkout_timeout = checkout_timeout
+        super().__init__(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+
+    def init_poolmanager(self, connections, maxsize, block=True, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        # Bind the counters onto per-adapter pool subclasses
+        attrs = {"stats": self.stats, "checkout_timeout": self.checkout_timeout}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("HTTPPool", (_InstrumentedHTTPConnectionPool,), attrs),
+            "https": type("HTTPSPool", (_InstrumentedHTTPSConnectionPool,), attrs),
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:
+            raise requests.ConnectionError(
+                f"No free connection to {e.pool.host} within {self.checkout_timeout}s",
+                request=request,
+            ) from e
@@ -0,0 +1,127 @@
+"""
+Streaming paginator for Congress.gov list endpoints
+"""
+
+import contextvars
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Largest page size the Congress.gov API accepts
+MAX_PAGE_SIZE = 250
+
+
+def paginate(
+    fetch_page: Callable[[int, int], dict],
+    item_key: str,
+    page_size: int = MAX_PAGE_SIZE,
+    concurrency: int = 1,
+    max_items: int | None = None,
+) -> Iterator[dict]:
+    """
+    Lazily yield items from an offset/limit paginated endpoint.
+
+    The first page is fetched up front and its `pagination.count` tells us every
+    remaining offset. Up to `concurrency` later pages are kept in flight while
+    the caller consumes the current one, so with concurrency=1 the next page is
+    simply prefetched, and with a larger value the remaining pages are fanned
+    out in parallel batches. At most `concurrency` pages are held in memory, and
+    items are always yielded in offset order.
+
+    If the response carries no count, pages are followed one at a time (only
+    prefetching when `pagination.next` says another page exists).
+
+    Args:
+        fetch_page: Callable taking (offset, limit) and returning the decoded page.
+        item_key: Key of the item list in each page (e.g. 'bills', 'members').
+        page_size: Items requested per page (capped at MAX_PAGE_SIZE).
+        concurrency: Pages fetched ahead of the consumer.
+        max_items: Optional cap on the total items yielded.
+
+    Yields:
+        Individual items from each page.
+
+    Raises:
+        requests.RequestException: If a page fails; items already yielded stand.
+    """
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    concurrency = max(1, concurrency)
+
+    first = fetch_page(0, page_size)
+    count = (first.get("pagination") or {}).get("count")
+    if max_items is not None:
+        count = max_items if count is None else min(count, max_items)
+
+    if count is None:
+        yield from _follow_next(fetch_page, first, item_key, page_size)
+        return
+
+    remaining = iter(range(page_size, count, page_size))
+    in_flight: deque[Future] = deque()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="congress-pages"
+    )
+
+    def submit_next():
+        offset = next(remaining, None)
+        if offset is not None:
+            in_flight.append(_submit(executor, fetch_page, offset, page_size))
+
+    try:
+        for _ in range(concurrency):
+            submit_next()
+
+        page = first
+        yielded = 0
+        while True:
+            for item in page.get(item_key, []):
+                if yielded >= count:
+                    return
+                yield item
+                yielded += 1
+
+            if not in_flight:
+                return
+            page = in_flight.popleft().result()
+            submit_next()
+    finally:
+        # Consumer stopped early or a page failed: don't wait on pages in flight
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(
+    executor: ThreadPoolExecutor,
+    fetch_page: Callable[[int, int], dict],
+    offset: int,
+    page_size: int,
+) -> Future:
+    # Carry request context (priority class, staleness) into the worker thread
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fetch_page, offset, page_size)
+
+
+def _follow_next(
+    fetch_page: Callable[[int, int], dict],
+    page: dict,
+    item_key: str,
+    page_size: int,
+) -> Iterator[dict]:
+    """Walk pages sequentially when the total count is unknown."""
+    offset = 0
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="congress-pages")
+    try:
+        while True:
+            items = page.get(item_key, [])
+            has_next = bool((page.get("pagination") or {}).get("next"))
+            pending = None
+            if has_next and len(items) >= page_size:
+                offset += page_size
+                pending = _submit(executor, fetch_page, offset, page_size)
+
+            yield from items
+
+            if pending is None:
+                return
+            page = pending.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
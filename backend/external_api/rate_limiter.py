@@ -0,0 +1,325 @@
+"""
+Shared outbound rate limiter for the Congress.gov API key
+
+The key allows CONGRESS_API_HOURLY_LIMIT requests per hour across every process
+that uses it (gunicorn workers, ingestion, sync jobs). A token bucket whose
+state lives in a backend shared by those processes keeps the combined request
+rate under that limit. Lower-priority callers (background sync) may not drain
+the bucket below a reserve, so interactive requests always find tokens first.
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+
+from .deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority: ContextVar[str] = ContextVar("upstream_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def upstream_priority(priority: str):
+    """Run the enclosed upstream calls under the given priority class."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+class RateLimitExceeded(requests.RequestException):
+    """Raised when no token becomes available within the caller's wait budget."""
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token-bucket state. Subclasses must make `take` atomic across
+    every process sharing the bucket; a multi-host deployment can plug in a
+    network store (e.g. Redis with a Lua script) implementing the same methods.
+    """
+
+    @abstractmethod
+    def take(
+        self, name: str, tokens: float, rate: float, capacity: float, floor: float
+    ) -> float:
+        """
+        Refill the bucket and try to take `tokens` without dropping below `floor`.
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they could be.
+        """
+
+    @abstractmethod
+    def clamp(self, name: str, max_tokens: float):
+        """Lower the bucket level to at most `max_tokens` (e.g. from upstream headers)."""
+
+    @abstractmethod
+    def level(self, name: str, rate: float, capacity: float) -> float:
+        """Current bucket level after refill, without taking anything."""
+
+    @staticmethod
+    def _refill(
+        level: float | None, updated_at: float, now: float, rate: float, capacity: float
+    ) -> float:
+        if level is None:
+            return capacity
+        return min(capacity, level + max(0.0, now - updated_at) * rate)
+
+    @staticmethod
+    def _take(level: float, tokens: float, rate: float, floor: float):
+        """Return (new level, wait seconds) for a take attempt at `level`."""
+        if level - tokens >= floor:
+            return level - tokens, 0.0
+        return level, (floor + tokens - level) / rate
+
+
+class MemoryBackend(RateLimitBackend):
+    """In-process bucket state; only coordinates threads of a single process."""
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, name, tokens, rate, capacity, floor):
+        now = time.time()
+        with self._lock:
+            level, updated_at = self._buckets.get(name, (None, now))
+            level = self._refill(level, updated_at, now, rate, capacity)
+            level, wait = self._take(level, tokens, rate, floor)
+            self._buckets[name] = (level, now)
+        return wait
+
+    def clamp(self, name, max_tokens):
+        now = time.time()
+        with self._lock:
+            level, _ = self._buckets.get(name, (max_tokens, now))
+            self._buckets[name] = (min(level, max_tokens), now)
+
+    def level(self, name, rate, capacity):
+        now = time.time()
+        with self._lock:
+            level, updated_at = self._buckets.get(name, (None, now))
+        return self._refill(level, updated_at, now, rate, capacity)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Bucket state in a small SQLite file shared by every process on the host.
+    `BEGIN IMMEDIATE` serializes refill-and-take across processes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the backend.
+
+        Args:
+            path: SQLite file shared by all processes drawing on the same key.
+        """
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and per process (never reuse across fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _update(self, name: str, fn):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (name,)
+            ).fetchone()
+            level, updated_at = row if row else (None, now)
+            new_level, result = fn(level, updated_at, now)
+            conn.execute(
+                "INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET "
+                "tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (name, new_level, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def take(self, name, tokens, rate, capacity, floor):
+        def fn(level, updated_at, now):
+            level = self._refill(level, updated_at, now, rate, capacity)
+            return self._take(level, tokens, rate, floor)
+
+        return self._update(name, fn)
+
+    def clamp(self, name, max_tokens):
+        def fn(level, updated_at, now):
+            level = max_tokens if level is None else min(level, max_tokens)
+            return level, None
+
+        self._update(name, fn)
+
+    def level(self, name, rate, capacity):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (name,)
+            )
+            .fetchone()
+        )
+        level, updated_at = row if row else (None, time.time())
+        return self._refill(level, updated_at, time.time(), rate, capacity)
+
+
+class RateLimiter:
+    """
+    Token bucket sized so that a full burst plus an hour of refill never
+    exceeds the hourly limit: rate = (hourly_limit - burst) / 3600.
+    """
+
+    # Interactive requests without a deadline wait at most this long for a token
+    INTERACTIVE_MAX_WAIT = 5.0
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        name: str = "congress_api",
+        hourly_limit: int = 5000,
+        burst: int = 100,
+        background_reserve: float = 0.5,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            backend: Shared storage for the bucket.
+            name: Bucket name; processes using the same key must use the same name.
+            hourly_limit: Requests per hour allowed for the key.
+            burst: Bucket capacity.
+            background_reserve: Fraction of the bucket background callers may not use.
+        """
+        self.backend = backend
+        self.name = name
+        self.capacity = float(burst)
+        self.rate = (hourly_limit - burst) / 3600.0
+        self.floors = {INTERACTIVE: 0.0, BACKGROUND: self.capacity * background_reserve}
+
+        self._stats_lock = threading.Lock()
+        self.acquired = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.rejected = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.waited_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter | None":
+        """
+        Build the host-shared limiter described by environment variables.
+
+        CONGRESS_API_RATE_LIMIT_BACKEND: 'sqlite' (default), 'memory' or 'none'.
+        CONGRESS_API_RATE_LIMIT_DB: SQLite file for the 'sqlite' backend.
+        CONGRESS_API_HOURLY_LIMIT / CONGRESS_API_BURST: Bucket sizing.
+        """
+        kind = os.getenv("CONGRESS_API_RATE_LIMIT_BACKEND", "sqlite").lower()
+        if kind == "none":
+            return None
+        if kind == "memory":
+            backend = MemoryBackend()
+        else:
+            backend = SQLiteBackend(
+                os.getenv(
+                    "CONGRESS_API_RATE_LIMIT_DB",
+                    os.path.join(tempfile.gettempdir(), "civiliscope_ratelimit.db"),
+                )
+            )
+        return cls(
+            backend,
+            hourly_limit=int(os.getenv("CONGRESS_API_HOURLY_LIMIT", "5000")),
+            burst=int(os.getenv("CONGRESS_API_BURST", "100")),
+        )
+
+    def acquire(self, priority: str | None = None, deadline: Deadline | None = None):
+        """
+        Take one token, waiting for a refill if necessary.
+
+        Args:
+            priority: INTERACTIVE or BACKGROUND. Defaults to the current context's.
+            deadline: Optional deadline bounding the wait.
+
+        Raises:
+            RateLimitExceeded: If no token is available within the wait budget.
+        """
+        priority = priority or current_priority()
+        floor = self.floors[priority]
+
+        if deadline is not None:
+            give_up_at = time.monotonic() + deadline.remaining()
+        elif priority == INTERACTIVE:
+            give_up_at = time.monotonic() + self.INTERACTIVE_MAX_WAIT
+        else:
+            give_up_at = None
+
+        waited = 0.0
+        while True:
+            wait = self.backend.take(self.name, 1, self.rate, self.capacity, floor)
+            if wait <= 0:
+                with self._stats_lock:
+                    self.acquired[priority] += 1
+                    self.waited_seconds[priority] += waited
+                return
+
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                with self._stats_lock:
+                    self.rejected[priority] += 1
+                raise RateLimitExceeded(
+                    f"No {priority} token for '{self.name}' within wait budget "
+                    f"(next in {wait:.2f}s)"
+                )
+
+            time.sleep(wait)
+            waited += wait
+
+    def observe_remaining(self, remaining: int):
+        """
+        Sync with the upstream's own view of the quota (X-RateLimit-Remaining)
+        so other consumers of the key we cannot see are accounted for.
+        """
+        if remaining < self.capacity:
+            self.backend.clamp(self.name, float(remaining))
+
+    def snapshot(self) -> dict:
+        """Return bucket level and per-priority counters for metrics."""
+        with self._stats_lock:
+            return {
+                "name": self.name,
+                "tokens": self.backend.level(self.name, self.rate, self.capacity),
+                "capacity": self.capacity,
+                "refill_per_second": self.rate,
+                "acquired": dict(self.acquired),
+                "rejected": dict(self.rejected),
+                "waited_seconds": dict(self.waited_seconds),
+            }
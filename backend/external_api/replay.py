@@ -0,0 +1,191 @@
+"""
+Record/replay fixture layer for Congress.gov HTTP traffic
+
+In record mode every upstream response is written to a fixture directory; in
+replay mode responses are served from those fixtures without touching the
+network. Set CONGRESS_API_REPLAY=record|replay and CONGRESS_API_FIXTURES=<dir>
+to enable it for the shared client.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+DEFAULT_FIXTURE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "tests", "fixtures", "congress"
+)
+
+# Query parameters that never affect the response body
+_IGNORED_PARAMS = {"api_key", "format"}
+
+# Response headers worth keeping in a fixture
+_KEPT_HEADERS = {
+    "content-type",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+}
+
+
+class FixtureNotFound(requests.ConnectionError):
+    """Raised in replay mode when no fixture was recorded for a request."""
+
+
+class FixtureStore:
+    """
+    JSON fixtures on disk, one file per (path, query) pair.
+
+    Files live at <root>/<path segments>/<query hash>.json so they are easy to
+    browse, and hold the status, a few headers and the decoded JSON body.
+    """
+
+    def __init__(self, root: str = DEFAULT_FIXTURE_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory holding the fixtures.
+        """
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(url: str) -> tuple[str, list[tuple[str, str]]]:
+        """
+        Reduce a URL to the (path, query) pair fixtures are keyed by. The path is
+        taken relative to the API version prefix so fixtures recorded against
+        api.congress.gov replay against any host.
+        """
+        parts = urlsplit(url)
+        path = re.sub(r"^.*?/v3(?=/)", "", parts.path) or "/"
+        query = sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k not in _IGNORED_PARAMS
+        )
+        return path.rstrip("/") or "/", query
+
+    def path_for(self, path: str, query: list[tuple[str, str]]) -> str:
+        digest = hashlib.sha1(json.dumps(query).encode()).hexdigest()[:12]
+        safe = [re.sub(r"[^A-Za-z0-9_.-]", "_", seg) for seg in path.split("/") if seg]
+        return os.path.join(self.root, *safe, f"{digest}.json")
+
+    def load(self, url: str) -> dict | None:
+        """Return the fixture recorded for a URL, or None."""
+        path, query = self.normalize(url)
+        try:
+            with open(self.path_for(path, query)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, url: str, status: int, headers: dict, body) -> str:
+        """Write a fixture for a URL and return the file it was written to."""
+        path, query = self.normalize(url)
+        filepath = self.path_for(path, query)
+        fixture = {
+            "path": path,
+            "query": query,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() in _KEPT_HEADERS},
+            "body": body,
+        }
+        with self._lock:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, "w") as f:
+                json.dump(fixture, f, indent=2, sort_keys=True)
+        return filepath
+
+    def iter_fixtures(self):
+        """Yield every stored fixture."""
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in sorted(filenames):
+                if filename.endswith(".json"):
+                    with open(os.path.join(dirpath, filename)) as f:
+                        yield json.load(f)
+
+
+def build_response(
+    request: requests.PreparedRequest, fixture: dict
+) -> requests.Response:
+    """Turn a stored fixture into a requests.Response for `request`."""
+    response = requests.Response()
+    response.status_code = fixture["status"]
+    response.headers = CaseInsensitiveDict(fixture.get("headers") or {})
+    response.headers.setdefault("Content-Type", "application/json")
+    response._content = json.dumps(fixture["body"]).encode()
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.reason = "Replayed"
+    return response
+
+
+class RecordReplayAdapter(BaseAdapter):
+    """
+    Transport adapter placed in front of the real one.
+
+    record: forward to `inner` and save every decodable response.
+    replay: answer from the store only; a missing fixture is a connection error.
+    """
+
+    def __init__(self, inner: BaseAdapter, store: FixtureStore, mode: str):
+        """
+        Initialize the adapter.
+
+        Args:
+            inner: Adapter that performs real requests (used in record mode).
+            store: Fixture storage.
+            mode: RECORD or REPLAY.
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown replay mode '{mode}'")
+        super().__init__()
+        self.inner = inner
+        self.store = store
+        self.mode = mode
+
+    def send(self, request, **kwargs):
+        if self.mode == REPLAY:
+            fixture = self.store.load(request.url)
+            if fixture is None:
+                path, query = self.store.normalize(request.url)
+                raise FixtureNotFound(f"No fixture for {path} {query}")
+            return build_response(request, fixture)
+
+        response = self.inner.send(request, **kwargs)
+        try:
+            body = response.json()
+        except ValueError:
+            return response
+        filepath = self.store.save(
+            request.url, response.status_code, response.headers, body
+        )
+        logger.info(f"Recorded {request.url} -> {filepath}")
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+def adapter_from_env(inner: BaseAdapter) -> BaseAdapter:
+    """Wrap `inner` in a RecordReplayAdapter if CONGRESS_API_REPLAY is set."""
+    mode = os.getenv("CONGRESS_API_REPLAY", "").lower()
+    if not mode:
+        return inner
+    store = FixtureStore(os.getenv("CONGRESS_API_FIXTURES", DEFAULT_FIXTURE_DIR))
+    logger.info(f"Congress.gov traffic in {mode} mode using fixtures at {store.root}")
+    return RecordReplayAdapter(inner, store, mode)
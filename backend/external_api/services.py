@@ -3,11 +3,71 @@ Services related to CongressAPI
 """
 
 import logging
+import os
+import threading
 
 from .congress_api import CongressAPI
+from .deadline import Deadline
 
 logger = logging.getLogger(__name__)
-api = CongressAPI()
+
+# Each process gets its own client, created on first use. Under gunicorn that
+# means after fork, so workers never share sockets inherited from the master.
+_api: CongressAPI | None = None
+_api_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    """
+    Connections per worker unless overridden: one per request thread, one per
+    parallel page fetch of a list call and one for the scheduler thread.
+    """
+    threads = int(os.getenv("GUNICORN_THREADS", "1"))
+    default = threads + CongressAPI.PAGE_CONCURRENCY + 1
+    return int(os.getenv("CONGRESS_API_POOL_SIZE", str(default)))
+
+
+def get_api() -> CongressAPI:
+    """
+    Get this process's Congress.gov client, creating it on first use.
+
+    Returns:
+        The shared CongressAPI instance for the current process.
+    """
+    global _api
+
+    if _api is None:
+        with _api_lock:
+            if _api is None:
+                pool_size = _pool_size()
+                _api = CongressAPI(pool_size=pool_size)
+                logger.info(
+                    f"Created Congress.gov client in pid {os.getpid()} "
+                    f"(pool size {pool_size})"
+                )
+    return _api
+
+
+def close_api():
+    """Close this process's client and its pooled connections."""
+    global _api
+
+    with _api_lock:
+        if _api is not None:
+            _api.close()
+            _api = None
+
+
+def _forget_api_after_fork():
+    # Drop (without closing) the parent's client: closing would send TLS
+    # close_notify on sockets the parent is still using.
+    global _api, _api_lock
+
+    _api = None
+    _api_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_api_after_fork)
 
 
 def get_member_image_urls(save_json: bool = True) -> dict[str, str]:
@@ -21,53 +81,62 @@ def get_member_image_urls(save_json: bool = True) -> dict[str, str]:
         Dictionary mapping bioguide ID to image URL.
     """
     try:
-        return api.create_bioguide_to_image_url_dict(save_to_file=save_json)
+        return get_api().create_bioguide_to_image_url_dict(save_to_file=save_json)
     except Exception as e:
         logger.error(f"Error getting member image URLs: {e}")
         return {}
 
 
-def get_member_details(bioguide_id: str) -> dict | None:
+def get_member_details(
+    bioguide_id: str, deadline: Deadline | None = None
+) -> dict | None:
     """
     Get detailed information for a specific member by bioguide ID.
 
     Args:
         bioguide_id: The bioguide ID of the member to fetch.
+        deadline: Optional request deadline passed down from the route.
 
     Returns:
         Full JSON response from Congress.gov API, or None if not found.
     """
     try:
-        return api.get_member(bioguide_id)
+        return get_api().get_member(bioguide_id, deadline=deadline)
     except Exception as e:
         logger.error(f"Error getting member details for {bioguide_id}: {e}")
         return None
 
 
-def get_current_congress() -> dict | None:
+def get_current_congress(deadline: Deadline | None = None) -> dict | None:
     """
     Get information about the current Congress.
 
+    Args:
+        deadline: Optional request deadline passed down from the route.
+
     Returns:
         Full JSON response from Congress.gov API containing current congress information, or None if not found.
     """
     try:
-        return api.get_current_congress()
+        return get_api().get_current_congress(deadline=deadline)
     except Exception as e:
         logger.error(f"Error getting current congress information: {e}")
         return None
 
 
-def get_bills_for_current_congress() -> dict | None:
+def get_bills_for_current_congress(deadline: Deadline | None = None) -> dict | None:
     """
     Get bills for the current Congress.
 
+    Args:
+        deadline: Optional request deadline shared by both upstream calls.
+
     Returns:
         Full JSON response from Congress.gov API containing bills for the current congress, or None if not found.
     """
     try:
         # First get the current congress number
-        current_congress_data = api.get_current_congress()
+        current_congress_data = get_api().get_current_congress(deadline=deadline)
         if not current_congress_data or not current_congress_data.get("congress"):
             logger.error("Could not get current congress information")
             return None
@@ -75,14 +144,19 @@ def get_bills_for_current_congress() -> dict | None:
         congress_number = current_congress_data["congress"]["number"]
 
         # Then get bills for that congress
-        return api.get_bills_for_congress(congress_number, limit=200)
+        return get_api().get_bills_for_congress(
+            congress_number, limit=200, deadline=deadline
+        )
     except Exception as e:
         logger.error(f"Error getting bills for current congress: {e}")
         return None
 
 
 def get_bill_actions_service(
-    congress: int, bill_type: str, bill_number: int
+    congress: int,
+    bill_type: str,
+    bill_number: int,
+    deadline: Deadline | None = None,
 ) -> dict | None:
     """
     Get actions for a specific bill.
@@ -91,14 +165,34 @@ def get_bill_actions_service(
         congress: The congress number.
         bill_type: The type of bill (e.g., 'hr', 's', 'hjres', 'sjres').
         bill_number: The bill number.
+        deadline: Optional request deadline passed down from the route.
 
     Returns:
         Full JSON response from Congress.gov API containing bill actions, or None if not found.
     """
     try:
-        return api.get_bill_actions(congress, bill_type, bill_number)
+        return get_api().get_bill_actions(
+            congress, bill_type, bill_number, deadline=deadline
+        )
     except Exception as e:
         logger.error(
             f"Error getting bill actions for {bill_type.upper()}{bill_number} (Congress {congress}): {e}"
         )
         return None
+
+
+def get_upstream_status() -> dict:
+    """
+    Get the health of the Congress.gov upstream as seen by this worker.
+
+    Returns:
+        Circuit breaker, rate limiter and connection pool snapshots plus the
+        number of last-known-good payloads held.
+    """
+    api = get_api()
+    return {
+        "circuit_breaker": api.breaker.snapshot(),
+        "stale_fallback_entries": len(api.last_good),
+        "rate_limiter": api.rate_limiter.snapshot() if api.rate_limiter else None,
+        "connection_pool": api.pool_stats.snapshot(),
+    }
@@ -0,0 +1,486 @@
+"""
+Local stand-in for the Congress.gov API
+
+Serves /congress/current, /member, /member/<id>, /bill/<congress> and
+/bill/<congress>/<type>/<number>/actions with configurable latency, error
+injection and offset/limit pagination, so the proxy routes can be benchmarked
+and load-tested offline. Responses recorded by external_api.replay are served
+verbatim when present; everything else is synthesized deterministically from
+legislators-current.yaml and a seeded bill generator.
+
+Usage:
+    python -m external_api.stub_server --port 8089 --latency-ms 80 --error-rate 0.02
+    CONGRESS_API_BASE_URL=http://127.0.0.1:8089/v3 CONGRESS_API_KEY=stub python run.py
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import yaml
+
+from .replay import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+LEGISLATORS_FILE = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "data_ingestion",
+    "congress",
+    "legislators-current.yaml",
+)
+
+BILL_TYPES = ["hr", "s", "hres", "sres", "hjres", "sjres", "hconres", "sconres"]
+
+ACTION_TEXTS = [
+    "Introduced in House",
+    "Referred to the Committee on Energy and Commerce.",
+    "Read twice and referred to the Committee on Finance.",
+    "Subcommittee Hearings Held.",
+    "Ordered to be Reported by Voice Vote.",
+    "Placed on the Union Calendar, Calendar No. 12.",
+    "Passed/agreed to in House: On passage Passed by the Yeas and Nays.",
+    "Received in the Senate.",
+    "Motion to proceed to consideration of measure agreed to in Senate.",
+    "Became Public Law No: 119-4.",
+]
+
+
+def congress_for_year(year: int) -> int:
+    """Congress number in session during (most of) a calendar year."""
+    return (year - 1789) // 2 + 1
+
+
+class StubData:
+    """Deterministic synthetic Congress.gov dataset."""
+
+    def __init__(
+        self,
+        legislators_file: str = LEGISLATORS_FILE,
+        congress: int = 119,
+        bill_count: int = 2000,
+        seed: int = 0,
+    ):
+        """
+        Initialize the dataset.
+
+        Args:
+            legislators_file: congress-legislators YAML used for members.
+            congress: Number reported by /congress/current.
+            bill_count: Bills generated for each congress.
+            seed: Seed for generated bills and actions.
+        """
+        self.congress = congress
+        self.bill_count = bill_count
+        self.seed = seed
+
+        with open(legislators_file) as f:
+            legislators = yaml.load(
+                f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            )
+
+        self.members = {}
+        self.member_list = []
+        for leg in legislators:
+            detail = self._member_detail(leg)
+            self.members[detail["bioguideId"]] = detail
+            self.member_list.append(self._member_summary(detail))
+
+    @staticmethod
+    def _image_url(bioguide_id: str) -> str:
+        return f"https://www.congress.gov/img/member/{bioguide_id.lower()}_200.jpg"
+
+    def _member_detail(self, leg: dict) -> dict:
+        bioguide_id = leg["id"]["bioguide"]
+        name = leg["name"]
+        latest = leg["terms"][-1]
+
+        terms = []
+        for term in leg["terms"]:
+            start_year = int(term["start"][:4])
+            end_year = int(term["end"][:4])
+            senate = term["type"] == "sen"
+            for congress in range(
+                congress_for_year(start_year), congress_for_year(end_year)
+            ):
+                entry = {
+                    "chamber": "Senate" if senate else "House of Representatives",
+                    "congress": congress,
+                    "startYear": start_year,
+                    "endYear": end_year,
+                    "memberType": "Senator" if senate else "Representative",
+                    "stateCode": term["state"],
+                    "stateName": term["state"],
+                }
+                if term["type"] == "rep":
+                    entry["district"] = term.get("district", 0)
+                terms.append(entry)
+
+        digest = int(hashlib.sha1(bioguide_id.encode()).hexdigest(), 16)
+        return {
+            "bioguideId": bioguide_id,
+            "directOrderName": name.get(
+                "official_full", f"{name['first']} {name['last']}"
+            ),
+            "invertedOrderName": f"{name['last']}, {name['first']}",
+            "firstName": name["first"],
+            "lastName": name["last"],
+            "honorificName": "Sen." if latest["type"] == "sen" else "Rep.",
+            "state": latest["state"],
+            "district": latest.get("district"),
+            "birthYear": leg.get("bio", {}).get("birthday", "1960")[:4],
+            "currentMember": True,
+            "depiction": {
+                "attribution": "Image courtesy of the Member",
+                "imageUrl": self._image_url(bioguide_id),
+            },
+            "officialWebsiteUrl": latest.get("url"),
+            "partyHistory": [
+                {
+                    "partyAbbreviation": latest["party"][:1],
+                    "partyName": latest["party"],
+                    "startYear": int(leg["terms"][0]["start"][:4]),
+                }
+            ],
+            "terms": terms,
+            "sponsoredLegislation": {
+                "count": digest % 400,
+                "url": f"https://api.congress.gov/v3/member/{bioguide_id}/sponsored-legislation",
+            },
+            "cosponsoredLegislation": {
+                "count": digest % 2000,
+                "url": f"https://api.congress.gov/v3/member/{bioguide_id}/cosponsored-legislation",
+            },
+            "updateDate": "2025-06-01T12:00:00Z",
+        }
+
+    @staticmethod
+    def _member_summary(detail: dict) -> dict:
+        return {
+            "bioguideId": detail["bioguideId"],
+            "name": detail["invertedOrderName"],
+            "partyName": detail["partyHistory"][0]["partyName"],
+            "state": detail["state"],
+            "district": detail["district"],
+            "depiction": detail["depiction"],
+            "terms": {
+                "item": [
+                    {"chamber": t["chamber"], "startYear": t["startYear"]}
+                    for t in detail["terms"][-1:]
+                ]
+            },
+            "updateDate": detail["updateDate"],
+            "url": f"https://api.congress.gov/v3/member/{detail['bioguideId']}?format=json",
+        }
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(f"{self.seed}:{':'.join(map(str, key))}")
+
+    def bill(self, congress: int, index: int) -> dict:
+        rng = self._rng("bill", congress, index)
+        bill_type = BILL_TYPES[index % len(BILL_TYPES)]
+        number = index // len(BILL_TYPES) + 1
+        action_date = date(2025, 1, 3) + timedelta(days=rng.randrange(0, 500))
+        return {
+            "congress": congress,
+            "number": str(number),
+            "type": bill_type.upper(),
+            "originChamber": "Senate" if bill_type.startswith("s") else "House",
+            "title": f"Synthetic {bill_type.upper()} {number} of the {congress}th Congress",
+            "latestAction": {
+                "actionDate": action_date.isoformat(),
+                "text": rng.choice(ACTION_TEXTS),
+            },
+            "updateDate": action_date.isoformat(),
+            "url": f"https://api.congress.gov/v3/bill/{congress}/{bill_type}/{number}?format=json",
+        }
+
+    def actions(self, congress: int, bill_type: str, number: int) -> list[dict]:
+        rng = self._rng("actions", congress, bill_type, number)
+        day = date(2025, 1, 3) + timedelta(days=rng.randrange(0, 200))
+        actions = []
+        for i in range(rng.randrange(3, 30)):
+            day += timedelta(days=rng.randrange(0, 20))
+            actions.append(
+                {
+                    "actionCode": str(1000 + i),
+                    "actionDate": day.isoformat(),
+                    "text": ACTION_TEXTS[min(i, len(ACTION_TEXTS) - 1)],
+                    "type": "IntroReferral" if i < 2 else "Floor",
+                    "sourceSystem": {"code": 9, "name": "Library of Congress"},
+                }
+            )
+        # Congress.gov lists the most recent action first
+        return list(reversed(actions))
+
+    def current_congress(self) -> dict:
+        start_year = 1789 + (self.congress - 1) * 2
+        return {
+            "number": self.congress,
+            "name": f"{self.congress}th Congress",
+            "startYear": str(start_year),
+            "endYear": str(start_year + 2),
+            "sessions": [
+                {
+                    "chamber": chamber,
+                    "number": 1,
+                    "startDate": f"{start_year}-01-03",
+                    "type": "R",
+                }
+                for chamber in ("House of Representatives", "Senate")
+            ],
+            "updateDate": f"{start_year}-01-03T17:00:00Z",
+            "url": f"https://api.congress.gov/v3/congress/{self.congress}?format=json",
+        }
+
+
+class StubCongressServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the stand-in's data and fault settings."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        data: StubData | None = None,
+        fixtures: FixtureStore | None = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: int | None = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            address: (host, port) to bind; port 0 picks a free one.
+            data: Synthetic dataset. Built from the default YAML if omitted.
+            fixtures: Recorded responses served in preference to synthetic ones.
+            latency_ms: Fixed delay added to every response.
+            jitter_ms: Extra uniform random delay up to this many milliseconds.
+            error_rate: Fraction of requests answered with `error_status`.
+            error_status: Status used for injected errors (e.g. 503 or 429).
+            retry_after: Retry-After seconds sent with injected errors.
+            seed: Seed for latency jitter and error injection.
+        """
+        super().__init__(address, StubRequestHandler)
+        self.data = data or StubData(seed=seed)
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.requests_served = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v3"
+
+    def next_fault(self) -> tuple[float, bool]:
+        """Draw (delay seconds, inject error?) for one request."""
+        with self._lock:
+            self.requests_served += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            return delay / 1000.0, self._rng.random() < self.error_rate
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubCongressServer
+
+    ROUTES = [
+        (re.compile(r"^/congress/current$"), "current_congress"),
+        (re.compile(r"^/member$"), "member_list"),
+        (re.compile(r"^/member/(?P<bioguide_id>[^/]+)$"), "member_detail"),
+        (re.compile(r"^/bill/(?P<congress>\d+)$"), "bill_list"),
+        (
+            re.compile(
+                r"^/bill/(?P<congress>\d+)/(?P<bill_type>[a-z]+)/(?P<number>\d+)/actions$"
+            ),
+            "bill_actions",
+        ),
+    ]
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        delay, inject_error = self.server.next_fault()
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            headers = {}
+            if self.server.retry_after is not None:
+                headers["Retry-After"] = str(self.server.retry_after)
+            self._send(self.server.error_status, {"error": "Injected failure"}, headers)
+            return
+
+        parts = urlsplit(self.path)
+        path = re.sub(r"^/v3", "", parts.path).rstrip("/")
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+        if self.server.fixtures is not None:
+            fixture = self.server.fixtures.load(self.path)
+            if fixture is not None:
+                self._send(fixture["status"], fixture["body"], fixture.get("headers"))
+                return
+
+        for pattern, name in self.ROUTES:
+            match = pattern.match(path)
+            if match:
+                status, body = getattr(self, name)(query, **match.groupdict())
+                self._send(status, body)
+                return
+
+        self._send(404, {"error": f"Unknown endpoint {path}"})
+
+    def _send(self, status: int, body: dict, headers: dict | None = None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-RateLimit-Limit", "5000")
+        self.send_header("X-RateLimit-Remaining", "4999")
+        for key, value in (headers or {}).items():
+            if key.lower() != "content-type":
+                self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _request_info(self, query: dict, **extra) -> dict:
+        return {
+            "contentType": "application/json",
+            "format": query.get("format", "json"),
+            **extra,
+        }
+
+    def _page(self, path: str, query: dict, key: str, total: int, item_at) -> dict:
+        offset = max(0, int(query.get("offset", 0)))
+        limit = min(250, max(1, int(query.get("limit", 20))))
+        items = [item_at(i) for i in range(offset, min(offset + limit, total))]
+        pagination = {"count": total}
+        if offset + limit < total:
+            pagination["next"] = (
+                f"{self.server.base_url}{path}?offset={offset + limit}&limit={limit}&format=json"
+            )
+        return {
+            key: items,
+            "pagination": pagination,
+            "request": self._request_info(query),
+        }
+
+    def current_congress(self, query):
+        return 200, {
+            "congress": self.server.data.current_congress(),
+            "request": self._request_info(query),
+        }
+
+    def member_list(self, query):
+        members = self.server.data.member_list
+        return 200, self._page(
+            "/member", query, "members", len(members), members.__getitem__
+        )
+
+    def member_detail(self, query, bioguide_id):
+        member = self.server.data.members.get(bioguide_id.upper())
+        if member is None:
+            return 404, {"error": f"Unknown bioguide ID {bioguide_id}"}
+        return 200, {
+            "member": member,
+            "request": self._request_info(query, bioguideId=bioguide_id),
+        }
+
+    def bill_list(self, query, congress):
+        congress = int(congress)
+        return 200, self._page(
+            f"/bill/{congress}",
+            query,
+            "bills",
+            self.server.data.bill_count,
+            lambda i: self.server.data.bill(congress, i),
+        )
+
+    def bill_actions(self, query, congress, bill_type, number):
+        if bill_type not in BILL_TYPES:
+            return 404, {"error": f"Unknown bill type {bill_type}"}
+        actions = self.server.data.actions(int(congress), bill_type, int(number))
+        return 200, self._page(
+            f"/bill/{congress}/{bill_type}/{number}/actions",
+            query,
+            "actions",
+            len(actions),
+            actions.__getitem__,
+        )
+
+
+def serve_in_thread(**kwargs) -> StubCongressServer:
+    """
+    Start a stand-in server on a free local port in a daemon thread.
+
+    Args:
+        **kwargs: Passed to StubCongressServer.
+
+    Returns:
+        The running server; use `.base_url` and call `.shutdown()` when done.
+    """
+    server = StubCongressServer(("127.0.0.1", 0), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Congress.gov stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--bill-count", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--fixtures", help="Directory of recorded fixtures to serve first"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = StubCongressServer(
+        (args.host, args.port),
+        data=StubData(bill_count=args.bill_count, seed=args.seed),
+        fixtures=FixtureStore(args.fixtures) if args.fixtures else None,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    logger.info(f"Congress.gov stand-in listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
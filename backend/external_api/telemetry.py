@@ -0,0 +1,98 @@
+"""
+Per-call instrumentation of Congress.gov requests
+
+Every logical CongressAPI call (all of its retries included) produces one
+UpstreamCall. Listeners registered with add_listener receive each of them
+(app.metrics turns them into Prometheus samples), and the time spent upstream
+is summed per inbound request so routes can report it.
+"""
+
+import logging
+import re
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Identifier segments collapsed when a caller gives no explicit template
+_ID_SEGMENT = re.compile(r"^(\d+|[A-Z]\d{6})$")
+
+
+@dataclass(frozen=True)
+class UpstreamCall:
+    """Outcome of one logical upstream call."""
+
+    endpoint: str  # path template, e.g. /member/{bioguideId}
+    status: str  # HTTP status code, or the exception name if no response arrived
+    seconds: float  # wall time including retries and backoff
+    bytes_received: int
+    retries: int
+    ratelimit_limit: int | None = None
+    ratelimit_remaining: int | None = None
+
+
+_listeners: list[Callable[[UpstreamCall], None]] = []
+_listeners_lock = threading.Lock()
+
+# Upstream time and call count for the current inbound request. Held in a
+# mutable dict so parallel page fetches running in a copied context add to
+# the request that started them.
+_totals: ContextVar[dict | None] = ContextVar("upstream_totals", default=None)
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Collapse numeric and bioguide-ID segments of a path into placeholders, so
+    '/bill/119/hr/1/actions' becomes '/bill/{n}/hr/{n}/actions'.
+    """
+    return "/".join(
+        "{n}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+    )
+
+
+def add_listener(listener: Callable[[UpstreamCall], None]):
+    """Call `listener` with every UpstreamCall recorded in this process."""
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[UpstreamCall], None]):
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def reset_upstream_time():
+    """Start accounting upstream time for a new inbound request."""
+    _totals.set({"seconds": 0.0, "calls": 0})
+
+
+def upstream_time() -> tuple[float, int]:
+    """
+    Upstream time spent by the current request.
+
+    Returns:
+        (seconds summed over every call, number of calls). Parallel calls
+        overlap, so the sum can exceed the request's own wall time.
+    """
+    totals = _totals.get()
+    if totals is None:
+        return 0.0, 0
+    return totals["seconds"], totals["calls"]
+
+
+def record(call: UpstreamCall):
+    """Add `call` to the current request's totals and notify listeners."""
+    totals = _totals.get()
+    if totals is not None:
+        totals["seconds"] += call.seconds
+        totals["calls"] += 1
+
+    for listener in list(_listeners):
+        try:
+            listener(call)
+        except Exception as e:
+            logger.error(f"Upstream telemetry listener failed: {e}")
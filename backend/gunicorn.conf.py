@@ -0,0 +1,57 @@
+"""
+Gunicorn configuration (loaded by start.sh)
+"""
+
+import gc
+import os
+import shutil
+
+# Preload mode: import the app once in the master (roster store, in-memory
+# replica, parsed datasets) so workers share those pages copy-on-write.
+# Database connections and the Congress.gov client are re-created in each
+# worker by their os.register_at_fork hooks.
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() == "true"
+
+# GUNICORN_WORKER_CLASS=gevent serves each connection from a greenlet, so
+# thousands of idle /api/stream/updates clients cost a few KiB each instead
+# of a thread; start.sh defaults to it. The gevent worker patches itself, but
+# with preload the app is imported here in the master first, so patch before.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "2000"))
+if worker_class == "gevent" and preload_app:
+    from gevent import monkey
+
+    monkey.patch_all()
+
+if preload_app:
+    # A collection in the master touches the GC header of every tracked object;
+    # after fork that write would copy the page into each worker
+    gc.disable()
+
+
+def on_starting(server):
+    # Start every deployment with an empty multiprocess metrics directory
+    path = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop live gauges (e.g. in-flight requests) of workers that have exited
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # Park everything the master allocated in the permanent generation so
+        # workers' collections never visit (and copy) those objects
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
@@ -0,0 +1,206 @@
+"""
+Hit ratio of the local member cache under a crawl: LRU vs. W-TinyLFU
+
+Replays a member-detail trace through a byte-bounded LRU and through the
+W-TinyLFU cache the app uses, at several cache sizes. The default trace is
+organic traffic (Zipf-distributed over current members)
+mixed with a crawler walking every bioguide ID in order, current and
+historical. Entry sizes are the stub server's member details compressed
+with a dictionary trained on a third of them, as the app stores them
+(--raw: uncompressed JSON); historical members reuse sizes drawn from them. A recorded trace can be
+replayed instead: one request per line, either a bare bioguide ID or an
+access log line containing /api/members/<id>.
+
+    python -m scripts.bench_cache --requests 200000 --crawl-share 0.3
+    python -m scripts.bench_cache --trace access.log
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from collections import OrderedDict
+
+import zstandard
+
+from app.tinylfu import WTinyLFU
+from external_api.stub_server import StubData
+
+MEMBER_PATH = re.compile(r"/api/members/([A-Za-z0-9]+)")
+
+
+class LRU:
+    """Byte-bounded LRU baseline with the same get/put/stats surface."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        self.misses += 1
+        return None
+
+    def put(self, key, value, size: int):
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+
+def synthetic_trace(
+    sizes: dict[str, int],
+    historical: int,
+    requests: int,
+    crawl_share: float,
+    skew: float,
+    seed: int,
+) -> list[tuple[str, bool]]:
+    """(bioguide ID, is organic) pairs: skewed readers plus a sequential crawl."""
+    rng = random.Random(seed)
+    current = sorted(sizes)
+    rng.shuffle(current)  # popularity order
+    crawl = sorted(current + [f"H{i:06d}" for i in range(historical)])
+    weights = [1 / (rank + 1) ** skew for rank in range(len(current))]
+    organic = iter(rng.choices(current, weights, k=requests))
+
+    trace, crawled = [], 0
+    for _ in range(requests):
+        if rng.random() < crawl_share:
+            trace.append((crawl[crawled % len(crawl)], False))
+            crawled += 1
+        else:
+            trace.append((next(organic), True))
+    return trace
+
+
+def file_trace(path: str) -> list[tuple[str, bool]]:
+    trace = []
+    with open(path) as f:
+        for line in f:
+            match = MEMBER_PATH.search(line)
+            key = match.group(1) if match else line.strip()
+            if key:
+                trace.append((key, True))
+    return trace
+
+
+def replay(cache, trace, sizes, fallback_sizes, rng) -> dict:
+    organic_hits = organic = 0
+    started = time.perf_counter()
+    for key, is_organic in trace:
+        hit = cache.get(key) is not None
+        if not hit:
+            size = sizes.get(key)
+            if size is None:
+                size = sizes[key] = rng.choice(fallback_sizes)
+            cache.put(key, key, size)
+        if is_organic:
+            organic += 1
+            organic_hits += hit
+    seconds = time.perf_counter() - started
+
+    if isinstance(cache, LRU):
+        hits, misses, evictions = cache.hits, cache.misses, cache.evictions
+    else:
+        stats = cache.stats()
+        hits, misses = stats.hits, stats.misses
+        evictions = stats.evictions + stats.rejections
+    return {
+        "hit_ratio": hits / (hits + misses),
+        "organic_hit_ratio": organic_hits / organic if organic else 0.0,
+        "evictions": evictions,
+        "us_per_request": seconds / len(trace) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument(
+        "--crawl-share", type=float, default=0.3, help="Fraction of crawler requests"
+    )
+    parser.add_argument(
+        "--skew", type=float, default=0.9, help="Zipf exponent of organic reads"
+    )
+    parser.add_argument(
+        "--historical", type=int, default=12_000, help="Historical IDs crawled"
+    )
+    parser.add_argument(
+        "--sizes-mib",
+        type=float,
+        nargs="+",
+        default=[0.125, 0.25, 0.5, 1],
+        help="Cache sizes to compare",
+    )
+    parser.add_argument("--trace", help="Replay this trace instead")
+    parser.add_argument(
+        "--raw", action="store_true", help="Charge uncompressed JSON sizes"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    members = StubData().members
+    bodies = {
+        key: json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+        for key, payload in members.items()
+    }
+    if args.raw:
+        sizes = {key: len(key) + len(body) for key, body in bodies.items()}
+    else:
+        samples = random.Random(args.seed).sample(
+            list(bodies.values()), len(bodies) // 3
+        )
+        dictionary = zstandard.train_dictionary(32768, samples)
+        compressor = zstandard.ZstdCompressor(level=9, dict_data=dictionary)
+        sizes = {
+            key: len(key) + len(compressor.compress(body))
+            for key, body in bodies.items()
+        }
+    fallback_sizes = sorted(sizes.values())
+    if args.trace:
+        trace = file_trace(args.trace)
+    else:
+        trace = synthetic_trace(
+            sizes,
+            args.historical,
+            args.requests,
+            args.crawl_share,
+            args.skew,
+            args.seed,
+        )
+    print(
+        f"{len(trace)} requests, {len({key for key, _ in trace})} distinct members, "
+        f"median entry {fallback_sizes[len(fallback_sizes) // 2]} B"
+    )
+
+    print(
+        f"{'MiB':>5} {'policy':<10} {'hit':>6} {'organic':>8} "
+        f"{'evicted':>8} {'us/req':>7}"
+    )
+    for mib in args.sizes_mib:
+        max_bytes = int(mib * 1024 * 1024)
+        for name, cache in (
+            ("lru", LRU(max_bytes)),
+            ("w-tinylfu", WTinyLFU(max_bytes)),
+        ):
+            result = replay(
+                cache, trace, dict(sizes), fallback_sizes, random.Random(args.seed)
+            )
+            print(
+                f"{mib:>5g} {name:<10} {result['hit_ratio']:>6.1%} "
+                f"{result['organic_hit_ratio']:>8.1%} {result['evictions']:>8} "
+                f"{result['us_per_request']:>7.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+CPU cost per request of the roster routes: ORM vs. the in-process roster store
+
+Seeds a SQLite file from legislators-current.yaml, then times the list and
+detail routes through the Flask test client with time.process_time(). The
+ORM baseline is the query-and-jsonify code the routes used before the roster
+store, mounted under /orm; its bodies are checked byte-for-byte against the
+store's.
+
+    python -m scripts.bench_roster --iterations 500
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from flask import jsonify
+
+
+def orm_list(model, fields):
+    rows = model.query.order_by(model.last_name).all()
+    return jsonify([{key: getattr(r, attr) for key, attr in fields} for r in rows])
+
+
+def orm_detail(model, fields, bioguide_id):
+    row = model.query.get_or_404(bioguide_id)
+    return jsonify({key: getattr(row, attr) for key, attr in fields})
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    """Mean CPU microseconds per call of `fn`."""
+    fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="civiliscope-bench-")
+    db_path = os.path.join(workdir, "roster.db")
+    os.environ.setdefault("FRONTEND_URL", "http://localhost")
+    os.environ["METRICS_ENABLED"] = "false"
+
+    from scripts.load_test import seed_database
+
+    ids = seed_database(db_path)
+    from app import create_app
+    from app.models import Representative, Senator
+
+    app = create_app()
+    client = app.test_client()
+    rng = random.Random(args.seed)
+
+    common = [
+        ("bioguide_id", "bioguide_id"),
+        ("name", "full_name"),
+        ("state", "state"),
+        ("party", "party"),
+        ("photo_url", "photo_url"),
+    ]
+    terms = [("term_start", "term_start"), ("term_end", "term_end")]
+    chambers = {
+        "senators": (Senator, common + [("seat_number", "seat_number")]),
+        "representatives": (Representative, common + [("district", "district")]),
+    }
+
+    # Register the ORM baseline under /orm so both paths pay the same Flask overhead
+    for chamber, (model, fields) in chambers.items():
+        app.add_url_rule(
+            f"/orm/{chamber}/",
+            f"orm_{chamber}_list",
+            lambda m=model, f=fields: orm_list(m, f),
+        )
+        app.add_url_rule(
+            f"/orm/{chamber}/<bioguide_id>",
+            f"orm_{chamber}_detail",
+            lambda bioguide_id, m=model, f=fields: orm_detail(
+                m, f + terms, bioguide_id
+            ),
+        )
+
+    print(f"{'route':<36} {'orm us':>9} {'store us':>9} {'saved':>7}")
+    for chamber in chambers:
+        for url in (f"/api/{chamber}/", f"/api/{chamber}/{rng.choice(ids[chamber])}"):
+            orm_url = url.replace("/api/", "/orm/", 1)
+            assert client.get(url).get_data() == client.get(orm_url).get_data(), (
+                f"{url} bodies differ"
+            )
+            orm_us = cpu_per_call(lambda u=orm_url: client.get(u), args.iterations)
+            store_us = cpu_per_call(lambda u=url: client.get(u), args.iterations)
+            print(
+                f"{url:<36} {orm_us:>9.0f} {store_us:>9.0f} {1 - store_us / orm_us:>6.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
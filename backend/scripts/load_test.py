@@ -0,0 +1,413 @@
+"""
+Load-test the API routes offline and report per-route latency percentiles.
+
+Spins up the local Congress.gov stand-in, seeds a throwaway SQLite database from
+legislators-current.yaml, starts the app under gunicorn (or the Werkzeug server
+if gunicorn is unavailable) and replays a weighted traffic mix from concurrent
+clients. Throughput and p50/p95/p99 latency per route, plus worker memory on
+Linux, are printed and saved as JSON so runs can be compared.
+
+Usage (from backend/):
+    python -m scripts.load_test --duration 30 --concurrency 16 --workers 2
+    python -m scripts.load_test --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import UTC, date, datetime
+
+import requests
+import yaml
+
+from external_api.stub_server import LEGISLATORS_FILE, StubData, serve_in_thread
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (weight, route label) - mostly roster lists, member details and bill actions
+TRAFFIC_MIX = [
+    (20, "/api/senators/"),
+    (20, "/api/representatives/"),
+    (5, "/api/senators/<bioguide_id>"),
+    (5, "/api/representatives/<bioguide_id>"),
+    (30, "/api/members/<bioguide_id>"),
+    (15, "/api/congress/bills/<congress>/<bill_type>/<bill_number>/actions"),
+    (3, "/api/congress/bills"),
+    (2, "/api/congress/current"),
+]
+
+BILL_TYPES = ["hr", "s"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(db_path: str) -> dict[str, list[str]]:
+    """
+    Create the roster tables and fill them from legislators-current.yaml.
+
+    Returns:
+        Bioguide IDs by chamber: {'senators': [...], 'representatives': [...]}.
+    """
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    # Imported here so DATABASE_URL is set before Config reads it
+    from app import create_app, db
+    from app.invalidation import publish_dataset
+    from app.models import Representative, Senator
+
+    with open(LEGISLATORS_FILE) as f:
+        legislators = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    ids = {"senators": [], "representatives": []}
+    app = create_app()
+    with app.app_context():
+        for seat, leg in enumerate(legislators, start=1):
+            term = leg["terms"][-1]
+            common = {
+                "bioguide_id": leg["id"]["bioguide"],
+                "full_name": leg["name"].get("official_full", leg["name"]["last"]),
+                "last_name": leg["name"]["last"],
+                "state": term["state"],
+                "party": term["party"],
+                "photo_url": StubData._image_url(leg["id"]["bioguide"]),
+                "term_start": date.fromisoformat(term["start"]),
+                "term_end": date.fromisoformat(term["end"]),
+            }
+            if term["type"] == "sen":
+                db.session.add(Senator(seat_number=seat % 100 + 1, **common))
+                ids["senators"].append(common["bioguide_id"])
+            else:
+                db.session.add(Representative(district=int(term["district"]), **common))
+                ids["representatives"].append(common["bioguide_id"])
+        publish_dataset(db.session, source="load_test")
+        db.session.commit()
+    return ids
+
+
+def start_app(port: int, env: dict, workers: int, threads: int) -> subprocess.Popen:
+    """Start the app in a subprocess, preferring gunicorn."""
+    try:
+        import gunicorn  # noqa: F401
+
+        cmd = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+            "--threads",
+            str(threads),
+            "--config",
+            "gunicorn.conf.py",
+            "--log-level",
+            "warning",
+            "run:app",
+        ]
+    except ImportError:
+        print("gunicorn not installed; using the threaded Werkzeug server")
+        cmd = [
+            sys.executable,
+            "-c",
+            f"from run import app; app.run(port={port}, threaded=True)",
+        ]
+    return subprocess.Popen(cmd, cwd=backend_dir, env=env)
+
+
+def wait_for(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"App did not become healthy at {url}")
+
+
+class TrafficMix:
+    """Draws requests from TRAFFIC_MIX with a skew towards popular members."""
+
+    def __init__(self, ids: dict[str, list[str]], congress: int, seed: int):
+        self.ids = ids
+        self.members = ids["senators"] + ids["representatives"]
+        self.congress = congress
+        self.rng = random.Random(seed)
+        self.weights = [weight for weight, _ in TRAFFIC_MIX]
+        self.routes = [route for _, route in TRAFFIC_MIX]
+
+    def _popular(self, population: list[str]) -> str:
+        # Pareto-ish: a small set of members gets most page views
+        index = min(int(self.rng.paretovariate(1.2)) - 1, len(population) - 1)
+        return population[index]
+
+    def next(self) -> tuple[str, str]:
+        """Return (route label, concrete path) for the next request."""
+        route = self.rng.choices(self.routes, self.weights)[0]
+        if route == "/api/senators/<bioguide_id>":
+            path = f"/api/senators/{self._popular(self.ids['senators'])}"
+        elif route == "/api/representatives/<bioguide_id>":
+            path = f"/api/representatives/{self._popular(self.ids['representatives'])}"
+        elif route == "/api/members/<bioguide_id>":
+            path = f"/api/members/{self._popular(self.members)}"
+        elif "<bill_type>" in route:
+            bill_type = self.rng.choice(BILL_TYPES)
+            number = min(int(self.rng.paretovariate(1.0)), 500)
+            path = f"/api/congress/bills/{self.congress}/{bill_type}/{number}/actions"
+        else:
+            path = route
+        return route, path
+
+
+def run_load(
+    base_url: str,
+    mix: TrafficMix,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> tuple[dict[str, list], float]:
+    """
+    Drive closed-loop load from `concurrency` clients.
+
+    Returns:
+        ({route: [(status, latency seconds, bytes), ...]}, measured seconds).
+    """
+    samples: dict[str, list] = {route: [] for _, route in TRAFFIC_MIX}
+    lock = threading.Lock()
+    started = time.monotonic()
+    measure_from = started + warmup
+    stop_at = measure_from + duration
+
+    def client():
+        session = requests.Session()
+        while True:
+            with lock:
+                route, path = mix.next()
+            t0 = time.monotonic()
+            if t0 >= stop_at:
+                return
+            try:
+                response = session.get(f"{base_url}{path}", timeout=30)
+                status, size = response.status_code, len(response.content)
+            except requests.RequestException:
+                status, size = 0, 0
+            t1 = time.monotonic()
+            if t0 >= measure_from:
+                with lock:
+                    samples[route].append((status, t1 - t0, size))
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, duration
+
+
+def worker_memory(master_pid: int) -> dict | None:
+    """
+    RSS, PSS and USS (MiB) of the server's worker processes, read from
+    /proc/<pid>/smaps_rollup. PSS splits shared pages between the processes
+    mapping them, so its sum is the real footprint. None if unavailable.
+    """
+    workers = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; the command name may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            if ppid != master_pid:
+                continue
+            fields = {}
+            with open(f"/proc/{entry}/smaps_rollup") as f:
+                for line in f:
+                    name, _, rest = line.partition(":")
+                    if rest.strip().endswith("kB"):
+                        fields[name] = int(rest.split()[0]) / 1024
+        except (OSError, ValueError, IndexError):
+            continue
+        workers.append(
+            {
+                "rss": fields.get("Rss", 0.0),
+                "pss": fields.get("Pss", 0.0),
+                "uss": fields.get("Private_Clean", 0.0)
+                + fields.get("Private_Dirty", 0.0),
+            }
+        )
+    if not workers:
+        return None
+    return {
+        "workers": len(workers),
+        "rss_mib_per_worker": sum(w["rss"] for w in workers) / len(workers),
+        "uss_mib_per_worker": sum(w["uss"] for w in workers) / len(workers),
+        "pss_mib_total": sum(w["pss"] for w in workers),
+    }
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def summarize(samples: dict[str, list], seconds: float) -> dict:
+    """Per-route and overall throughput and latency percentiles (ms)."""
+
+    def stats(rows: list) -> dict:
+        latencies = sorted(latency for _, latency, _ in rows)
+        errors = sum(1 for status, _, _ in rows if status == 0 or status >= 500)
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "throughput_rps": len(rows) / seconds if seconds else 0.0,
+            "mean_ms": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_ms": 1000 * percentile(latencies, 50),
+            "p95_ms": 1000 * percentile(latencies, 95),
+            "p99_ms": 1000 * percentile(latencies, 99),
+            "max_ms": 1000 * latencies[-1] if latencies else 0.0,
+            "mean_bytes": sum(size for _, _, size in rows) / len(rows) if rows else 0.0,
+        }
+
+    routes = {route: stats(rows) for route, rows in samples.items() if rows}
+    overall = stats([row for rows in samples.values() for row in rows])
+    return {"routes": routes, "overall": overall}
+
+
+def print_report(summary: dict, baseline: dict | None = None):
+    header = f"{'route':<66} {'req':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["routes"].items()) + [("overall", summary["overall"])]
+    for route, s in rows:
+        line = (
+            f"{route:<66} {s['requests']:>6} {s['errors']:>4} {s['throughput_rps']:>8.1f} "
+            f"{s['p50_ms']:>8.1f} {s['p95_ms']:>8.1f} {s['p99_ms']:>8.1f}"
+        )
+        base = (
+            baseline["overall"]
+            if baseline and route == "overall"
+            else (baseline or {}).get("routes", {}).get(route)
+        )
+        if base and base["p95_ms"]:
+            line += f"   p95 {100 * (s['p95_ms'] / base['p95_ms'] - 1):+.0f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Unmeasured seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=1, help="Threads per worker")
+    parser.add_argument("--upstream-latency-ms", type=float, default=60.0)
+    parser.add_argument("--upstream-jitter-ms", type=float, default=40.0)
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--label", default="", help="Free-form label stored in the results"
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra environment for the app (repeatable), e.g. to toggle features",
+    )
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="civiliscope-load-")
+    db_path = os.path.join(workdir, "load.db")
+    print(f"Seeding {db_path}...")
+    ids = seed_database(db_path)
+
+    stub = serve_in_thread(
+        data=StubData(seed=args.seed),
+        latency_ms=args.upstream_latency_ms,
+        jitter_ms=args.upstream_jitter_ms,
+        error_rate=args.upstream_error_rate,
+        seed=args.seed,
+    )
+    port = free_port()
+    env = os.environ | {
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "FRONTEND_URL": "http://localhost:3000",
+        "CONGRESS_API_KEY": "stub",
+        "CONGRESS_API_BASE_URL": stub.base_url,
+        # The shared quota limiter would dominate the numbers; benchmark the app
+        "CONGRESS_API_RATE_LIMIT_BACKEND": "none",
+        "GUNICORN_THREADS": str(args.threads),
+        "PROMETHEUS_MULTIPROC_DIR": os.path.join(workdir, "metrics"),
+    }
+    env |= dict(item.split("=", 1) for item in args.env)
+
+    server = start_app(port, env, args.workers, args.threads)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_for(f"{base_url}/health")
+        mix = TrafficMix(ids, stub.data.congress, args.seed)
+        print(
+            f"Running {args.concurrency} clients for {args.duration:.0f}s "
+            f"(+{args.warmup:.0f}s warmup) against {base_url}"
+        )
+        samples, seconds = run_load(
+            base_url, mix, args.concurrency, args.duration, args.warmup
+        )
+        memory = worker_memory(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        stub.shutdown()
+        stub.server_close()
+
+    summary = summarize(samples, seconds)
+    results = {
+        "label": args.label,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "config": {
+            k: v for k, v in vars(args).items() if k not in ("output", "compare")
+        },
+        "upstream_requests": stub.requests_served,
+        "worker_memory": memory,
+        **summary,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print()
+    print_report(summary, baseline)
+    if memory:
+        print(
+            f"\n{memory['workers']} workers: RSS {memory['rss_mib_per_worker']:.1f} MiB "
+            f"and USS {memory['uss_mib_per_worker']:.1f} MiB each, "
+            f"PSS {memory['pss_mib_total']:.1f} MiB total"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
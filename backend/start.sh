@@ -3,8 +3,28 @@
 echo "Environment: $FLASK_ENV"
 
 echo "Running legislator ingestion..."
-python -m data_ingestion.parse_legislators
+# Skipped when the last run is younger than ROSTER_SYNC_INTERVAL (see app/scheduler.py)
+python -m data_ingestion.scheduler --once roster
+
+# Workers keep the roster, photos and bill actions fresh from here on; a lease
+# in the database lets only one of them run each job
+export SCHEDULER_ENABLED="${SCHEDULER_ENABLED:-true}"
 
 echo "Starting Flask app with Gunicorn..."
-exec gunicorn --bind 0.0.0.0:5000 --timeout 300 --workers 2 run:app
+# Workers share metrics through this directory so /metrics covers all of them
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/civiliscope-metrics}"
+# gevent serves each /api/stream/updates client from a greenlet; a sync worker
+# would be tied up by one stream and killed by --timeout while it is held
+export GUNICORN_WORKER_CLASS="${GUNICORN_WORKER_CLASS:-gevent}"
+# Workers size their SQLite and Congress.gov connection pools from
+# GUNICORN_THREADS (app/config.py, external_api/services.py). gevent ignores
+# --threads, so its greenlets share a SQLite pool of 4 unless sized explicitly.
+if [ "$GUNICORN_WORKER_CLASS" = "gevent" ]; then
+    export SQLITE_POOL_SIZE="${SQLITE_POOL_SIZE:-4}"
+fi
+export GUNICORN_THREADS="${GUNICORN_THREADS:-1}"
+# GUNICORN_PRELOAD=true loads the app once in the master (see gunicorn.conf.py)
+exec gunicorn --config gunicorn.conf.py --bind 0.0.0.0:5000 --timeout 300 \
+    --workers "${GUNICORN_WORKERS:-2}" \
+    --threads "$GUNICORN_THREADS" run:app
 
@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration.
+"""
+
+import os
+
+# App tests run against an in-memory database; set before app.config is imported
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
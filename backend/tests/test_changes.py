@@ -0,0 +1,117 @@
+"""
+Offline tests for the roster change feed.
+"""
+
+from datetime import date
+
+import pytest
+
+from app import create_app, db
+from app.changes import record_changes, roster_snapshot
+from app.config import Config
+from app.invalidation import publish_dataset
+from app.models import Representative, Senator
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def senator(bioguide_id, party="Independent", seat_number=1):
+    return Senator(
+        bioguide_id=bioguide_id,
+        full_name=f"Test {bioguide_id}",
+        last_name=bioguide_id,
+        state="VT",
+        party=party,
+        seat_number=seat_number,
+        term_start=date(2025, 1, 3),
+        term_end=date(2031, 1, 3),
+    )
+
+
+def ingest(app, legislators, retention=100) -> int:
+    """Rewrite the rosters the way data_ingestion.parse_legislators does."""
+    with app.app_context():
+        before = roster_snapshot(db.session)
+        Senator.query.delete()
+        Representative.query.delete()
+        db.session.add_all(legislators)
+        version = publish_dataset(db.session, source="test")
+        record_changes(db.session, version, before, retention)
+        db.session.commit()
+    return version
+
+
+class TestChangeFeed:
+    """Test recorded diffs, the since= query and compaction."""
+
+    def test_field_level_changes(self, app):
+        client = app.test_client()
+        ingest(app, [senator("S000001"), senator("S000002")])
+        ingest(app, [senator("S000001", party="Democrat"), senator("S000003")])
+
+        feed = client.get("/api/legislators/changes?since=1").get_json()
+
+        assert feed["since"] == 1 and feed["version"] == 2
+        by_id = {c["bioguide_id"]: c for c in feed["changes"]}
+        assert by_id["S000001"]["op"] == "update"
+        assert by_id["S000001"]["fields"] == {"party": "Democrat"}
+        assert by_id["S000002"] == {
+            "version": 2,
+            "chamber": "senators",
+            "bioguide_id": "S000002",
+            "op": "delete",
+            "fields": None,
+        }
+        assert by_id["S000003"]["op"] == "insert"
+        # Inserts look exactly like the detail route
+        assert (
+            by_id["S000003"]["fields"] == client.get("/api/senators/S000003").get_json()
+        )
+
+    def test_unchanged_ingest_and_current_poll_are_empty(self, app):
+        client = app.test_client()
+        ingest(app, [senator("S000001")])
+        ingest(app, [senator("S000001")])
+
+        assert client.get("/api/legislators/changes?since=1").get_json() == {
+            "since": 1,
+            "version": 2,
+            "changes": [],
+        }
+        assert (
+            client.get("/api/legislators/changes?since=2").get_json()["changes"] == []
+        )
+        assert (
+            len(client.get("/api/legislators/changes?since=0").get_json()["changes"])
+            == 1
+        )
+
+    def test_compacted_history_requires_resync(self, app):
+        client = app.test_client()
+        for party in ("A", "B", "C", "D"):
+            ingest(app, [senator("S000001", party=party)], retention=2)
+
+        gone = client.get("/api/legislators/changes?since=1")
+        recent = client.get("/api/legislators/changes?since=2").get_json()
+
+        assert gone.status_code == 410
+        assert gone.get_json()["compacted_through"] == 2
+        assert [c["fields"] for c in recent["changes"]] == [
+            {"party": "C"},
+            {"party": "D"},
+        ]
+
+    @pytest.mark.parametrize("query", ["", "?since=x", "?since=-1"])
+    def test_since_is_required(self, app, query):
+        response = app.test_client().get(f"/api/legislators/changes{query}")
+        assert response.status_code == 400
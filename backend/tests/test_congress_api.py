@@ -0,0 +1,435 @@
+"""
+Offline tests for the Congress.gov client's timeout, deadline and retry policy.
+Upstream responses are mocked with the `responses` library.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import responses
+
+from external_api import congress_api, services, telemetry
+from external_api.circuit_breaker import CircuitBreaker, CircuitOpenError
+from external_api.congress_api import CongressAPI
+from external_api.deadline import Deadline, DeadlineExceeded
+from external_api.fallback import reset_staleness, staleness
+from external_api.http_pool import PooledHTTPAdapter
+from external_api.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    MemoryBackend,
+    RateLimiter,
+    RateLimitExceeded,
+    SQLiteBackend,
+)
+
+MEMBER_URL = f"{CongressAPI.BASE_URL}/member/A000055"
+
+
+@pytest.fixture
+def api():
+    return CongressAPI(
+        api_key="test-key",
+        max_retries=2,
+        rate_limiter=RateLimiter(MemoryBackend()),
+    )
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of actually sleeping."""
+    recorded = []
+    monkeypatch.setattr(congress_api.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestRetries:
+    """Test retry and backoff behavior of CongressAPI._get."""
+
+    @responses.activate
+    def test_retries_on_5xx_then_succeeds(self, api, sleeps):
+        responses.get(MEMBER_URL, status=503)
+        responses.get(MEMBER_URL, json={"member": {"bioguideId": "A000055"}})
+
+        data = api.get_member("A000055")
+
+        assert data["member"]["bioguideId"] == "A000055"
+        assert len(responses.calls) == 2
+        assert len(sleeps) == 1
+        assert 0 <= sleeps[0] <= CongressAPI.BACKOFF_BASE
+
+    @responses.activate
+    def test_honors_retry_after(self, api, sleeps):
+        responses.get(MEMBER_URL, status=429, headers={"Retry-After": "3"})
+        responses.get(MEMBER_URL, json={"member": {}})
+
+        api.get_member("A000055")
+
+        assert sleeps == [3.0]
+
+    @responses.activate
+    def test_gives_up_after_max_retries(self, api, sleeps):
+        responses.get(MEMBER_URL, status=502)
+
+        assert api.get_member("A000055") is None
+        assert len(responses.calls) == api.max_retries + 1
+        assert len(sleeps) == api.max_retries
+
+    @responses.activate
+    def test_does_not_retry_client_errors(self, api, sleeps):
+        responses.get(MEMBER_URL, status=404)
+
+        assert api.get_member("A000055") is None
+        assert len(responses.calls) == 1
+        assert sleeps == []
+
+    @responses.activate
+    def test_retry_after_beyond_backoff_cap_fails_fast(self, api, sleeps):
+        responses.get(MEMBER_URL, status=429, headers={"Retry-After": "3600"})
+
+        with pytest.raises(requests.HTTPError):
+            api._get("/member/A000055")
+        assert sleeps == []
+
+    @responses.activate
+    def test_passes_timeouts(self, api):
+        responses.get(MEMBER_URL, json={"member": {}})
+
+        api.get_member("A000055")
+
+        assert responses.calls[0].request.req_kwargs["timeout"] == (
+            api.connect_timeout,
+            api.read_timeout,
+        )
+
+
+class TestDeadline:
+    """Test that the request deadline bounds timeouts and retries."""
+
+    def test_expired_deadline_skips_request(self, api):
+        with pytest.raises(DeadlineExceeded):
+            api._get("/member/A000055", deadline=Deadline(0))
+
+    @responses.activate
+    def test_timeout_clipped_to_deadline(self, api):
+        responses.get(MEMBER_URL, json={"member": {}})
+
+        api.get_member("A000055", deadline=Deadline(1.0))
+
+        connect, read = responses.calls[0].request.req_kwargs["timeout"]
+        assert connect <= 1.0
+        assert read <= 1.0
+
+    @responses.activate
+    def test_no_retry_past_deadline(self, api, sleeps):
+        responses.get(MEMBER_URL, status=503, headers={"Retry-After": "5"})
+
+        with pytest.raises(DeadlineExceeded):
+            api._get("/member/A000055", deadline=Deadline(2.0))
+        assert len(responses.calls) == 1
+        assert sleeps == []
+
+    @responses.activate
+    def test_deadline_does_not_count_against_upstream(self, api, sleeps):
+        responses.get(MEMBER_URL, status=503)
+        api.breaker._transition(CircuitBreaker.HALF_OPEN)
+
+        with pytest.raises(DeadlineExceeded):
+            api._get("/member/A000055", deadline=Deadline(0.01))
+        # The probe was released without being recorded as a failure
+        assert api.breaker.state == CircuitBreaker.HALF_OPEN
+        assert api.breaker._probes_in_flight == 0
+
+
+class TestCircuitBreaker:
+    """Test the rolling-window circuit breaker state machine."""
+
+    def make_breaker(self, **kwargs):
+        defaults = {"min_calls": 4, "failure_rate_threshold": 0.5, "close_after": 2}
+        return CircuitBreaker(**(defaults | kwargs))
+
+    def test_opens_on_failure_rate(self):
+        breaker = self.make_breaker()
+        for ok in (True, False, True, False):
+            breaker.before_call()
+            breaker.record(ok, 0.01)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        assert breaker.snapshot()["rejected_calls"] == 1
+
+    def test_opens_on_slow_calls(self):
+        breaker = self.make_breaker(slow_call_seconds=1.0, slow_rate_threshold=0.75)
+        for _ in range(4):
+            breaker.before_call()
+            breaker.record(True, 2.0)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_trickle_then_close(self):
+        breaker = self.make_breaker(open_seconds=0)
+        breaker._transition(CircuitBreaker.OPEN)
+
+        breaker.before_call()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        # Only one probe may be in flight at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record(True, 0.01)
+        breaker.before_call()
+        breaker.record(True, 0.01)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        breaker = self.make_breaker(open_seconds=0)
+        breaker._transition(CircuitBreaker.OPEN)
+
+        breaker.before_call()
+        breaker.open_seconds = 60
+        breaker.record(False, 0.01)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    @responses.activate
+    def test_local_waits_are_not_slow_calls(self, api, monkeypatch):
+        responses.get(MEMBER_URL, status=503, headers={"Retry-After": "0.2"})
+        responses.get(MEMBER_URL, json={"member": {}})
+        acquire = api.rate_limiter.acquire
+
+        def queued_acquire(*args, **kwargs):
+            threading.Event().wait(0.2)  # waiting behind other callers
+            return acquire(*args, **kwargs)
+
+        monkeypatch.setattr(api.rate_limiter, "acquire", queued_acquire)
+        api.breaker.slow_call_seconds = 0.1
+
+        api.get_member("A000055")
+        assert api.breaker.snapshot()["window_calls"] == 1
+        assert api.breaker.snapshot()["window_slow_rate"] == 0.0
+
+    def test_unexpected_errors_release_the_probe(self, api, monkeypatch):
+        api.breaker.open_seconds = 0
+        api.breaker._transition(CircuitBreaker.OPEN)
+        monkeypatch.setattr(api, "_get_with_retries", lambda *a, **kw: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            api._get("/member/A000055")
+        assert api.breaker.state == CircuitBreaker.HALF_OPEN
+        assert api.breaker._probes_in_flight == 0
+
+
+class TestStaleFallback:
+    """Test last-known-good fallback when the upstream is failing."""
+
+    @responses.activate
+    def test_serves_stale_when_circuit_open(self, api):
+        responses.get(MEMBER_URL, json={"member": {"bioguideId": "A000055"}})
+        reset_staleness()
+        api.get_member("A000055")
+        api.breaker._transition(CircuitBreaker.OPEN)
+
+        data = api.get_member("A000055")
+
+        assert data["member"]["bioguideId"] == "A000055"
+        assert len(responses.calls) == 1
+        assert staleness() is not None
+
+    @responses.activate
+    def test_fails_fast_without_fallback(self, api):
+        api.breaker._transition(CircuitBreaker.OPEN)
+
+        assert api.get_member("A000055") is None
+        assert len(responses.calls) == 0
+
+    @responses.activate
+    def test_not_found_is_not_masked_by_stale_data(self, api, sleeps):
+        responses.get(MEMBER_URL, json={"member": {}})
+        responses.get(MEMBER_URL, status=404)
+        api.get_member("A000055")
+
+        assert api.get_member("A000055") is None
+
+
+class TestTelemetry:
+    """Test per-call upstream instrumentation."""
+
+    @pytest.fixture
+    def calls(self):
+        recorded = []
+        telemetry.add_listener(recorded.append)
+        yield recorded
+        telemetry.remove_listener(recorded.append)
+
+    @responses.activate
+    def test_records_template_status_size_and_quota(self, api, sleeps, calls):
+        responses.get(MEMBER_URL, status=503)
+        responses.get(
+            MEMBER_URL,
+            json={"member": {"bioguideId": "A000055"}},
+            headers={"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4321"},
+        )
+        telemetry.reset_upstream_time()
+
+        api.get_member("A000055")
+
+        (call,) = calls
+        assert call.endpoint == "/member/{bioguideId}"
+        assert call.status == "200"
+        assert call.retries == 1
+        assert call.bytes_received == len(responses.calls[1].response.content)
+        assert (call.ratelimit_limit, call.ratelimit_remaining) == (5000, 4321)
+        assert telemetry.upstream_time() == (call.seconds, 1)
+
+    @responses.activate
+    def test_records_errors_without_response(self, api, calls):
+        api.breaker._transition(CircuitBreaker.OPEN)
+
+        api.get_member("A000055")
+
+        assert calls[0].status == "CircuitOpenError"
+        assert calls[0].bytes_received == 0
+
+    def test_endpoint_template_collapses_ids(self):
+        assert (
+            telemetry.endpoint_template("/bill/119/hr/1/actions")
+            == "/bill/{n}/hr/{n}/actions"
+        )
+        assert telemetry.endpoint_template("/member/A000055") == "/member/{n}"
+
+
+class TestRateLimiter:
+    """Test the shared token bucket and its priority classes."""
+
+    @pytest.fixture(params=["memory", "sqlite"])
+    def backend(self, request, tmp_path):
+        if request.param == "memory":
+            return MemoryBackend()
+        return SQLiteBackend(str(tmp_path / "ratelimit.db"))
+
+    def test_burst_then_reject_interactive_with_deadline(self, backend):
+        limiter = RateLimiter(backend, hourly_limit=3610, burst=10)
+
+        for _ in range(10):
+            limiter.acquire(INTERACTIVE)
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire(INTERACTIVE, deadline=Deadline(0.1))
+
+        assert limiter.snapshot()["acquired"][INTERACTIVE] == 10
+
+    def test_background_cannot_use_interactive_reserve(self, backend):
+        limiter = RateLimiter(backend, hourly_limit=3610, burst=10)
+
+        for _ in range(5):
+            limiter.acquire(BACKGROUND)
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire(BACKGROUND, deadline=Deadline(0.1))
+        # Interactive callers can still drain the reserved half
+        for _ in range(5):
+            limiter.acquire(INTERACTIVE)
+
+    def test_buckets_are_shared_across_backend_instances(self, tmp_path):
+        path = str(tmp_path / "ratelimit.db")
+        first = RateLimiter(SQLiteBackend(path), hourly_limit=3610, burst=2)
+        second = RateLimiter(SQLiteBackend(path), hourly_limit=3610, burst=2)
+
+        first.acquire(INTERACTIVE)
+        second.acquire(INTERACTIVE)
+        with pytest.raises(RateLimitExceeded):
+            first.acquire(INTERACTIVE, deadline=Deadline(0.1))
+
+    @responses.activate
+    def test_upstream_remaining_header_clamps_bucket(self, api):
+        responses.get(
+            MEMBER_URL, json={"member": {}}, headers={"X-RateLimit-Remaining": "3"}
+        )
+
+        api.get_member("A000055")
+
+        assert api.rate_limiter.snapshot()["tokens"] < 4
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"member": {}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool:
+    """Test keep-alive reuse through the shared, instrumented pool."""
+
+    @pytest.fixture
+    def server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def test_connections_are_reused(self, api, server):
+        api.BASE_URL = server
+
+        for _ in range(5):
+            api.get_member("A000055")
+
+        stats = api.pool_stats.snapshot()
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+
+    def test_threads_share_the_pool(self, api, server):
+        api.BASE_URL = server
+        threads = [
+            threading.Thread(target=api.get_member, args=("A000055",)) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = api.pool_stats.snapshot()
+        assert stats["connections_opened"] <= 4
+        assert stats["connections_opened"] + stats["connections_reused"] == 8
+
+    def test_exhausted_pool_keeps_its_size(self, server):
+        adapter = PooledHTTPAdapter(1, checkout_timeout=0.05)
+        session = requests.Session()
+        session.trust_env = False  # a CA bundle from the environment keys another pool
+        session.mount("http://", adapter)
+        pool = adapter.get_connection_with_tls_context(
+            requests.Request("GET", server).prepare(), verify=True
+        )
+        held = pool._get_conn()
+
+        with pytest.raises(requests.ConnectionError):
+            session.get(server)
+        assert adapter.stats.snapshot()["pool_exhausted"] == 1
+
+        # No extra slot was returned for the failed checkout
+        pool._put_conn(held)
+        assert pool.pool.qsize() == 1
+        assert session.get(server).status_code == 200
+
+    def test_pool_fits_threads_page_fetches_and_scheduler(self, monkeypatch):
+        monkeypatch.delenv("CONGRESS_API_POOL_SIZE", raising=False)
+        monkeypatch.setenv("GUNICORN_THREADS", "1")
+        assert services._pool_size() == 1 + CongressAPI.PAGE_CONCURRENCY + 1
+
+        api = CongressAPI(api_key="test-key", rate_limiter=None, pool_size=2)
+        calls = []
+        monkeypatch.setattr(
+            congress_api, "paginate", lambda *args, **kwargs: calls.append(kwargs)
+        )
+        api.paginate("/member", "members", concurrency=4)
+        assert calls[0]["concurrency"] == 2
@@ -0,0 +1,143 @@
+"""
+Offline tests for the SQLite connection tuning layer.
+"""
+
+import os
+from datetime import date
+
+import pytest
+import sqlalchemy as sa
+
+from app import create_app, db
+from app.config import Config
+from app.database import MEMORY_REPLICA, READONLY_ENGINE
+from app.invalidation import publish_dataset
+from app.models import Senator
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    app.extensions[READONLY_ENGINE].dispose()
+
+
+def add_senator(bioguide_id: str):
+    db.session.add(
+        Senator(
+            bioguide_id=bioguide_id,
+            full_name="Test Senator",
+            last_name="Senator",
+            state="VT",
+            party="Independent",
+            seat_number=1,
+            term_start=date(2025, 1, 3),
+        )
+    )
+    publish_dataset(db.session, source="test")
+    db.session.commit()
+
+
+class TestSQLiteTuning:
+    """Test pragmas, read-only request connections and the fallback."""
+
+    def test_pragmas_applied(self, app):
+        with app.app_context(), db.engine.connect() as conn:
+            pragma = lambda name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()  # noqa: E731
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("mmap_size") == Config.SQLITE_MMAP_SIZE
+            assert pragma("cache_size") == -Config.SQLITE_CACHE_SIZE_KB
+
+    def test_requests_read_through_readonly_engine(self, app):
+        with app.app_context():
+            add_senator("S000001")
+
+        with app.test_request_context():
+            assert db.session.get_bind() is app.extensions[READONLY_ENGINE]
+            assert db.session.get(Senator, "S000001") is not None
+            with pytest.raises(sa.exc.OperationalError):
+                db.session.execute(sa.text("DELETE FROM senators"))
+            db.session.rollback()
+
+        response = app.test_client().get("/api/senators/S000001")
+        assert response.get_json()["state"] == "VT"
+
+    def test_writes_outside_requests_use_primary(self, app):
+        with app.app_context():
+            assert db.session.get_bind() is db.engine
+            add_senator("S000002")
+            assert Senator.query.count() == 1
+
+    def test_forked_child_opens_its_own_connections(self, app):
+        with app.app_context():
+            add_senator("S000005")
+            assert db.engine.pool.checkedin() >= 1
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            try:
+                with app.app_context():
+                    inherited = db.engine.pool.checkedin()
+                    ok = inherited == 0 and Senator.query.count() == 1
+                os._exit(0 if ok else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+
+    def test_tuning_can_be_disabled(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(Config, "SQLITE_TUNING", False)
+        monkeypatch.setattr(
+            Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'plain.db'}"
+        )
+        app = create_app()
+
+        assert READONLY_ENGINE not in app.extensions
+        with app.app_context(), db.engine.connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "delete"
+        with app.app_context():
+            db.engine.dispose()
+
+
+class TestMemoryReplica:
+    """Test request reads served from the per-worker in-memory copy."""
+
+    @pytest.fixture
+    def app(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+        )
+        monkeypatch.setattr(Config, "SQLITE_MEMORY_REPLICA", True)
+        monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+        app = create_app()
+        yield app
+        with app.app_context():
+            db.engine.dispose()
+
+    def test_reads_come_from_memory(self, app):
+        replica = app.extensions[MEMORY_REPLICA]
+
+        with app.test_request_context():
+            engine = db.session.get_bind()
+            assert engine is replica.engine
+            assert engine.url.database is None
+
+    def test_reloads_after_publish(self, app):
+        with app.test_request_context():
+            assert db.session.get(Senator, "S000003") is None
+
+        # Simulates ingest publishing from another process
+        with app.app_context():
+            add_senator("S000003")
+
+        with app.test_request_context():
+            assert db.session.get(Senator, "S000003") is not None
+        assert app.extensions[MEMORY_REPLICA].reloads >= 1
@@ -0,0 +1,56 @@
+"""
+Offline tests for dataset version publishing and the per-worker watcher.
+"""
+
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.invalidation import DATASET_WATCHER, current_dataset_version, publish_dataset
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+class TestDatasetVersion:
+    """Test the published version row and the throttled watcher."""
+
+    def test_publish_is_monotonic(self, app):
+        with app.app_context():
+            assert current_dataset_version() == 0
+            versions = []
+            for _ in range(3):
+                versions.append(publish_dataset(db.session, source="test"))
+                db.session.commit()
+
+            assert versions == [1, 2, 3]
+            assert current_dataset_version() == 3
+
+    def test_rolled_back_publish_is_invisible(self, app):
+        with app.app_context():
+            publish_dataset(db.session, source="test")
+            db.session.rollback()
+
+            assert current_dataset_version() == 0
+
+    def test_watcher_reads_at_most_every_interval(self, app):
+        watcher = app.extensions[DATASET_WATCHER]
+        watcher.check_seconds = 3600
+        watcher.current()
+
+        with app.app_context():
+            publish_dataset(db.session, source="test")
+            db.session.commit()
+
+        assert watcher.current() == 0
+        watcher._checked_at -= 3600
+        assert watcher.current() == 1
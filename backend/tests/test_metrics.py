@@ -0,0 +1,97 @@
+"""
+Offline tests for request instrumentation and the /metrics endpoint.
+"""
+
+import pytest
+import responses
+
+from app import create_app
+from external_api import services
+from external_api.congress_api import CongressAPI
+from external_api.rate_limiter import MemoryBackend, RateLimiter
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def sample(body: str, name: str, **labels) -> float:
+    """Value of the first sample of `name` whose labels include `labels`."""
+    wanted = [f'{key}="{value}"' for key, value in labels.items()]
+    for line in body.splitlines():
+        if line.startswith(name + "{") and all(w in line for w in wanted):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+class TestMetrics:
+    """Test per-route histograms, counters and the exposition format."""
+
+    def test_records_route_templates(self, client):
+        before = sample(
+            client.get("/metrics").get_data(as_text=True),
+            "http_requests_total",
+            route="/api/senators/<string:bioguide_id>",
+            status="404",
+        )
+
+        client.get("/api/senators/X000001")
+        client.get("/api/senators/X000002")
+
+        body = client.get("/metrics").get_data(as_text=True)
+        assert (
+            sample(
+                body,
+                "http_requests_total",
+                route="/api/senators/<string:bioguide_id>",
+                status="404",
+            )
+            == before + 2
+        )
+        assert "X000001" not in body
+
+    def test_latency_and_size_histograms(self, client):
+        client.get("/api/representatives/")
+
+        body = client.get("/metrics").get_data(as_text=True)
+        labels = {"blueprint": "representatives", "route": "/api/representatives/"}
+        assert sample(body, "http_request_duration_seconds_count", **labels) >= 1
+        assert sample(body, "http_response_size_bytes_count", **labels) >= 1
+
+    def test_in_flight_returns_to_zero(self, client):
+        client.get("/health")
+
+        body = client.get("/metrics").get_data(as_text=True)
+        assert sample(body, "http_requests_in_flight", blueprint="app") <= 1
+
+    @responses.activate
+    def test_upstream_calls_and_server_timing(self, client, monkeypatch):
+        api = CongressAPI(api_key="test-key", rate_limiter=RateLimiter(MemoryBackend()))
+        monkeypatch.setattr(services, "_api", api)
+        responses.get(
+            f"{CongressAPI.BASE_URL}/member/A000055",
+            json={"member": {"bioguideId": "A000055"}},
+            headers={"X-RateLimit-Remaining": "4999"},
+        )
+
+        response = client.get("/api/members/A000055")
+
+        assert response.headers["Server-Timing"].startswith("upstream;dur=")
+        body = client.get("/metrics").get_data(as_text=True)
+        labels = {"endpoint": "/member/{bioguideId}", "status": "200"}
+        assert sample(body, "upstream_requests_total", **labels) >= 1
+        assert sample(body, "upstream_ratelimit_remaining", header="remaining") == 4999
+        assert sample(body, "upstream_circuit_breaker_state") == 0
+        assert "A000055" not in body
+
+    def test_no_server_timing_without_upstream_calls(self, client):
+        assert "Server-Timing" not in client.get("/health").headers
+
+    def test_content_type(self, client):
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
@@ -0,0 +1,102 @@
+"""
+Offline tests for the streaming Congress.gov paginator.
+"""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from external_api.pagination import paginate
+
+
+class FakeEndpoint:
+    """Serves `total` numbered items in offset/limit pages and records calls."""
+
+    def __init__(self, total: int, delay: float = 0.0, with_count: bool = True):
+        self.total = total
+        self.delay = delay
+        self.with_count = with_count
+        self.offsets = []
+        self.max_concurrent = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, offset: int, limit: int) -> dict:
+        with self._lock:
+            self.offsets.append(offset)
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        time.sleep(self.delay)
+        with self._lock:
+            self._active -= 1
+
+        items = [{"n": n} for n in range(offset, min(offset + limit, self.total))]
+        pagination = {}
+        if self.with_count:
+            pagination["count"] = self.total
+        if offset + limit < self.total:
+            pagination["next"] = f"?offset={offset + limit}"
+        return {"items": items, "pagination": pagination}
+
+
+class TestPaginate:
+    """Test ordering, fan-out and early termination of paginate()."""
+
+    def test_yields_all_items_in_order(self):
+        endpoint = FakeEndpoint(1010)
+
+        items = list(paginate(endpoint, "items", page_size=250, concurrency=3))
+
+        assert [item["n"] for item in items] == list(range(1010))
+        assert sorted(endpoint.offsets) == [0, 250, 500, 750, 1000]
+
+    def test_fans_out_pages_in_parallel(self):
+        endpoint = FakeEndpoint(2000, delay=0.05)
+
+        started = time.monotonic()
+        items = list(paginate(endpoint, "items", page_size=250, concurrency=7))
+        elapsed = time.monotonic() - started
+
+        assert len(items) == 2000
+
+        assert endpoint.max_concurrent > 1
+        # First page, then one parallel batch, not eight sequential round trips
+        assert elapsed < 8 * endpoint.delay
+
+    def test_is_lazy_and_stops_early(self):
+        endpoint = FakeEndpoint(10_000)
+
+        pages = paginate(endpoint, "items", page_size=100, concurrency=2)
+        first = [next(pages)["n"] for _ in range(150)]
+        pages.close()
+
+        assert first == list(range(150))
+        # Only the consumed pages plus the prefetch window were requested
+        assert len(endpoint.offsets) <= 4
+
+    def test_max_items(self):
+        endpoint = FakeEndpoint(1000)
+
+        items = list(paginate(endpoint, "items", page_size=250, max_items=300))
+
+        assert len(items) == 300
+        assert sorted(endpoint.offsets) == [0, 250]
+
+    def test_follows_next_without_count(self):
+        endpoint = FakeEndpoint(520, with_count=False)
+
+        items = list(paginate(endpoint, "items", page_size=250))
+
+        assert len(items) == 520
+        assert endpoint.offsets == [0, 250, 500]
+
+    def test_page_errors_propagate(self):
+        def fetch(offset, limit):
+            if offset:
+                raise requests.ConnectionError("boom")
+            return {"items": [{}] * limit, "pagination": {"count": 500}}
+
+        with pytest.raises(requests.ConnectionError):
+            list(paginate(fetch, "items", page_size=250))
@@ -0,0 +1,177 @@
+"""
+Offline tests for the member-data ingest, the committee API and the composite
+legislator profile.
+"""
+
+import threading
+from datetime import date
+
+import pytest
+import sqlalchemy as sa
+
+from app import create_app, db
+from app.committees import committee_detail, committees_of
+from app.config import Config
+from app.invalidation import publish_dataset
+from app.models import Committee, DistrictOffice, Representative
+from app.profiles import PROFILE_STORE
+from data_ingestion.parse_member_data import load_member_data
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+    app = create_app()
+    with app.app_context():
+        db.session.add(
+            Representative(
+                bioguide_id="A000055",
+                full_name="Robert B. Aderholt",
+                last_name="Aderholt",
+                state="AL",
+                district=4,
+                party="Republican",
+                term_start=date(2025, 1, 3),
+                term_end=date(2027, 1, 3),
+            )
+        )
+        app.loaded = load_member_data(db.session)
+        publish_dataset(db.session, source="test")
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    fetches = []
+
+    def get_member_details(bioguide_id, deadline):
+        fetches.append((bioguide_id, threading.current_thread().name))
+        if bioguide_id == "Z999999":
+            return None
+        return {"member": {"bioguideId": bioguide_id, "lastName": "Aderholt"}}
+
+    monkeypatch.setattr("app.upstream_cache.get_member_details", get_member_details)
+    return fetches
+
+
+class TestMemberData:
+    """Test loading committees, offices and social accounts."""
+
+    def test_loads_every_file(self, app):
+        assert all(app.loaded.values())
+        with app.app_context():
+            sub = db.session.get(Committee, "HSAP07")
+        assert sub.parent_id == "HSAP"
+        assert sub.chamber == "house"
+
+
+class TestCommittees:
+    """Test the committee routes and the indexes behind them."""
+
+    def test_routes(self, app):
+        client = app.test_client()
+        house = client.get("/api/committees/?chamber=house").get_json()
+        appropriations = next(c for c in house if c["thomas_id"] == "HSAP")
+        assert "HSAP07" in [s["thomas_id"] for s in appropriations["subcommittees"]]
+        assert all(c["chamber"] == "house" for c in house)
+
+        labor = client.get("/api/committees/hsap07").get_json()
+        assert labor["parent_id"] == "HSAP"
+        assert labor["members"][0]["title"] == "Chair"
+        parties = [m["party"] for m in labor["members"]]
+        assert parties == sorted(parties)  # majority first
+        assert client.get("/api/committees/HSAP").get_json()["subcommittees"]
+        assert client.get("/api/committees/XXXX").status_code == 404
+
+        assigned = client.get("/api/legislators/A000055/committees").get_json()
+        assert {c["thomas_id"] for c in assigned} == {
+            "HSAP",
+            "HSAP01",
+            "HSAP02",
+            "HSAP07",
+        }
+
+    def test_queries_use_indexes(self, app):
+        statements = []
+        with app.app_context():
+            sa.event.listen(
+                db.engine,
+                "before_cursor_execute",
+                lambda conn, cursor, statement, params, *_: statements.append(
+                    (statement, params)
+                ),
+            )
+            committee_detail(db.session, "HSAP")
+            committees_of(db.session, "A000055")
+            with db.engine.connect() as conn:
+                cursor = conn.connection.driver_connection
+                plans = [
+                    [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {s}", p)]
+                    for s, p in statements
+                ]
+
+        assert not any(step.startswith("SCAN") for plan in plans for step in plan)
+        assert any(
+            "COVERING INDEX ix_committee_memberships_member" in step
+            for step in plans[1]
+        )
+
+
+class TestProfile:
+    """Test assembling, caching and revalidating profiles."""
+
+    def test_assembles_every_part(self, app, fetches):
+        response = app.test_client().get("/api/legislators/A000055/profile")
+        assert response.status_code == 200
+        profile = response.get_json()
+
+        assert profile["chamber"] == "house"
+        assert profile["legislator"]["district"] == 4
+        assert [c["thomas_id"] for c in profile["committees"]] == [
+            "HSAP",
+            "HSAP01",
+            "HSAP02",
+            "HSAP07",
+        ]
+        assert profile["committees"][-1]["title"] == "Chair"
+        assert profile["offices"][0]["city"]
+        assert profile["social"]["twitter"] == {
+            "handle": "Robert_Aderholt",
+            "id": "76452765",
+        }
+        assert profile["member"]["lastName"] == "Aderholt"
+        # Congress.gov was read on a helper thread
+        assert fetches[0][1].startswith("profile")
+
+    def test_cached_until_a_part_changes(self, app, fetches):
+        client = app.test_client()
+        first = client.get("/api/legislators/A000055/profile")
+        assert client.get("/api/legislators/A000055/profile").data == first.data
+        assert (
+            client.get(
+                "/api/legislators/A000055/profile",
+                headers={"If-None-Match": first.headers["ETag"]},
+            ).status_code
+            == 304
+        )
+        assert app.extensions[PROFILE_STORE].stats()["profile"]["hits"] == 2
+
+        with app.app_context():
+            db.session.execute(sa.delete(DistrictOffice))
+            publish_dataset(db.session, source="test")
+            db.session.commit()
+
+        second = client.get("/api/legislators/A000055/profile")
+        assert second.get_json()["offices"] == []
+        assert second.headers["ETag"] != first.headers["ETag"]
+        assert len(fetches) == 1  # the member body was still fresh
+
+    def test_unknown_legislator(self, app, fetches):
+        response = app.test_client().get("/api/legislators/Z999999/profile")
+        assert response.status_code == 404
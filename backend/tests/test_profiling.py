@@ -0,0 +1,84 @@
+"""
+Offline tests for the opt-in request profiler.
+"""
+
+import pstats
+
+import pytest
+
+from app import create_app, profiling
+from app.config import Config
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(Config, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(Config, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(Config, "PROFILING_INTERVAL_MS", 1)
+    app = create_app()
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+class TestProfiling:
+    """Test request profiling in sampling and deterministic modes."""
+
+    def test_requests_without_token_are_not_profiled(self, client, tmp_path):
+        response = client.get("/api/senators/", headers={"X-Profile": "wrong"})
+
+        assert "X-Profile-File" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    def test_sampling_writes_folded_stacks(self, client, tmp_path):
+        response = client.get("/api/senators/", headers={"X-Profile": TOKEN})
+
+        name = response.headers["X-Profile-File"]
+        assert name.endswith(".folded")
+        for line in (tmp_path / name).read_text().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+            assert ";" in stack or ":" in stack
+
+    def test_cprofile_covers_the_view(self, client, tmp_path):
+        response = client.get(
+            "/api/senators/?state=VT",
+            headers={"X-Profile": TOKEN, "X-Profile-Mode": "cprofile"},
+        )
+
+        stats = pstats.Stats(str(tmp_path / response.headers["X-Profile-File"]))
+        functions = {name for _, _, name in stats.stats}
+        assert "get_all_senators" in functions
+        assert "dumps" in functions
+
+    def test_concurrent_cprofile_falls_back_to_sampling(self, client):
+        headers = {"X-Profile": TOKEN, "X-Profile-Mode": "cprofile"}
+        with profiling._cprofile_lock:
+            response = client.get("/api/senators/", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["X-Profile-File"].endswith(".folded")
+
+        response = client.get("/api/senators/", headers=headers)
+        assert response.headers["X-Profile-File"].endswith(".prof")
+        assert not profiling._cprofile_lock.locked()
+
+    def test_download_requires_token(self, client):
+        name = client.get("/health", headers={"X-Profile": TOKEN}).headers[
+            "X-Profile-File"
+        ]
+
+        assert client.get(f"/debug/profiles/{name}").status_code == 404
+        assert (
+            client.get(
+                f"/debug/profiles/{name}", headers={"X-Profile": TOKEN}
+            ).status_code
+            == 200
+        )
+
+    def test_disabled_registers_nothing(self, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILING_ENABLED", False)
+        app = create_app()
+
+        assert "download_profile" not in app.view_functions
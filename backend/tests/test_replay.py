@@ -0,0 +1,118 @@
+"""
+Offline tests for the record/replay fixture layer and the local Congress.gov
+stand-in server.
+"""
+
+import pytest
+
+from external_api.congress_api import CongressAPI
+from external_api.rate_limiter import MemoryBackend, RateLimiter
+from external_api.replay import (
+    RECORD,
+    REPLAY,
+    FixtureStore,
+    RecordReplayAdapter,
+)
+from external_api.stub_server import StubData, serve_in_thread
+
+
+@pytest.fixture(scope="module")
+def stub_data():
+    return StubData(bill_count=600)
+
+
+@pytest.fixture
+def stub(stub_data):
+    server = serve_in_thread(data=stub_data)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_api(base_url: str, **kwargs) -> CongressAPI:
+    api = CongressAPI(
+        api_key="stub", rate_limiter=RateLimiter(MemoryBackend()), **kwargs
+    )
+    api.BASE_URL = base_url
+    return api
+
+
+class TestStubServer:
+    """Test the stand-in's endpoints, pagination and fault injection."""
+
+    def test_current_members_are_paginated(self, stub, stub_data):
+        api = make_api(stub.base_url)
+
+        members = api.get_current_members()
+
+        assert len(members) == len(stub_data.members)
+        assert len({m["bioguideId"] for m in members}) == len(members)
+
+    def test_member_detail_and_not_found(self, stub, stub_data):
+        api = make_api(stub.base_url)
+        bioguide_id = next(iter(stub_data.members))
+
+        assert api.get_member(bioguide_id)["member"]["bioguideId"] == bioguide_id
+        assert api.get_member("X999999") is None
+
+    def test_bills_and_actions(self, stub):
+        api = make_api(stub.base_url)
+
+        congress = api.get_current_congress()["congress"]["number"]
+        bills = list(api.iter_bills_for_congress(congress))
+        actions = api.get_bill_actions(congress, "hr", 1)
+
+        assert len(bills) == 600
+        assert actions["actions"]
+        assert actions["pagination"]["count"] >= len(actions["actions"])
+
+    def test_injected_errors_are_retried(self, stub_data, monkeypatch):
+        monkeypatch.setattr("external_api.congress_api.time.sleep", lambda s: None)
+        server = serve_in_thread(data=stub_data, error_rate=0.3, retry_after=0, seed=7)
+        try:
+            api = make_api(server.base_url, max_retries=5)
+            results = [api.get_current_congress() for _ in range(20)]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert all(result is not None for result in results)
+        assert server.requests_served > 20
+
+
+class TestRecordReplay:
+    """Test recording upstream traffic and replaying it offline."""
+
+    def test_round_trip(self, stub, stub_data, tmp_path):
+        store = FixtureStore(str(tmp_path))
+        bioguide_id = next(iter(stub_data.members))
+
+        recorder = make_api(stub.base_url)
+        recorder.transport = RecordReplayAdapter(recorder.adapter, store, RECORD)
+        recorded = recorder.get_member(bioguide_id)
+        recorded_congress = recorder.get_current_congress()
+        stub.shutdown()
+
+        # Replay against a host that is no longer there
+        player = make_api("http://127.0.0.1:9/v3")
+        player.transport = RecordReplayAdapter(player.adapter, store, REPLAY)
+
+        assert player.get_member(bioguide_id) == recorded
+        assert player.get_current_congress() == recorded_congress
+        assert player.get_member("X999999") is None
+
+    def test_stub_serves_recorded_fixtures(self, stub_data, tmp_path):
+        store = FixtureStore(str(tmp_path))
+        store.save(
+            "https://api.congress.gov/v3/congress/current?format=json",
+            200,
+            {"Content-Type": "application/json"},
+            {"congress": {"number": 999}},
+        )
+        server = serve_in_thread(data=stub_data, fixtures=store)
+        try:
+            api = make_api(server.base_url)
+            assert api.get_current_congress()["congress"]["number"] == 999
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,131 @@
+"""
+Offline tests for the immutable in-process roster store.
+"""
+
+from datetime import date
+
+import pytest
+from flask import jsonify
+
+from app import create_app, db
+from app.config import Config
+from app.invalidation import publish_dataset
+from app.models import Representative, Senator
+from app.roster import ROSTER_STORE, get_roster
+
+
+def legislator(model, bioguide_id, last_name, state, party, **extra):
+    return model(
+        bioguide_id=bioguide_id,
+        full_name=f"Test {last_name}",
+        last_name=last_name,
+        state=state,
+        party=party,
+        term_start=date(2025, 1, 3),
+        term_end=date(2031, 1, 3),
+        **extra,
+    )
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "DATA_VERSION_CHECK_SECONDS", 0)
+    app = create_app()
+    with app.app_context():
+        db.session.add_all(
+            [
+                legislator(
+                    Senator, "S000002", "Zed", "VT", "Independent", seat_number=2
+                ),
+                legislator(Senator, "S000001", "Able", "VT", "Democrat", seat_number=1),
+                legislator(
+                    Senator, "S000003", "Baker", "OH", "Republican", seat_number=3
+                ),
+                legislator(
+                    Representative, "R000001", "Cole", "OH", "Republican", district=4
+                ),
+            ]
+        )
+        publish_dataset(db.session, source="test")
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+class TestRosterStore:
+    """Test record indexes, encoded bodies and rebuilds."""
+
+    def test_indexes_and_order(self, app):
+        with app.app_context():
+            senators = get_roster().senators
+
+        assert [r.last_name for r in senators.records] == ["Able", "Baker", "Zed"]
+        assert [r.bioguide_id for r in senators.by_state["VT"]] == [
+            "S000001",
+            "S000002",
+        ]
+        assert senators.by_party["Republican"][0].bioguide_id == "S000003"
+        assert senators.by_id["S000002"].seat_number == 2
+
+    def test_records_are_immutable(self, app):
+        with app.app_context():
+            record = get_roster().senators.by_id["S000001"]
+
+        with pytest.raises(AttributeError):
+            record.state = "NY"
+        with pytest.raises(AttributeError):
+            record.nickname = "x"
+
+    def test_bodies_match_jsonify(self, app):
+        client = app.test_client()
+        with app.app_context():
+            senator = db.session.get(Senator, "S000001")
+            expected = jsonify(
+                {
+                    "bioguide_id": senator.bioguide_id,
+                    "name": senator.full_name,
+                    "state": senator.state,
+                    "party": senator.party,
+                    "term_start": senator.term_start,
+                    "term_end": senator.term_end,
+                    "photo_url": senator.photo_url,
+                    "seat_number": senator.seat_number,
+                }
+            ).get_data()
+
+        assert client.get("/api/senators/S000001").get_data() == expected
+        assert client.get("/api/senators/R000001").status_code == 404
+        assert client.get("/api/representatives/R000001").get_json()["district"] == 4
+
+    def test_list_filters(self, app):
+        client = app.test_client()
+
+        vt = client.get("/api/senators/?state=vt").get_json()
+        vt_dems = client.get("/api/senators/?state=VT&party=Democrat").get_json()
+
+        assert [s["bioguide_id"] for s in vt] == ["S000001", "S000002"]
+        assert [s["bioguide_id"] for s in vt_dems] == ["S000001"]
+        assert client.get("/api/senators/?state=ZZ").get_json() == []
+
+    def test_rebuilt_after_publish(self, app):
+        store = app.extensions[ROSTER_STORE]
+        client = app.test_client()
+        client.get("/api/senators/")
+        builds = store.builds
+
+        with app.app_context():
+            db.session.add(legislator(Senator, "S000004", "Cobb", "ME", "Republican"))
+            db.session.commit()
+        names = [s["name"] for s in client.get("/api/senators/").get_json()]
+        assert "Test Cobb" not in names  # committed but not yet published
+
+        with app.app_context():
+            publish_dataset(db.session, source="test")
+            db.session.commit()
+        names = [s["name"] for s in client.get("/api/senators/").get_json()]
+        assert "Test Cobb" in names
+        assert store.builds == builds + 1
@@ -0,0 +1,116 @@
+"""
+Offline tests for the background job scheduler and its leases.
+"""
+
+import time
+
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.models import ScheduledJob
+from app.scheduler import (
+    FAILURE,
+    SUCCESS,
+    Job,
+    Scheduler,
+    add_listener,
+    remove_listener,
+)
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def job_row(app, name) -> ScheduledJob:
+    with app.app_context():
+        return db.session.get(ScheduledJob, name)
+
+
+class TestScheduler:
+    """Test leases, due times, backoff and run reporting."""
+
+    def test_only_one_worker_runs_a_due_job(self, app):
+        calls = []
+        job = Job("sync", lambda app: calls.append(1), interval=60, timeout=30)
+        workers = [Scheduler(app, [job]) for _ in range(3)]
+        for i, worker in enumerate(workers):
+            worker.holder = f"host:{i}"
+
+        runs = [worker.run_pending() for worker in workers]
+
+        assert calls == [1]
+        assert [len(r) for r in runs] == [1, 0, 0]
+        row = job_row(app, "sync")
+        assert row.holder is None and row.last_outcome == SUCCESS
+        assert 54 <= row.next_run_at - row.last_finished_at <= 66  # 10% jitter
+
+    def test_leased_job_is_skipped_until_the_lease_expires(self, app):
+        job = Job("sync", lambda app: None, interval=60, timeout=30)
+        crashed, survivor = Scheduler(app, [job]), Scheduler(app, [job])
+        crashed.holder, survivor.holder = "host:1", "host:2"
+        # Claimed by a worker that died before finishing
+        assert crashed._claim(job)
+
+        assert survivor.run_pending() == []
+        with app.app_context():
+            db.session.get(ScheduledJob, "sync").lease_expires_at = time.time() - 1
+            db.session.commit()
+        assert [run.outcome for run in survivor.run_pending()] == [SUCCESS]
+
+    def test_failures_back_off_exponentially(self, app):
+        def fail(app):
+            raise RuntimeError("upstream down")
+
+        job = Job("sync", fail, interval=60, timeout=30, jitter=0, retry_after=10)
+        scheduler = Scheduler(app, [job])
+        delays = []
+        for _ in range(3):
+            # Make the job due again right away
+            scheduler._due_at.clear()
+            with app.app_context():
+                row = db.session.get(ScheduledJob, "sync")
+                if row is not None:
+                    row.next_run_at = 0
+                    db.session.commit()
+            assert [run.outcome for run in scheduler.run_pending()] == [FAILURE]
+            row = job_row(app, "sync")
+            delays.append(round(row.next_run_at - row.last_finished_at))
+
+        assert delays == [10, 20, 40]
+        assert row.failures == 3
+
+    def test_listeners_receive_runs(self, app):
+        runs = []
+        add_listener(runs.append)
+        try:
+            Scheduler(app, [Job("sync", lambda app: None, 60, 30)]).run_pending()
+        finally:
+            remove_listener(runs.append)
+
+        assert [(run.job, run.outcome) for run in runs] == [("sync", SUCCESS)]
+        metrics = app.test_client().get("/metrics").get_data(as_text=True)
+        assert 'scheduler_job_runs_total{job="sync",outcome="success"}' in metrics
+
+    def test_enabled_scheduler_starts_with_first_request(self, app, monkeypatch):
+        monkeypatch.setattr(Config, "SCHEDULER_ENABLED", True)
+        enabled = create_app()
+        scheduler = enabled.extensions["scheduler"]
+        monkeypatch.setattr(scheduler, "run_forever", lambda: None)
+        assert scheduler._thread is None
+
+        enabled.test_client().get("/health")
+        thread = scheduler._thread
+        enabled.test_client().get("/health")
+
+        assert thread is not None and scheduler._thread is thread
+        assert set(scheduler.jobs) == {"roster", "bills", "refresh", "dictionaries"}
+        assert enabled.test_client().get("/health/scheduler").get_json()["enabled"]
@@ -0,0 +1,209 @@
+"""
+Offline tests for the update event stream and the bill sync feeding it.
+"""
+
+import re
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app import create_app, db
+from app.config import Config
+from app.events import EVENT_BROKER, bill_topic, prune_events, publish_event
+from app.invalidation import publish_dataset
+from app.models import WatchedBill
+from data_ingestion import sync_bills
+from external_api.deadline import Deadline
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    monkeypatch.setattr(Config, "STREAM_POLL_SECONDS", 0.02)
+    monkeypatch.setattr(Config, "STREAM_HEARTBEAT_SECONDS", 0.1)
+    monkeypatch.setattr(Config, "STREAM_MAX_SECONDS", 0.35)
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def publish(app, topic, **data):
+    with app.app_context():
+        publish_event(db.session, "bill_action", topic, data)
+        db.session.commit()
+
+
+def parse(body: str) -> list[tuple[int | None, str, str]]:
+    """(id, event, data) of every event in a stream body."""
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(re.findall(r"^(id|event|data): (.*)$", block, re.M))
+        if "event" in fields:
+            event_id = int(fields["id"]) if "id" in fields else None
+            events.append((event_id, fields["event"], fields["data"]))
+    return events
+
+
+class TestUpdateStream:
+    """Test resume, live fan-out, heartbeats and pruning."""
+
+    def test_resume_sends_missed_events_for_subscribed_topics(self, app):
+        publish(app, bill_topic("119/hr/1"), n=1)
+        publish(app, bill_topic("119/s/5"), n=2)
+        publish(app, bill_topic("119/hr/1"), n=3)
+
+        body = (
+            app.test_client()
+            .get("/api/stream/updates?bills=119/HR/1", headers={"Last-Event-ID": "1"})
+            .get_data(as_text=True)
+        )
+
+        assert body.startswith("retry: 5000\n\n")
+        assert parse(body) == [(3, "bill_action", '{"n":3}')]
+
+    def test_live_events_and_heartbeats(self, app):
+        response = app.test_client().get("/api/stream/updates?bills=119/hr/1")
+        with app.app_context():
+            version = publish_dataset(db.session, source="test")
+            db.session.commit()
+        publish(app, bill_topic("119/hr/2"), n=1)
+        publish(app, bill_topic("119/hr/1"), n=2)
+
+        body = response.get_data(as_text=True)
+
+        assert parse(body) == [
+            (1, "roster", f'{{"version":{version}}}'),
+            (3, "bill_action", '{"n":2}'),
+        ]
+        assert ": keepalive" in body
+        response.close()
+        assert app.extensions[EVENT_BROKER].subscribers == 0
+
+    def test_resync_when_history_was_pruned(self, app):
+        for n in range(3):
+            publish(app, bill_topic("119/hr/1"), n=n)
+        with app.app_context():
+            prune_events(db.session, timedelta(0))
+            db.session.commit()
+        publish(app, bill_topic("119/hr/1"), n=3)
+
+        body = (
+            app.test_client()
+            .get("/api/stream/updates?bills=119/hr/1&lastEventId=1")
+            .get_data(as_text=True)
+        )
+
+        assert [(i, e) for i, e, _ in parse(body)] == [
+            (None, "resync"),
+            (4, "bill_action"),
+        ]
+
+    def test_resync_when_every_event_was_pruned(self, app):
+        publish(app, bill_topic("119/hr/1"), n=1)
+        with app.app_context():
+            prune_events(db.session, timedelta(0))
+            db.session.commit()
+
+        body = (
+            app.test_client()
+            .get("/api/stream/updates?bills=119/hr/1", headers={"Last-Event-ID": "1"})
+            .get_data(as_text=True)
+        )
+        assert [e for _, e, _ in parse(body)] == ["resync"]
+
+    @pytest.mark.parametrize(
+        "query", ["?bills=119/xx/1", "?bills=hr1", "?lastEventId=abc"]
+    )
+    def test_invalid_requests(self, app, query):
+        response = app.test_client().get(f"/api/stream/updates{query}")
+        assert response.status_code == 400
+
+
+class TestBillSync:
+    """Test that the sync publishes only actions it has not seen before."""
+
+    def listing(self, action_text):
+        return {
+            "bills": [
+                {
+                    "congress": 119,
+                    "type": "HR",
+                    "number": "1",
+                    "latestAction": {"actionDate": "2025-03-01", "text": action_text},
+                }
+            ]
+        }
+
+    def test_changed_bills_publish_new_actions(self, app, monkeypatch):
+        listing = self.listing("Introduced")
+        actions = {
+            "actions": [
+                {"actionDate": "2025-02-01", "text": "Referred"},
+                {"actionDate": "2025-01-01", "text": "Introduced"},
+            ]
+        }
+        monkeypatch.setattr(
+            sync_bills, "get_bills_for_current_congress", lambda deadline: listing
+        )
+        monkeypatch.setattr(
+            sync_bills,
+            "get_bill_actions_service",
+            lambda *bill, deadline: actions,
+        )
+
+        assert sync_bills.sync_bills(app) == 0  # baseline only
+
+        listing = self.listing("Passed House")
+        assert sync_bills.sync_bills(app) == 1
+        assert sync_bills.sync_bills(app) == 0
+
+        # A watched bill gets every action since the last one seen
+        app.test_client().get("/api/stream/updates?bills=119/s/5").get_data()
+        assert sync_bills.sync_bills(app) == 0
+        actions["actions"][:0] = [
+            {"actionDate": "2025-03-02", "text": "Placed on calendar"},
+            {"actionDate": "2025-03-01", "text": "Reported"},
+        ]
+        assert sync_bills.sync_bills(app) == 2
+
+        body = (
+            app.test_client()
+            .get(
+                "/api/stream/updates?bills=119/hr/1,119/s/5",
+                headers={"Last-Event-ID": "0"},
+            )
+            .get_data(as_text=True)
+        )
+        texts = [re.search(r'"text":"([^"]+)"', d)[1] for _, e, d in parse(body)]
+        assert texts == ["Passed House", "Reported", "Placed on calendar"]
+
+    def test_unlisted_watched_bills_take_turns(self, app, monkeypatch):
+        monkeypatch.setitem(app.config, "BILL_SYNC_MAX_FETCHES", 2)
+        with app.app_context():
+            db.session.add_all(
+                WatchedBill(bill=f"119/s/{n}", subscribed_at=datetime.now(UTC))
+                for n in range(1, 6)
+            )
+            db.session.commit()
+        fetched = []
+        monkeypatch.setattr(
+            sync_bills, "get_bills_for_current_congress", lambda deadline: {}
+        )
+        monkeypatch.setattr(
+            sync_bills,
+            "get_bill_actions_service",
+            lambda congress, bill_type, number, deadline: (
+                fetched.append(number) or {"actions": [{"text": "Introduced"}]}
+            ),
+        )
+
+        for _ in range(3):
+            sync_bills.sync_bills(app)
+        # Never-checked bills first, then the least recently checked
+        assert fetched == [1, 2, 3, 4, 5, 1]
+
+        sync_bills.sync_bills(app, deadline=Deadline(0))
+        assert len(fetched) == 6
@@ -0,0 +1,128 @@
+"""
+Offline tests for term history and the per-Congress interval index.
+"""
+
+from datetime import date
+
+import pytest
+import responses
+
+from app import create_app, db
+from app.config import Config
+from app.models import Term, TermCongress
+from app.terms import get_congress_from_date, terms_on
+from data_ingestion import parse_member_data
+from data_ingestion.parse_member_data import fetch_historical, term_rows
+
+
+def legislator(bioguide_id, name, *terms):
+    return {
+        "id": {"bioguide": bioguide_id},
+        "name": {"official_full": name},
+        "terms": [
+            {"type": t, "start": start, "end": end, "state": state, "party": "P"}
+            | ({"district": district} if t == "rep" else {"class": 1})
+            for t, start, end, state, district in terms
+        ],
+    }
+
+
+LEGISLATORS = [
+    legislator(
+        "T000001",
+        "Ed Towns",
+        ("rep", "2007-01-04", "2009-01-03", "NY", 10),
+        ("rep", "2009-01-06", "2011-01-03", "NY", 10),
+    ),
+    legislator(
+        "N000002",
+        "Jerry Nadler",
+        ("rep", "2009-01-06", "2011-01-03", "NY", 8),
+        ("rep", "2011-01-05", "2013-01-03", "NY", 8),
+        ("rep", "2013-01-03", "2015-01-03", "NY", 10),
+    ),
+    legislator("S000001", "Sen Ator", ("sen", "2007-01-04", "2013-01-03", "NY", None)),
+]
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    app = create_app()
+    terms, buckets = term_rows(LEGISLATORS)
+    with app.app_context():
+        db.session.execute(Term.__table__.insert(), terms)
+        db.session.execute(TermCongress.__table__.insert(), buckets)
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+class TestTerms:
+    """Test Congress arithmetic and date lookups."""
+
+    def test_congress_from_date(self):
+        assert get_congress_from_date(date(2009, 6, 1)) == 111
+        assert get_congress_from_date(date(2013, 1, 3), "end") == 112
+        assert get_congress_from_date(date(2013, 1, 3), "start") == 113
+        assert get_congress_from_date(date(1901, 3, 4), "start") == 57
+        with pytest.raises(ValueError):
+            get_congress_from_date(date(2013, 1, 3))
+
+    def test_senate_terms_span_three_congresses(self):
+        _, buckets = term_rows(LEGISLATORS[2:])
+        assert [b["congress"] for b in buckets] == [110, 111, 112]
+
+    def test_who_served(self, app):
+        with app.app_context():
+            names = [
+                t["name"] for t in terms_on(db.session, date(2009, 6, 1), "NY", 10)
+            ]
+            assert names == ["Ed Towns"]
+            # The senator's one term covers the date too
+            assert len(terms_on(db.session, date(2009, 6, 1), "NY")) == 3
+            assert [
+                t["name"]
+                for t in terms_on(db.session, date(2009, 6, 1), term_type="sen")
+            ] == ["Sen Ator"]
+            # Noon on January 3: the outgoing and incoming terms both count
+            assert len(terms_on(db.session, date(2013, 1, 3), "NY")) == 3
+
+    def test_route(self, app):
+        client = app.test_client()
+        response = client.get("/api/terms?date=2014-06-01&state=ny&district=10")
+        assert [t["bioguide_id"] for t in response.get_json()] == ["N000002"]
+        assert client.get("/api/terms?date=June").status_code == 400
+        assert client.get("/api/terms?date=2014-06-01&district=10").status_code == 400
+        assert client.get("/api/terms?date=2014-06-01&type=gov").status_code == 400
+
+
+class TestHistoricalFile:
+    """Test downloading legislators-historical.yaml."""
+
+    @pytest.fixture
+    def path(self, monkeypatch, tmp_path):
+        path = tmp_path / "legislators-historical.yaml"
+        monkeypatch.setattr(parse_member_data, "HISTORICAL_FILE", str(path))
+        monkeypatch.setattr(parse_member_data, "LEGISLATOR_FILES", (str(path),))
+        return path
+
+    @responses.activate
+    def test_downloads_once_per_max_age(self, path):
+        responses.get(parse_member_data.HISTORICAL_URL, body="- {}\n")
+
+        assert fetch_historical()
+        assert fetch_historical()
+        assert path.read_text() == "- {}\n"
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_missing_file_is_reported(self, path, caplog):
+        responses.get(parse_member_data.HISTORICAL_URL, status=503)
+
+        assert not fetch_historical()
+        assert parse_member_data._load_legislators() == []
+        assert "legislators-historical.yaml not found" in caplog.text
@@ -0,0 +1,391 @@
+"""
+Offline tests for the shared upstream cache, its heat-ordered refresher and
+the per-worker W-TinyLFU caches in front of it.
+"""
+
+import sqlite3
+import time
+
+import pytest
+import sqlalchemy as sa
+import zstandard
+
+from app import create_app, db
+from app.compression import DCZ_HEADER
+from app.config import Config
+from app.member_detail import DEFAULT_FIELDS, EXTRA_FIELDS, MemberDetail
+from app.models import AccessCount, UpstreamCacheEntry
+from app.tinylfu import FrequencySketch, WTinyLFU
+from app.upstream_cache import UPSTREAM_CACHE, Resource, UpstreamCache, decayed
+from external_api.fallback import note_stale, reset_staleness, staleness
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        Config, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'roster.db'}"
+    )
+    app = create_app()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+@pytest.fixture
+def fetched():
+    return []
+
+
+@pytest.fixture
+def cache(app, fetched):
+    def fetch(key, deadline):
+        fetched.append(key)
+        return None if key == "missing" else {"key": key, "n": len(fetched)}
+
+    return UpstreamCache(
+        app,
+        [Resource("member", fetch, ttl=1000)],
+        half_life=3600,
+        flush_seconds=0,
+        min_heat=2,
+        recheck_seconds=0,  # always read the table, so aged rows are seen
+    )
+
+
+def age_entry(app, key, seconds):
+    with app.app_context():
+        db.session.get(UpstreamCacheEntry, ("member", key)).fetched_at -= seconds
+        db.session.commit()
+
+
+class TestUpstreamCache:
+    """Test cache reads, access counting and refresh ordering."""
+
+    def test_served_until_ttl(self, app, cache, fetched):
+        assert cache.get("member", "A000001").json() == {"key": "A000001", "n": 1}
+        assert cache.get("member", "A000001").json()["n"] == 1
+        assert cache.get("member", "missing") is None
+
+        age_entry(app, "A000001", 1001)
+        assert cache.get("member", "A000001").json()["n"] == 3
+        assert fetched == ["A000001", "missing", "A000001"]
+
+    def test_workers_add_up_and_heat_decays(self, app, cache):
+        other = UpstreamCache(app, list(cache.resources.values()), flush_seconds=0)
+        for _ in range(3):
+            cache.record_access("member", "A000001")
+        other.record_access("member", "A000001")
+
+        with app.app_context():
+            counts = db.session.execute(sa.select(AccessCount.count)).scalars().all()
+            with db.engine.connect() as conn:
+                heat = cache.heat(conn, time.time() + 3600 * 10)
+        assert sum(counts) == 4
+        # The current window ends within the hour, so 9-10 half-lives have passed
+        assert decayed(4, 3600 * 10, 3600) <= heat["member", "A000001"]
+        assert heat["member", "A000001"] <= decayed(4, 3600 * 9, 3600)
+
+    def test_refresh_spends_budget_on_hot_stale_entries(self, app, cache, fetched):
+        reads = {"HOT": 20, "WARM": 5, "COLD": 0, "FRESH": 50}
+        for key, n in reads.items():
+            cache.get("member", key)
+            for _ in range(n):
+                cache.record_access("member", key)
+        for key in ("HOT", "WARM", "COLD"):
+            age_entry(app, key, 900)
+        cache.get("member", "EXPIRED")
+        age_entry(app, "EXPIRED", 5000)
+        fetched.clear()
+
+        assert cache.refresh(budget=2) == 2
+        assert fetched == ["HOT", "WARM"]
+
+        # COLD is left to expire; EXPIRED was dropped
+        with app.app_context():
+            keys = set(db.session.execute(sa.select(UpstreamCacheEntry.key)).scalars())
+        assert keys == {"HOT", "WARM", "COLD", "FRESH"}
+        fetched.clear()
+        assert cache.refresh(budget=2) == 0  # everything warm is now fresh
+
+    def test_routes_read_through_cache(self, app, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "app.upstream_cache.get_member_details",
+            lambda bioguide_id, deadline: (
+                calls.append(bioguide_id) or {"member": {"bioguideId": bioguide_id}}
+            ),
+        )
+        client = app.test_client()
+
+        member = client.get("/api/members/A000055").get_json()["member"]
+        assert member["bioguideId"] == "A000055"
+        assert client.get("/api/members/A000055").status_code == 200
+        assert calls == ["A000055"]
+        assert client.get("/health/cache").get_json()["member"]["hits"] == 1
+
+    def test_failed_writes_do_not_fail_reads(self, cache, monkeypatch):
+        # Same database, but give up on a held write lock after 50 ms
+        monkeypatch.setattr(Config, "SQLITE_BUSY_TIMEOUT_MS", 50)
+        app = create_app()
+        cache = UpstreamCache(app, list(cache.resources.values()), flush_seconds=0)
+        with app.app_context():
+            locker = sqlite3.connect(db.engine.url.database, timeout=0)
+        locker.execute("BEGIN IMMEDIATE")
+        try:
+            assert cache.get("member", "A000001").json()["key"] == "A000001"
+        finally:
+            locker.rollback()
+            locker.close()
+
+        # The access count was kept and is written by the next flush
+        cache.flush()
+        with app.app_context():
+            assert db.session.execute(sa.select(AccessCount.count)).scalar() == 1
+            db.engine.dispose()
+
+    def test_stale_fallbacks_are_not_stored(self, app, fetched):
+        def fetch(key, deadline):
+            fetched.append(key)
+            note_stale(600)  # as LastGoodCache does when the upstream is down
+            return {"key": key}
+
+        cache = UpstreamCache(app, [Resource("member", fetch, ttl=1000)])
+        reset_staleness()
+        body = cache.get("member", "A000001")
+        assert body.json() == {"key": "A000001"}
+        assert time.time() - body.fetched_at >= 600
+        assert staleness() == 600  # the response is still flagged
+
+        assert cache.get("member", "A000001") is not None
+        assert fetched == ["A000001", "A000001"]
+        with app.app_context():
+            assert db.session.get(UpstreamCacheEntry, ("member", "A000001")) is None
+
+    def test_local_cache_serves_until_recheck(self, app, cache, fetched):
+        local = UpstreamCache(app, list(cache.resources.values()), recheck_seconds=60)
+        local.get("member", "A000001")
+        with app.app_context():
+            db.session.execute(sa.delete(UpstreamCacheEntry))
+            db.session.commit()
+
+        assert local.get("member", "A000001").json()["n"] == 1
+        assert fetched == ["A000001"]
+        assert local.stats()["member"]["hits"] == 1
+
+        # Past the recheck interval the missing row is noticed and refetched
+        local.recheck_seconds = 0
+        assert local.get("member", "A000001").json()["n"] == 2
+
+
+def member(i):
+    """A member-like payload; its keys and most values repeat across members."""
+    return {
+        "member": {
+            "bioguideId": f"M{i:06d}",
+            "directOrderName": f"Member Number{i}",
+            "firstName": "Member",
+            "state": ["California", "Texas", "New York", "Ohio"][i % 4],
+            "partyHistory": [{"partyName": ["Democratic", "Republican"][i % 2]}],
+            "terms": [
+                {"chamber": "House of Representatives", "congress": c, "startYear": y}
+                for c, y in zip(
+                    range(110 + i % 7, 119), range(2007, 2025, 2), strict=False
+                )
+            ],
+            "sponsoredLegislation": {"count": i * 7 % 300},
+        }
+    }
+
+
+def projected(i):
+    return MemberDetail.from_api(member(i)).to_json()
+
+
+@pytest.fixture
+def client(app, monkeypatch):
+    monkeypatch.setattr(
+        "app.upstream_cache.get_member_details",
+        lambda bioguide_id, deadline: member(int(bioguide_id[1:])),
+    )
+    return app.test_client()
+
+
+class TestMemberProjection:
+    """Test the typed member projection and ?fields=."""
+
+    def test_default_fields_only(self, client):
+        body = client.get("/api/members/M000003").get_json()
+        assert set(body) == {"member"}
+        assert body["member"]["bioguideId"] == "M000003"
+        assert body["member"]["state"] == "Ohio"
+        assert "firstName" not in body["member"]
+        assert set(body["member"]) <= DEFAULT_FIELDS
+        assert body["member"]["terms"][0] == {
+            "chamber": "House of Representatives",
+            "congress": 113,
+            "memberType": None,
+            "stateName": None,
+            "startYear": 2007,
+        }
+
+    def test_extra_fields(self, client):
+        body = client.get("/api/members/M000003?fields=firstName,state").get_json()
+        assert body["member"]["firstName"] == "Member"
+        assert body["member"]["state"] == "Ohio"
+
+        response = client.get("/api/members/M000003?fields=firstName,url")
+        assert response.status_code == 400
+        assert "url" in response.get_json()["error"]
+
+    def test_one_entry_serves_both(self, app, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "app.upstream_cache.get_member_details",
+            lambda bioguide_id, deadline: calls.append(bioguide_id) or member(3),
+        )
+        client = app.test_client()
+        assert (
+            "firstName" not in client.get("/api/members/M000003").get_json()["member"]
+        )
+        body = client.get("/api/members/M000003?fields=firstName").get_json()
+        assert body["member"]["firstName"] == "Member"
+        assert (
+            "firstName" not in client.get("/api/members/M000003").get_json()["member"]
+        )
+
+        assert calls == ["M000003"]
+        with app.app_context():
+            assert (
+                db.session.scalar(sa.select(sa.func.count(UpstreamCacheEntry.key))) == 1
+            )
+
+    def test_parses_messy_upstream(self):
+        member = MemberDetail.from_api(
+            {
+                "member": {
+                    "bioguideId": "X000001",
+                    "terms": {"item": [{"congress": "118", "startYear": None}, "x"]},
+                    "sponsoredLegislation": None,
+                    "someNewField": {"url": "https://api.congress.gov/..."},
+                }
+            }
+        )
+        assert member.terms[0].congress == 118
+        assert member.sponsored.count == 0
+        assert "someNewField" not in member.to_json(EXTRA_FIELDS)["member"]
+        assert MemberDetail.from_api({"error": "not found"}) is None
+
+
+class TestCompression:
+    """Test dictionary training and content negotiation of cached bodies."""
+
+    def test_training_recompresses_entries(self, app, client):
+        cache = app.extensions[UPSTREAM_CACHE]
+        for i in range(150):
+            cache.get("member", f"M{i:06d}")
+        before = cache.codec.current("member")
+
+        assert cache.train_dictionaries(size=4096, retrain_seconds=3600) == 1
+        dictionary = cache.codec.current("member")
+        assert before is None and dictionary is not None
+
+        with app.app_context():
+            frames = db.session.execute(sa.select(UpstreamCacheEntry.body)).scalars()
+            frames = list(frames)
+        assert all(
+            zstandard.get_frame_parameters(f).dict_id == dictionary.id for f in frames
+        )
+        assert cache.codec.decompress(frames[0]).startswith(b'{"member"')
+        # Recent enough: nothing to do
+        assert cache.train_dictionaries(size=4096, retrain_seconds=3600) == 0
+
+    def test_frames_pass_through_when_accepted(self, app, client):
+        response = client.get(
+            "/api/members/M000001", headers={"Accept-Encoding": "gzip, zstd"}
+        )
+        assert response.headers["Content-Encoding"] == "zstd"
+        body = zstandard.ZstdDecompressor().decompress(response.get_data())
+        assert body == app.json.dumps(projected(1)).encode()
+
+        cache = app.extensions[UPSTREAM_CACHE]
+        for i in range(150):
+            cache.get("member", f"M{i:06d}")
+        cache.train_dictionaries(size=4096, retrain_seconds=3600)
+
+        # Clients without the dictionary get JSON and a link to fetch it
+        response = client.get("/api/members/M000002")
+        assert response.get_json() == projected(2)
+        link = response.headers["Link"]
+        url = link[link.index("<") + 1 : link.index(">")]
+        assert "match" not in url
+        fetched = client.get(url)
+        assert fetched.headers["Use-As-Dictionary"] == 'match="/api/members/*"'
+        # The scope comes from the server, never from the request
+        widened = client.get(url + "?match=/*")
+        assert widened.headers["Use-As-Dictionary"] == 'match="/api/members/*"'
+
+        dictionary = cache.codec.current("member")
+        response = client.get(
+            "/api/members/M000002",
+            headers={
+                "Accept-Encoding": "gzip, dcz",
+                "Available-Dictionary": dictionary.structured_hash,
+            },
+        )
+        assert response.headers["Content-Encoding"] == "dcz"
+        data = response.get_data()
+        assert data[:40] == DCZ_HEADER + dictionary.sha256
+        decompressor = zstandard.ZstdDecompressor(
+            dict_data=zstandard.ZstdCompressionDict(fetched.get_data())
+        )
+        assert (
+            decompressor.decompress(data[40:]) == app.json.dumps(projected(2)).encode()
+        )
+
+
+class TestWTinyLFU:
+    """Test the sketch and the admission policy of the local cache."""
+
+    def test_sketch_counts_and_ages(self):
+        sketch = FrequencySketch(64)
+        for _ in range(5):
+            sketch.increment("hot")
+        sketch.increment("warm")
+        assert sketch.frequency("hot") >= 5
+        assert sketch.frequency("hot") > sketch.frequency("warm")
+
+        # Every 10 * width additions all counters are halved
+        for i in range(10 * sketch.width):
+            sketch.increment(("filler", i % 3))
+        assert sketch.frequency("hot") <= 3
+
+    def test_crawl_does_not_evict_popular_entries(self):
+        cache = WTinyLFU(max_bytes=10_000)
+        popular = [f"P{i}" for i in range(15)]
+        for key in popular:
+            for _ in range(3):
+                if cache.get(key) is None:
+                    cache.put(key, key, 400)
+
+        for i in range(1000):
+            key = f"C{i}"
+            if cache.get(key) is None:
+                cache.put(key, key, 400)
+
+        assert all(cache.get(key) == key for key in popular)
+        stats = cache.stats()
+        assert stats.bytes <= 10_000
+        assert stats.rejections > 900
+        assert 0 < stats.hit_ratio < 1
+
+    def test_byte_bound_and_replacement(self):
+        cache = WTinyLFU(max_bytes=1000)
+        cache.put("big", "x", 2000)
+        assert "big" not in cache
+
+        cache.put("a", 1, 300)
+        cache.put("a", 2, 600)
+        assert cache.get("a") == 2
+        assert cache.stats().bytes == 600
+        cache.discard("a")
+        assert len(cache) == 0
@@ -1,5 +1,4 @@
 export interface MemberDepiction {
-  attribution: string;
   imageUrl: string;
 }
 
@@ -26,7 +25,6 @@ export interface MemberTerm {
   endYear: number;
   memberType: string;
   startYear: number;
-  stateCode: string;
   stateName: string;
   district?: number;
 }
@@ -37,9 +35,7 @@ export interface Member {
   cosponsoredLegislation: MemberLegislation;
   depiction?: MemberDepiction;
   directOrderName: string;
-  firstName: string;
   honorificName: string;
-  invertedOrderName: string;
   lastName: string;
   leadership: MemberLeadership[];
   partyHistory: MemberPartyHistory[];
@@ -47,15 +43,21 @@ export interface Member {
   state: string;
   terms: MemberTerm[];
   updateDate: string;
+  // Only sent when listed in ?fields=
+  firstName?: string;
+  invertedOrderName?: string;
+  currentMember?: boolean;
+  officialWebsiteUrl?: string;
+  addressInformation?: MemberAddress;
 }
 
-export interface MemberApiRequest {
-  bioguideId: string;
-  contentType: string;
-  format: string;
+export interface MemberAddress {
+  officeAddress: string;
+  city: string;
+  zipCode: number;
+  phoneNumber: string;
 }
 
 export interface MemberApiResponse {
   member: Member;
-  request: MemberApiRequest;
 }
\ No newline at end of file